@@ -0,0 +1,126 @@
+"""Module with a shared non-blocking subscription to the new block events."""
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+from .async_client import CLIENT_ERRORS, AsyncClient
+
+
+class AsyncBlockStream:
+    """Long-lived subscription to the blocks committed by the Exonum node, the async counterpart of `BlockStream`.
+
+    The websocket connection is opened once by a background task (and reopened if it drops),
+    and every new block is announced to all the waiting coroutines:
+
+    >>> seen = stream.latest()
+    >>> while not await condition_is_met():
+    >>>     seen = await stream.wait_for_block(seen)
+
+    Establishing the first connection is not considered a block, so the stream should be started
+    before the waiters remember the latest block. Once stopped, the stream can't be started again.
+    """
+
+    # Wait interval between reconnection attempts in seconds.
+    RECONNECT_INTERVAL = 0.5
+
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+        self._latest = 0
+        self._running = False
+        self._closed = False
+        self._connected = False
+        # Created on start, since the condition should be bound to the running event loop.
+        self._condition: Optional[asyncio.Condition] = None
+        self._task: Optional["asyncio.Future[None]"] = None
+
+    def start(self) -> None:
+        """Starts listening for the new blocks. Does nothing if the stream is already started.
+
+        Should be called from the event loop which waits for the blocks.
+        Raises `RuntimeError` if the stream is already stopped."""
+        if self._closed:
+            raise RuntimeError("Block stream is already stopped")
+        if self._running:
+            return
+
+        self._running = True
+        self._condition = asyncio.Condition()
+        self._task = asyncio.ensure_future(self._listen())
+
+    async def stop(self) -> None:
+        """Closes the subscription and stops the background task. The stream can't be used after that."""
+        self._running = False
+        self._closed = True
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        # Wake up the waiters, so they won't wait for the blocks that will never come.
+        await self._notify()
+
+    def is_connected(self) -> bool:
+        """Returns True if the stream is connected to the node and receives blocks."""
+        return self._connected
+
+    def latest(self) -> int:
+        """Returns the number of the latest observed block."""
+        return self._latest
+
+    async def wait_for_block(self, seen: int, timeout: Optional[float] = None) -> int:
+        """Waits until a block newer than `seen` is observed (or the timeout expires)
+        and returns the number of the latest observed block.
+
+        If the block newer than `seen` is already observed, returns immediately. The stream is started
+        if it's not started yet."""
+        self.start()
+        assert self._condition is not None
+
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._latest > seen or not self._running), timeout
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        return self._latest
+
+    async def _notify(self) -> None:
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def _announce_block(self) -> None:
+        self._latest += 1
+        await self._notify()
+
+    async def _listen(self) -> None:
+        reconnect = False
+        while self._running:
+            try:
+                async with self._client.pool.session().ws_connect(self._client.subscription_url("blocks")) as websocket:
+                    self._connected = True
+                    # Blocks could be committed while the stream was disconnected, so the waiters
+                    # are woken up to check the state again. The first connection is not a block.
+                    if reconnect:
+                        await self._announce_block()
+                    reconnect = True
+
+                    async for message in websocket:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        await self._announce_block()
+            except CLIENT_ERRORS + (OSError,):
+                pass
+            finally:
+                self._connected = False
+
+            # Exonum API server may be rebooting. Wait for it.
+            await asyncio.sleep(self.RECONNECT_INTERVAL)
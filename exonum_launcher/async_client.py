@@ -0,0 +1,102 @@
+"""Module with the non-blocking client of the Exonum node API.
+
+Requires `aiohttp`, which is an optional dependency: `pip install exonum-launcher[async]`."""
+import asyncio
+import functools
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import aiohttp
+
+from .concurrency import MAX_WORKERS
+from .connection_pool import ConnectionPool
+
+R = TypeVar("R")
+
+# Errors raised when the node API is unavailable or responds with an error status.
+CLIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+async def run_blocking(func: Callable[..., R], *args: Any) -> R:
+    """Runs the blocking function (e.g. a spec loader or the protobuf loader) in the default executor."""
+    return await asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+class AsyncConnectionPool:
+    """Keep-alive HTTP connections shared by the async clients, the async counterpart of `ConnectionPool`.
+
+    It's configured by the same `connection_pool` section of the config. The session is created
+    on the first request, since it should be created within the event loop which uses it."""
+
+    @staticmethod
+    def from_config(data: Dict[str, Any]) -> "AsyncConnectionPool":
+        """Creates a pool from the `connection_pool` section of the config."""
+        for option in data:
+            if option not in ConnectionPool.OPTIONS:
+                raise ValueError(
+                    f"Unknown connection pool option '{option}'. Available options are: {ConnectionPool.OPTIONS}"
+                )
+
+        return AsyncConnectionPool(**data)
+
+    def __init__(self, pool_size: int = MAX_WORKERS, connect_timeout: float = 10.0, read_timeout: float = 60.0):
+        if pool_size < 1:
+            raise ValueError(f"Connection pool size must be positive, but {pool_size} was given")
+
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def session(self) -> aiohttp.ClientSession:
+        """Returns the shared session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+        return self._session
+
+    async def close(self) -> None:
+        """Closes all the open connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncClient:
+    """Non-blocking client of the public and private API of a single Exonum node."""
+
+    def __init__(
+        self, pool: AsyncConnectionPool, hostname: str, public_api_port: int, private_api_port: int, ssl: bool = False
+    ) -> None:
+        self.pool = pool
+        self.hostname = hostname
+        self.public_api_port = public_api_port
+        self.private_api_port = private_api_port
+        self.schema = "https" if ssl else "http"
+
+    def __repr__(self) -> str:
+        return f"AsyncClient({self.schema}://{self.hostname}; ports: {self.public_api_port} / {self.private_api_port})"
+
+    def url(self, path: str, private: bool = False) -> str:
+        """Returns the URL of the API endpoint, e.g. `url("explorer/v1/transactions")`."""
+        port = self.private_api_port if private else self.public_api_port
+        return f"{self.schema}://{self.hostname}:{port}/api/{path}"
+
+    def subscription_url(self, subscription_type: str) -> str:
+        """Returns the URL of the websocket subscription to the blocks or transactions."""
+        schema = "wss" if self.schema == "https" else "ws"
+        return f"{schema}://{self.hostname}:{self.public_api_port}/api/explorer/v1/{subscription_type}/subscribe"
+
+    async def get(self, path: str, private: bool = False, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Performs a GET request and returns the decoded JSON response.
+
+        Raises `aiohttp.ClientResponseError` if the response has an error status."""
+        async with self.pool.session().get(self.url(path, private), params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def post_binary(self, path: str, data: bytes, private: bool = True) -> Any:
+        """Performs a POST request with the serialized protobuf message and returns the decoded JSON response."""
+        headers = {"content-type": "application/octet-stream"}
+        async with self.pool.session().post(self.url(path, private), data=data, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
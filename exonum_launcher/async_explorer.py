@@ -0,0 +1,158 @@
+"""Module encapsulating the non-blocking interaction with the Explorer."""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .action_result import ActionResult
+from .async_block_stream import AsyncBlockStream
+from .async_client import CLIENT_ERRORS, AsyncClient
+from .configuration import Artifact, Instance
+from .dispatcher import DispatcherState
+from .explorer import Explorer, TxStatus, check_tx_statuses
+
+
+class AsyncExplorer:
+    """Async counterpart of `Explorer`: the same waits, but on the event loop instead of a thread."""
+
+    RECONNECT_RETRIES = Explorer.RECONNECT_RETRIES
+    RECONNECT_INTERVAL = Explorer.RECONNECT_INTERVAL
+    BLOCK_TIMEOUT = Explorer.BLOCK_TIMEOUT
+    DEPLOY_TIMEOUT = Explorer.DEPLOY_TIMEOUT
+
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+        self._blocks = AsyncBlockStream(client)
+        self._dispatcher_state: Optional[Tuple[int, DispatcherState]] = None
+
+    def initialize(self) -> None:
+        """Subscribes to the new blocks, so the blocks committed from now on are observed by the waiters."""
+        self._blocks.start()
+
+    async def close(self) -> None:
+        """Closes the subscription to the new blocks."""
+        await self._blocks.stop()
+
+    def blocks(self) -> AsyncBlockStream:
+        """Returns the stream of the new blocks shared by all the waiters."""
+        return self._blocks
+
+    async def _wait_for_block(self, seen: int) -> int:
+        return await self._blocks.wait_for_block(seen, self.BLOCK_TIMEOUT)
+
+    async def dispatcher_state(self) -> DispatcherState:
+        """Returns a snapshot of the dispatcher state, cached until the next block is observed."""
+        self._blocks.start()
+
+        # Block number is taken before the request, so a block committed during the request
+        # invalidates the snapshot.
+        seen = self._blocks.latest()
+        if self._dispatcher_state is not None and self._dispatcher_state[0] == seen:
+            return self._dispatcher_state[1]
+
+        state = DispatcherState(await self._client.get("services/supervisor/services"))
+        # Without the subscription the new blocks can't be tracked, so the snapshot can't be cached.
+        self._dispatcher_state = (seen, state) if self._blocks.is_connected() else None
+
+        return state
+
+    async def is_deployed(self, artifact: Artifact) -> bool:
+        """Returns True if artifact is deployed. Otherwise returns False."""
+        return (await self.dispatcher_state()).is_deployed(artifact)
+
+    async def get_instance_id(self, instance: Instance) -> Optional[int]:
+        """Returns ID if running instance. Is service instance was not found,
+        None is returned."""
+        return (await self.dispatcher_state()).get_instance_id(instance)
+
+    async def get_tx_status(self, tx_hash: str) -> Tuple[TxStatus, str]:
+        """Returns status of the transaction by its hash."""
+        info = await self._client.get("explorer/v1/transactions", params={"hash": tx_hash})
+        if info["type"] == "committed":
+            status = info["status"]
+            if status["type"] == "success":
+                return TxStatus.Success, "OK"
+
+            return TxStatus.Error, status["description"]
+
+        return TxStatus.NotCommitted, "not committed"
+
+    async def _try_get_tx_status(self, tx_hash: str) -> Optional[Tuple[TxStatus, str]]:
+        """Returns status of the transaction or None if the Exonum API is unavailable."""
+        try:
+            return await self.get_tx_status(tx_hash)
+        except CLIENT_ERRORS:
+            return None
+
+    async def wait_for_tx_statuses(self, txs: List[str]) -> Dict[str, Tuple[TxStatus, str]]:
+        """Waits until every transaction from the list is committed and returns the status of each one,
+        see `Explorer.wait_for_tx_statuses`."""
+        statuses: Dict[str, Tuple[TxStatus, str]] = {tx_hash: (TxStatus.Unknown, "unknown") for tx_hash in txs}
+        pending = list(statuses)
+
+        seen = self._blocks.latest()
+        for _ in range(self.RECONNECT_RETRIES):
+            results = await asyncio.gather(*[self._try_get_tx_status(tx_hash) for tx_hash in pending])
+
+            api_available = True
+            for tx_hash, result in zip(pending, results):
+                if result is None:
+                    api_available = False
+                else:
+                    statuses[tx_hash] = result
+
+            pending = [
+                tx_hash for tx_hash in pending if statuses[tx_hash][0] in (TxStatus.Unknown, TxStatus.NotCommitted)
+            ]
+            if not pending:
+                break
+
+            if api_available:
+                seen = await self._wait_for_block(seen)
+            else:
+                # Exonum API server may be rebooting. Wait for it.
+                await asyncio.sleep(self.RECONNECT_INTERVAL)
+
+        return statuses
+
+    async def wait_for_txs(self, txs: List[str]) -> None:
+        """Waits until every transaction from the list is committed.
+
+        Raises an error for the first transaction (in the order of the list) which failed or was not committed."""
+        check_tx_statuses(txs, await self.wait_for_tx_statuses(txs))
+
+    async def wait_for_deploys(self, artifacts: List[Artifact]) -> Dict[Artifact, ActionResult]:
+        """Waits for the deployment of all the artifacts to be completed, see `Explorer.wait_for_deploys`."""
+        results = {artifact: ActionResult.Fail for artifact in artifacts}
+        pending = list(results)
+
+        deadline = time.monotonic() + self.DEPLOY_TIMEOUT
+        seen = self._blocks.latest()
+        while pending:
+            try:
+                state = await self.dispatcher_state()
+                for artifact in pending:
+                    if state.is_deployed(artifact):
+                        results[artifact] = ActionResult.Success
+                pending = [artifact for artifact in pending if results[artifact] != ActionResult.Success]
+            except CLIENT_ERRORS:
+                # Exonum API server may be rebooting. Wait for it.
+                pass
+
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+
+            seen = await self._blocks.wait_for_block(seen, min(remaining, self.BLOCK_TIMEOUT))
+
+        return results
+
+    async def wait_for_start(self, instance: Instance) -> ActionResult:
+        """Waits for the instance to be started."""
+        seen = self._blocks.latest()
+        for _ in range(self.RECONNECT_RETRIES):
+            if await self.get_instance_id(instance):
+                return ActionResult.Success
+
+            seen = await self._wait_for_block(seen)
+
+        return ActionResult.Fail
@@ -0,0 +1,384 @@
+"""Module with the asyncio version of the launcher.
+
+Requires `aiohttp`, which is an optional dependency: `pip install exonum-launcher[async]`."""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.protobuf.message import Message
+from exonum_client import ExonumClient
+
+from .action_result import ActionResult
+from .async_client import CLIENT_ERRORS, AsyncClient, AsyncConnectionPool, run_blocking
+from .async_explorer import AsyncExplorer
+from .async_supervisor import AsyncSupervisor
+from .configuration import Artifact, Configuration, Instance
+from .explorer import NotCommittedError, ExecutionFailError, TxStatus, check_tx_statuses
+from .instances import DefaultInstanceSpecLoader, InstanceSpecLoader
+from .journal import Journal
+from .launch_state import LaunchState
+from .plugins import artifact_plugins, runtime_plugins
+from .runtimes import RuntimeSpecLoader
+from .supervisor import Supervisor, SupervisorRequestError
+
+
+class AsyncLauncher:
+    """Async counterpart of `Launcher`, which runs the launch on the asyncio event loop.
+
+    Requests are sent and awaited with non-blocking HTTP and websocket I/O, so one event loop
+    can drive many launches at once:
+
+    >>> async with AsyncLauncher(config) as launcher:
+    >>>     await launcher.deploy_all()
+    >>>     await launcher.wait_for_deploy()
+    >>>     await launcher.start_all()
+    >>>     await launcher.wait_for_start()
+
+    Requests are encoded by the spec loaders and the protobuf loader, which are blocking, so encoding
+    is run in the default executor. The protobuf loader is shared by all the launchers in the process
+    (see `proto_cache.protobuf_loader`), so launches run on the same event loop should use the same
+    version of the supervisor (like the launches run by `Launcher`)."""
+
+    def __init__(self, config: Configuration, journal: Optional[Journal] = None) -> None:
+        self.config = config
+
+        # Keep-alive connections shared by all the clients.
+        self._pool = AsyncConnectionPool.from_config(self.config.connection_pool)
+        self.clients = self._load_clients()
+
+        # Changes of the launch state are recorded to the journal (if provided).
+        self.launch_state = LaunchState(journal)
+
+        # Declare runtime and artifact plugins. Plugins are loaded on the first use.
+        self._runtime_plugins = runtime_plugins(self.config)
+        self._artifact_plugins = artifact_plugins(self.config)
+
+        # Requests are encoded by the blocking supervisor, which loads proto files through the main client.
+        main_network = self.config.networks[0]
+        main_client = ExonumClient(
+            main_network["host"],
+            main_network["public-api-port"],
+            main_network["private-api-port"],
+            main_network["ssl"],
+        )
+        self._explorer = AsyncExplorer(self.clients[0])
+        self._supervisor = AsyncSupervisor(
+            Supervisor(self.config.supervisor_mode, [main_client]), self.clients, self._explorer
+        )
+
+        # Parts of the split configuration proposal which are not sent yet.
+        self._pending_proposals: List[Message] = list()
+        self._sent_proposal: Optional[Message] = None
+        # Instances changed by the proposal sent by `start_all`.
+        self._proposed_instances: List[Instance] = list()
+
+    def _load_clients(self) -> List[AsyncClient]:
+        clients: List[AsyncClient] = []
+
+        for network in self.config.networks:
+            client = AsyncClient(
+                self._pool, network["host"], network["public-api-port"], network["private-api-port"], network["ssl"]
+            )
+            clients.append(client)
+
+            # Do not need more than one node in a 'Simple' mode
+            if self.config.is_simple():
+                break
+
+        return clients
+
+    async def __aenter__(self) -> "AsyncLauncher":
+        await self.initialize()
+
+        return self
+
+    async def __aexit__(
+        self, exc_type: Optional[type], exc_value: Optional[Any], exc_traceback: Optional[object]
+    ) -> None:
+        await self.deinitialize()
+
+    async def initialize(self) -> None:
+        """Initializes the launcher by checking that clients are valid and initializing the Supervisor."""
+
+        async def _check(client: AsyncClient) -> None:
+            try:
+                await client.get("system/v1/stats", private=True)
+            except CLIENT_ERRORS:
+                raise RuntimeError(f"Client from network {client} doesn't respond to API requests")
+
+        await asyncio.gather(*[_check(client) for client in self.clients])
+        self._explorer.initialize()
+        await self._supervisor.initialize()
+
+    async def deinitialize(self) -> None:
+        """De-initializes the launcher by de-initializing the Supervisor and closing the connections."""
+        self._supervisor.deinitialize()
+        # Proto modules are unloaded with the Supervisor, so encoders built from them are not valid anymore.
+        DefaultInstanceSpecLoader.invalidate_cache()
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the connections. Unlike `deinitialize`, can be called on the launcher which was not initialized."""
+        await self._explorer.close()
+        await self._pool.close()
+
+    def add_runtime_spec_loader(self, runtime: str, spec_loader: RuntimeSpecLoader) -> None:
+        """Adds a runtime-specific spec loader to encode runtime artifact spec into bytes."""
+        if self._runtime_plugins.is_declared(runtime):
+            raise ValueError(f"Spec loader for runtime '{runtime}' is already added")
+
+        self._runtime_plugins.add(runtime, spec_loader)
+
+    def add_instance_spec_loader(self, artifact: Artifact, spec_loader: InstanceSpecLoader) -> None:
+        """Adds an artifact-specific config spec loader to encode instance configs into bytes."""
+        if self._artifact_plugins.is_declared(artifact):
+            raise ValueError(f"Instance spec loader for artifact '{artifact.name}' is already added")
+
+        self._artifact_plugins.add(artifact, spec_loader)
+
+    def explorer(self) -> AsyncExplorer:
+        """Returns used explorer"""
+        return self._explorer
+
+    async def _send_deploy_request(self, deploy_request: Message) -> Tuple[List[str], str]:
+        try:
+            return await self._supervisor.send_deploy_request(deploy_request), ""
+        except SupervisorRequestError as error:
+            return list(), str(error)
+
+    def _create_deploy_requests(self, artifacts: List[Artifact]) -> List[Message]:
+        return [
+            self._supervisor.encoder.create_deploy_request(artifact, self._runtime_plugins[artifact.runtime])
+            for artifact in artifacts
+        ]
+
+    async def deploy_all(self, artifacts: Optional[List[Artifact]] = None) -> None:
+        """Deploys all the services from the provided config (or only the provided artifacts from the config).
+
+        Artifact specs are encoded first, and then all the deploy requests are sent concurrently."""
+        if artifacts is None:
+            artifacts = list(self.config.artifacts.values())
+        artifacts = [artifact for artifact in artifacts if artifact.action == "deploy"]
+
+        deploy_requests = await run_blocking(self._create_deploy_requests, artifacts)
+        responses = await asyncio.gather(*[self._send_deploy_request(request) for request in deploy_requests])
+
+        for artifact, (txs, error) in zip(artifacts, responses):
+            self.launch_state.add_pending_deploy(artifact, txs)
+            if error:
+                self.launch_state.complete_deploy(artifact, ActionResult.Fail, error)
+
+    async def wait_for_deploy(self, artifacts: Optional[List[Artifact]] = None) -> None:
+        """Waits for all the deployments (or deployments of the provided artifacts) to be completed,
+        see `Launcher.wait_for_deploy`."""
+        pending_deployments = self.launch_state.pending_deployments()
+        if artifacts is not None:
+            pending_deployments = {
+                artifact: txs for artifact, txs in pending_deployments.items() if artifact in artifacts
+            }
+        statuses = await self._explorer.wait_for_tx_statuses(
+            [tx_hash for tx_hashes in pending_deployments.values() for tx_hash in tx_hashes]
+        )
+
+        descriptions: Dict[Artifact, str] = dict()
+        check_for_deploy: List[Artifact] = list()
+        for artifact, tx_hashes in pending_deployments.items():
+            try:
+                check_tx_statuses(tx_hashes, statuses)
+                descriptions[artifact] = "deployed successfully"
+                check_for_deploy.append(artifact)
+            except (ExecutionFailError, NotCommittedError) as error:
+                descriptions[artifact] = str(error)
+
+        results = await self._explorer.wait_for_deploys(check_for_deploy)
+        for artifact in pending_deployments:
+            result = results.get(artifact, ActionResult.Fail)
+            self.launch_state.complete_deploy(artifact, result, descriptions[artifact])
+
+    def _config_loaders(self, instances: List[Instance]) -> List[InstanceSpecLoader]:
+        """Returns the config spec loaders for the instances (in the same order)."""
+        default_loader = DefaultInstanceSpecLoader()
+        return [self._artifact_plugins.get(instance.artifact, default_loader) for instance in instances]
+
+    async def _resolve_instance_ids(self, instances: List[Instance]) -> None:
+        """Sets the IDs of the running instances changed by the proposal, so the encoder doesn't request them."""
+        for instance in instances:
+            if instance.action != "start" and instance.instance_id is None:
+                instance.instance_id = await self._explorer.get_instance_id(instance)
+                if instance.instance_id is None:
+                    raise RuntimeError(f"Instance {instance} does not seem to be deployed, it can't be changed")
+
+    def _create_config_change_request(self, instances: List[Instance], configuration_number: int) -> Message:
+        return self._supervisor.encoder.create_config_change_request(
+            self.config.consensus,
+            instances,
+            self._config_loaders(instances),
+            self.config.actual_from,
+            configuration_number=configuration_number,
+        )
+
+    async def start_all(self, skipped_artifacts: Optional[List[Artifact]] = None) -> None:
+        """Starts all the service instances from the provided config (except the instances of the skipped artifacts)."""
+        skipped_artifacts = skipped_artifacts or []
+        instances = [instance for instance in self.config.instances if instance.artifact not in skipped_artifacts]
+
+        if not instances:
+            return
+
+        await self._resolve_instance_ids(instances)
+        configuration_number = await self._supervisor.get_configuration_number()
+        config_proposal = await run_blocking(self._create_config_change_request, instances, configuration_number)
+        self._proposed_instances = instances
+
+        # Proposal which exceeds the message size limit is sent in parts, one after another.
+        self._pending_proposals = Supervisor.split_config_proposal(config_proposal, self.config.max_proposal_size)
+        await self._send_next_proposal()
+
+    async def _send_next_proposal(self) -> None:
+        config_proposal = self._pending_proposals.pop(0)
+        txs = await self._supervisor.send_propose_config_request(config_proposal)
+        self.launch_state.add_pending_config(self.config, txs)
+        self._sent_proposal = config_proposal
+
+    async def _wait_for_proposals(self) -> None:
+        """Waits for the sent proposal to be committed, sending the rest of the split proposal parts."""
+        while True:
+            tx_hashes = self.launch_state.pending_configs()[self.config]
+            try:
+                await self._explorer.wait_for_txs(tx_hashes)
+            except (ExecutionFailError, NotCommittedError):
+                self._supervisor.complete_proposal(False)
+                raise
+            self._supervisor.complete_proposal(True)
+
+            if not self._pending_proposals:
+                return
+
+            # The next part can only be proposed once the previous one is applied.
+            assert self._sent_proposal is not None
+            configuration_number = self._sent_proposal.configuration_number + 1
+            if not await self._supervisor.wait_for_configuration(configuration_number):
+                self._pending_proposals = list()
+                raise NotCommittedError(f"Configuration proposal {configuration_number - 1} was not applied")
+            await self._send_next_proposal()
+
+    async def wait_for_start(self) -> None:
+        """Waits for all the initializations to be completed.
+
+        Unlike `Launcher.wait_for_start`, all the started instances are awaited concurrently."""
+        if not self.launch_state.pending_configs():
+            return
+
+        await self._wait_for_proposals()
+
+        started = [instance for instance in self._proposed_instances if instance.action == "start"]
+        results = await asyncio.gather(*[self._explorer.wait_for_start(instance) for instance in started])
+        result = ActionResult.Fail if ActionResult.Fail in results else ActionResult.Success
+        self.launch_state.complete_config(self.config, result)
+
+    async def unload_all(self) -> None:
+        """Unload all artifacts marked as unloaded."""
+        artifacts = list(self.config.artifacts.values())
+        if not any(artifact.action == "unload" for artifact in artifacts):
+            return
+
+        configuration_number = await self._supervisor.get_configuration_number()
+        unload_request = self._supervisor.encoder.create_unload_request(
+            artifacts, self.config.actual_from, configuration_number=configuration_number
+        )
+        assert unload_request is not None
+
+        txs = await self._supervisor.send_propose_config_request(unload_request)
+        self.launch_state.add_pending_unload(txs)
+
+    async def wait_for_unload(self) -> None:
+        """Wait for all unloads to be completed."""
+        tx_hashes = self.launch_state.pending_unloads()
+
+        if not tx_hashes:
+            return
+
+        statuses = await self._explorer.wait_for_tx_statuses(tx_hashes)
+        tx_status, description = statuses[tx_hashes[0]]
+        if tx_status == TxStatus.Success:
+            self.launch_state.unload_status = ActionResult.Success, description
+        else:
+            self.launch_state.unload_status = ActionResult.Fail, description
+        self._supervisor.complete_proposal(tx_status == TxStatus.Success)
+
+    async def migrate_all(self, services: Optional[List[str]] = None) -> None:
+        """Migrates all services from the provided config (or only the provided services from the config).
+
+        Migration requests are sent concurrently."""
+        migrations: List[Tuple[str, Artifact, int]] = list()
+        requests: List[Message] = list()
+        for service_name, artifact in self.config.migrations.items():
+            if services is not None and service_name not in services:
+                continue
+
+            migration_request, seed = self._supervisor.encoder.create_migration_request(service_name, artifact)
+            migrations.append((service_name, artifact, seed))
+            requests.append(migration_request)
+
+        responses = await asyncio.gather(*[self._supervisor.send_migration_request(request) for request in requests])
+        for migration, txs in zip(migrations, responses):
+            self.launch_state.add_pending_migration(migration, txs)
+
+    async def _try_get_migration_state(self, migration: Tuple[str, Artifact, int]) -> Optional[Any]:
+        """Returns the migration state or None if the Exonum API is unavailable."""
+        try:
+            return await self._supervisor.get_migration_state(*migration)
+        except CLIENT_ERRORS:
+            return None
+
+    async def wait_for_migration(self, services: Optional[List[str]] = None) -> None:
+        """Waits for all migrations (or migrations of the provided services) to be completed,
+        see `Launcher.wait_for_migration`."""
+        pending_migrations = {
+            migration: txs
+            for migration, txs in self.launch_state.pending_migrations().items()
+            if services is None or migration[0] in services
+        }
+        statuses = await self._explorer.wait_for_tx_statuses(
+            [tx_hash for tx_hashes in pending_migrations.values() for tx_hash in tx_hashes]
+        )
+
+        results: Dict[Tuple[str, Artifact, int], Tuple[ActionResult, str]] = dict()
+        pending: List[Tuple[str, Artifact, int]] = list()
+        for migration, tx_hashes in pending_migrations.items():
+            try:
+                check_tx_statuses(tx_hashes, statuses)
+                # Migrations which are not finished in time are considered failed.
+                results[migration] = ActionResult.Fail, ""
+                pending.append(migration)
+            except (ExecutionFailError, NotCommittedError) as error:
+                results[migration] = ActionResult.Fail, str(error)
+
+        seen = self._explorer.blocks().latest()
+        for _ in range(self._explorer.RECONNECT_RETRIES):
+            api_available = True
+            unfinished: List[Tuple[str, Artifact, int]] = list()
+            for migration, state in zip(
+                pending, await asyncio.gather(*[self._try_get_migration_state(migration) for migration in pending])
+            ):
+                if state is None:
+                    api_available = False
+                    unfinished.append(migration)
+                elif state.get("state") == "succeed":
+                    results[migration] = ActionResult.Success, "Success"
+                elif "failed" in state.get("state", ""):
+                    results[migration] = ActionResult.Fail, state["state"]["failed"]["error"]["description"]
+                else:
+                    unfinished.append(migration)
+
+            pending = unfinished
+            if not pending:
+                break
+
+            if api_available:
+                seen = await self._explorer.blocks().wait_for_block(seen, self._explorer.BLOCK_TIMEOUT)
+            else:
+                # Exonum API server may be rebooting. Wait for it.
+                await asyncio.sleep(self._explorer.RECONNECT_INTERVAL)
+
+        for (service_name, _, _), result in results.items():
+            self.launch_state.complete_migration(service_name, result)
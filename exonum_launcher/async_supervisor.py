@@ -0,0 +1,146 @@
+"""Module encapsulating the non-blocking interaction with the supervisor."""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from google.protobuf.message import Message
+
+from .async_client import CLIENT_ERRORS, AsyncClient, run_blocking
+from .async_explorer import AsyncExplorer
+from .configuration import Artifact
+from .supervisor import Supervisor, SupervisorRequestError
+
+
+class AsyncSupervisor:
+    """Async counterpart of `Supervisor`.
+
+    Requests are encoded by the wrapped `Supervisor` (see `encoder`), and sent and tracked
+    with non-blocking I/O. Proto files are loaded by the blocking protobuf loader, so `initialize`
+    runs it in the executor."""
+
+    REQUEST_TIMEOUT = Supervisor.REQUEST_TIMEOUT
+    APPLY_BLOCKS = Supervisor.APPLY_BLOCKS
+
+    def __init__(self, encoder: Supervisor, clients: List[AsyncClient], explorer: AsyncExplorer) -> None:
+        self.encoder = encoder
+        self._clients = clients
+        self._main_client = clients[0]
+        self._explorer = explorer
+        # Locally tracked configuration number, see `Supervisor._get_configuration_number`.
+        self._configuration_lock: Optional[asyncio.Lock] = None
+        self._configuration_number: Optional[int] = None
+        self._configuration_number_block = 0
+        self._proposal_pending = False
+
+    async def initialize(self) -> None:
+        """Initializes the wrapped `Supervisor` with the dispatcher state requested from the node."""
+        dispatcher_state = await self._explorer.dispatcher_state()
+        await run_blocking(self.encoder.initialize, dispatcher_state)
+
+    def deinitialize(self) -> None:
+        """Deinitializes the wrapped `Supervisor`."""
+        self.encoder.deinitialize()
+
+    async def _post_to_supervisor(self, endpoint: str, message: Message) -> List[str]:
+        """Sends the message to the supervisor of every node concurrently.
+
+        Responses are returned in the order of clients. If the request fails or times out on some
+        of the nodes, `SupervisorRequestError` with errors for every failed node is raised."""
+        data = message.SerializeToString()
+        path = f"services/supervisor/{endpoint}"
+        tasks = [asyncio.ensure_future(client.post_binary(path, data)) for client in self._clients]
+        # Requests are sent at the same time, so they share the deadline.
+        await asyncio.wait(tasks, timeout=self.REQUEST_TIMEOUT)
+
+        responses: List[str] = list()
+        errors: Dict[str, Exception] = dict()
+        for client, task in zip(self._clients, tasks):
+            node = f"{client.hostname}:{client.private_api_port}"
+            if not task.done():
+                task.cancel()
+                errors[node] = TimeoutError(f"no response in {self.REQUEST_TIMEOUT} seconds")
+            elif isinstance(task.exception(), CLIENT_ERRORS + (ValueError,)):
+                errors[node] = task.exception()  # type: ignore
+            else:
+                responses.append(task.result())
+
+        if errors:
+            raise SupervisorRequestError(endpoint, errors)
+
+        return responses
+
+    async def _request_configuration_number(self) -> int:
+        return int(await self._main_client.get("services/supervisor/configuration-number", private=True))
+
+    async def get_configuration_number(self) -> int:
+        """Returns the configuration number for the next proposal, see `Supervisor._get_configuration_number`."""
+        if self._configuration_lock is None:
+            self._configuration_lock = asyncio.Lock()
+
+        blocks = self._explorer.blocks()
+        async with self._configuration_lock:
+            if self._configuration_number is not None and (
+                self._proposal_pending or self._configuration_number_block == blocks.latest()
+            ):
+                return self._configuration_number
+
+            block = blocks.latest()
+            configuration_number = await self._request_configuration_number()
+
+            # Without the subscription the new blocks can't be tracked, so the number can't be cached.
+            if blocks.is_connected():
+                self._configuration_number = configuration_number
+                self._configuration_number_block = block
+
+            return configuration_number
+
+    def complete_proposal(self, accepted: bool) -> None:
+        """Notifies the Supervisor about the outcome of the sent proposal."""
+        self._proposal_pending = False
+        if accepted:
+            self._configuration_number_block = self._explorer.blocks().latest()
+        else:
+            self._configuration_number = None
+
+    async def wait_for_configuration(self, configuration_number: int) -> bool:
+        """Waits until the supervisor configuration number reaches the given one, see
+        `Supervisor.wait_for_configuration`. Returns False if the number was not reached."""
+        blocks = self._explorer.blocks()
+        seen = blocks.latest()
+        for _ in range(self.APPLY_BLOCKS):
+            if await self._request_configuration_number() >= configuration_number:
+                return True
+
+            seen = await blocks.wait_for_block(seen, self._explorer.BLOCK_TIMEOUT)
+
+        return False
+
+    async def get_migration_state(self, service: str, artifact: Artifact, seed: int) -> Any:
+        """Retrieves a state of the migration for the service."""
+        params = {
+            "service": service,
+            "new_artifact": str(artifact),
+            "deadline_height": str(artifact.deadline_height),
+            "seed": str(seed),
+        }
+        return await self._main_client.get("services/supervisor/migration-status", private=True, params=params)
+
+    async def send_deploy_request(self, deploy_request: Message) -> List[str]:
+        """Sends deploy request to the Supervisor."""
+        return await self._post_to_supervisor("deploy-artifact", deploy_request)
+
+    async def send_migration_request(self, migration_request: Message) -> List[str]:
+        """Sends migration request to the Supervisor"""
+        return await self._post_to_supervisor("migrate", migration_request)
+
+    async def send_propose_config_request(self, config_proposal: Message) -> List[str]:
+        """Sends propose config request to the Supervisor, see `Supervisor.send_propose_config_request`."""
+        try:
+            txs = await self._post_to_supervisor("propose-config", config_proposal)
+        except SupervisorRequestError:
+            self.complete_proposal(False)
+            raise
+
+        self._configuration_number = config_proposal.configuration_number + 1
+        self._proposal_pending = True
+
+        return txs
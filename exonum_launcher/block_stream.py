@@ -0,0 +1,155 @@
+"""Module with a shared subscription to the new block events."""
+import threading
+import time
+from typing import Optional
+
+from exonum_client import ExonumClient
+from exonum_client.client import Subscriber
+from websocket import WebSocketException
+
+
+class BlockStream:
+    """Long-lived subscription to the blocks committed by the Exonum node.
+
+    The websocket connection is opened once in a background thread (and reopened if it drops),
+    and every new block is announced to all the waiting threads. Blocks are numbered in the order
+    they were observed, so a waiter that remembers the number of the last seen block will not miss
+    a block committed between two waits:
+
+    >>> seen = stream.latest()
+    >>> while not condition_is_met():
+    >>>     seen = stream.wait_for_block(seen)
+
+    Establishing the first connection is not considered a block, so the stream should be started
+    before the waiters remember the latest block. Once stopped, the stream can't be started again.
+    """
+
+    # Wait interval between reconnection attempts in seconds.
+    RECONNECT_INTERVAL = 0.5
+    # Timeout for the background thread to finish on stop in seconds.
+    STOP_TIMEOUT = 1.0
+
+    def __init__(self, client: ExonumClient) -> None:
+        self._client = client
+        self._condition = threading.Condition()
+        self._latest = 0
+        self._running = False
+        self._closed = False
+        self._connected = False
+        self._subscriber: Optional[Subscriber] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "BlockStream":
+        self.start()
+
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_value: Optional[object], exc_traceback: Optional[object]) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Starts listening for the new blocks. Does nothing if the stream is already started.
+
+        Raises `RuntimeError` if the stream is already stopped."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Block stream is already stopped")
+            if self._running:
+                return
+
+            self._running = True
+            self._thread = threading.Thread(target=self._listen, name="exonum-launcher-blocks", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Closes the subscription and stops the background thread. The stream can't be used after that."""
+        with self._condition:
+            self._running = False
+            self._closed = True
+            subscriber, thread = self._subscriber, self._thread
+            self._thread = None
+            # Wake up the waiters, so they won't wait for the blocks that will never come.
+            self._condition.notify_all()
+
+        if subscriber is not None:
+            subscriber.stop()
+
+        if thread is not None:
+            thread.join(self.STOP_TIMEOUT)
+
+    def is_connected(self) -> bool:
+        """Returns True if the stream is connected to the node and receives blocks."""
+        with self._condition:
+            return self._connected
+
+    def latest(self) -> int:
+        """Returns the number of the latest observed block."""
+        with self._condition:
+            return self._latest
+
+    def wait_for_block(self, seen: int, timeout: Optional[float] = None) -> int:
+        """Waits until a block newer than `seen` is observed (or the timeout expires)
+        and returns the number of the latest observed block.
+
+        If the block newer than `seen` is already observed, returns immediately. The stream is started
+        if it's not started yet."""
+        self.start()
+
+        with self._condition:
+            self._condition.wait_for(lambda: self._latest > seen or not self._running, timeout)
+            return self._latest
+
+    def _announce_block(self) -> None:
+        with self._condition:
+            self._latest += 1
+            self._condition.notify_all()
+
+    def _is_running(self) -> bool:
+        with self._condition:
+            return self._running
+
+    def _listen(self) -> None:
+        reconnect = False
+        while self._is_running():
+            subscriber = self._client.create_subscriber("blocks")
+            # Subscriber is published before connecting, so `stop` called during the connection
+            # can see it. Since stopping the subscriber which is not connected yet does nothing,
+            # the stream state is checked again after the connection is established.
+            with self._condition:
+                if not self._running:
+                    return
+                self._subscriber = subscriber
+
+            try:
+                subscriber.connect()
+            except (OSError, WebSocketException):
+                with self._condition:
+                    self._subscriber = None
+                # Exonum API server may be rebooting. Wait for it.
+                time.sleep(self.RECONNECT_INTERVAL)
+                continue
+
+            with self._condition:
+                if not self._running:
+                    self._subscriber = None
+                    subscriber.stop()
+                    return
+                self._connected = True
+
+            # Blocks could be committed while the stream was disconnected, so the waiters
+            # are woken up to check the state again. The first connection is not a block.
+            if reconnect:
+                self._announce_block()
+            reconnect = True
+
+            try:
+                while self._is_running():
+                    subscriber.wait_for_new_event()
+                    self._announce_block()
+            except (OSError, WebSocketException):
+                pass
+            finally:
+                with self._condition:
+                    self._subscriber = None
+                    self._connected = False
+                subscriber.stop()
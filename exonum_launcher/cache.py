@@ -0,0 +1,18 @@
+"""Module with the location of the on-disk launcher caches."""
+import os
+
+# Environment variable overriding the cache directory.
+CACHE_DIR_ENV = "EXONUM_LAUNCHER_CACHE_DIR"
+
+
+def cache_dir(*parts: str) -> str:
+    """Returns a path inside the launcher cache directory.
+
+    The cache directory is taken from the `EXONUM_LAUNCHER_CACHE_DIR` environment variable,
+    and defaults to `$XDG_CACHE_HOME/exonum-launcher` (`~/.cache/exonum-launcher`)."""
+    base = os.environ.get(CACHE_DIR_ENV)
+    if not base:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg_cache_home, "exonum-launcher")
+
+    return os.path.join(base, *parts)
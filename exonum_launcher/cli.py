@@ -1,7 +1,7 @@
 """CLI for exonum launcher"""
 import argparse
 
-from .main import main as launcher_main
+from .concurrency import MAX_WORKERS
 
 
 def run_cli() -> None:
@@ -9,7 +9,28 @@ def run_cli() -> None:
     parser = argparse.ArgumentParser(prog="exonum_launcher", description="Exonum service launcher")
 
     parser.add_argument(
-        "-i", "--input", type=str, help="A path to yaml input for service initialization", required=True
+        "-i",
+        "--input",
+        type=str,
+        nargs="+",
+        help="""
+        A path to yaml input for service initialization.
+        If several paths are provided, launches on all the networks are run concurrently.
+        """,
+        required=True,
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Maximum amount of concurrent launches on different networks (default: {MAX_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--config-cache",
+        action="store_true",
+        help="Take the parsed config from the on-disk cache if the config file is not changed since the last run",
     )
 
     parser.add_argument(
@@ -43,5 +64,57 @@ def run_cli() -> None:
         required=False,
     )
 
+    parser.add_argument(
+        "--stream-start",
+        action="store_true",
+        help="Start the instances of every artifact as soon as it's deployed instead of waiting for all the deploys",
+    )
+
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the operations which would be applied (skipping the already applied ones) and exit",
+    )
+
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help="A path to the journal file recording the launch progress, so the interrupted launch can be resumed",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the interrupted launch recorded in the journal instead of starting a new one",
+    )
+
+    parser.add_argument(
+        "--compile",
+        type=str,
+        metavar="PLAN",
+        help="Encode the requests of the launch to the compiled plan file instead of sending them",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--apply",
+        type=str,
+        metavar="PLAN",
+        help="Send the requests from the compiled plan file instead of encoding them from the config",
+        required=False,
+    )
+
     args = parser.parse_args()
+
+    if args.compile is not None and args.apply is not None:
+        parser.error("--compile and --apply can't be used together")
+
+    if args.resume and args.journal is None:
+        parser.error("--resume requires --journal")
+
+    # The launcher pulls in the Exonum client, protobuf and requests, so it's imported only after the arguments
+    # are parsed to keep `--help` and invalid invocations fast.
+    from .main import main as launcher_main  # pylint: disable=import-outside-toplevel
+
     launcher_main(args)
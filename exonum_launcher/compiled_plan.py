@@ -0,0 +1,82 @@
+"""Module with the compiled launch plan: the encoded supervisor requests which can be applied without the spec loaders.
+
+Plan file starts with `MAGIC` followed by the records. Every record consists of the header (record kind
+as one byte, length of the metadata and length of the payload as big-endian 32-bit numbers),
+the metadata encoded as JSON and the payload: the serialized supervisor request."""
+import json
+import struct
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.protobuf.message import Message  # pylint: disable=unused-import
+
+MAGIC = b"EXLPLAN\x01"
+
+_HEADER = struct.Struct(">BII")
+
+
+class RecordKind(Enum):
+    """Kind of the request stored in the record."""
+
+    Deploy = 1
+    Migration = 2
+    Unload = 3
+    Config = 4
+
+
+class PlanRecord(NamedTuple):
+    """Serialized supervisor request along with the data required to send it and to track its result."""
+
+    kind: RecordKind
+    meta: Dict[str, Any]
+    payload: bytes
+
+
+def proposal_record(kind: RecordKind, config_proposal: "Message") -> PlanRecord:
+    """Creates a record for the `ConfigPropose` message.
+
+    The configuration number is not known until the proposal is sent, so it's removed from the payload
+    and appended to it on apply (see `Supervisor.send_compiled_config_proposal`)."""
+    number_field = config_proposal.DESCRIPTOR.fields_by_name["configuration_number"].number
+    config_proposal.ClearField("configuration_number")
+
+    return PlanRecord(kind, {"number_field": number_field}, config_proposal.SerializeToString())
+
+
+def write_plan(path: str, records: List[PlanRecord]) -> None:
+    """Writes the records to the plan file."""
+    with open(path, "wb") as plan_file:
+        plan_file.write(MAGIC)
+        for record in records:
+            meta = json.dumps(record.meta, sort_keys=True).encode()
+            plan_file.write(_HEADER.pack(record.kind.value, len(meta), len(record.payload)))
+            plan_file.write(meta)
+            plan_file.write(record.payload)
+
+
+def read_plan(path: str) -> List[PlanRecord]:
+    """Reads the records from the plan file. Raises `ValueError` if the file is not a valid plan."""
+    with open(path, "rb") as plan_file:
+        data = plan_file.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError(f"File {path} is not a compiled launch plan")
+
+    records: List[PlanRecord] = list()
+    offset = len(MAGIC)
+    while offset < len(data):
+        if offset + _HEADER.size > len(data):
+            raise ValueError(f"Compiled launch plan {path} is truncated")
+
+        kind, meta_length, payload_length = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        end = offset + meta_length + payload_length
+        if end > len(data):
+            raise ValueError(f"Compiled launch plan {path} is truncated")
+
+        meta = json.loads(data[offset : offset + meta_length].decode())
+        records.append(PlanRecord(RecordKind(kind), meta, data[offset + meta_length : end]))
+        offset = end
+
+    return records
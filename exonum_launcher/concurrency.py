@@ -0,0 +1,21 @@
+"""Helpers for running blocking API calls concurrently."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Maximum amount of concurrent requests sent by the launcher.
+MAX_WORKERS = 16
+
+
+def parallel_map(func: Callable[[T], R], items: Iterable[T], max_workers: int = MAX_WORKERS) -> List[R]:
+    """Applies `func` to every item concurrently and returns the results in the order of items.
+
+    Exceptions raised by `func` are propagated to the caller."""
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
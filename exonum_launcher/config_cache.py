@@ -0,0 +1,130 @@
+"""Module with the on-disk cache of the parsed configurations."""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .cache import cache_dir
+from .concurrency import parallel_map
+from .configuration import Configuration, RUNTIMES, include_paths, parse_yaml, resolve_includes
+
+# Version of the cache layout, should be bumped on incompatible changes of the cached classes.
+CACHE_FORMAT = "4"
+
+
+def _digest(content: bytes, *extra: str) -> str:
+    """Calculates a hash of the file content (and the extra parameters affecting the parsing)."""
+    digest = hashlib.sha256()
+    for part in (CACHE_FORMAT, sys.version) + extra:
+        digest.update(part.encode() + b"\0")
+    digest.update(content)
+
+    return digest.hexdigest()
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as config_file:
+        return config_file.read()
+
+
+def _file_digest(path: str) -> str:
+    try:
+        return _digest(_read_file(path))
+    except OSError:
+        return ""
+
+
+class _ConfigEntry(NamedTuple):
+    """Cached configuration along with the data required to check that it's still valid."""
+
+    config: Configuration
+    # The `include` section of the config and hashes of the included files.
+    include: Dict[str, Any]
+    shard_digests: Dict[str, str]
+
+
+class ConfigCache:
+    """Storage of the parsed and validated configurations keyed by the hash of the config file content.
+
+    Since the runtime IDs are resolved while parsing, the provided runtimes are a part of the key as well.
+    Files included by the config (see `resolve_includes`) are cached
+    separately, so only the changed ones are parsed again. Like `ProtoCache`, this cache is a best-effort
+    one: entries which can't be read or written are ignored."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path if path is not None else cache_dir("configs")
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.path, f"{digest}.pickle")
+
+    def _shard_path(self, digest: str) -> str:
+        return os.path.join(self.path, "shards", f"{digest}.pickle")
+
+    def load(self, path: str, runtimes: Optional[Dict[str, int]] = None) -> Optional[Configuration]:
+        """Loads the configuration from the file, taking it from the cache if neither the file
+        nor the files included by it are changed.
+
+        Returns None if the file describes several launches (i.e. has the `network_groups` section),
+        such files are not cached."""
+        runtimes = runtimes if runtimes is not None else RUNTIMES
+        content = _read_file(path)
+        base_dir = os.path.dirname(os.path.abspath(path))
+
+        digest = _digest(content, json.dumps(runtimes, sort_keys=True))
+        cached = self._lookup(self._entry_path(digest))
+        if cached is not None:
+            paths = _flatten(include_paths({"include": cached.include}, base_dir))
+            if dict(zip(paths, parallel_map(_file_digest, paths))) == cached.shard_digests:
+                return cached.config
+
+        data = parse_yaml(content)
+        if "network_groups" in data:
+            return None
+
+        paths = _flatten(include_paths(data, base_dir))
+        shards = dict(zip(paths, parallel_map(self._load_shard, paths)))
+        config = Configuration(resolve_includes(data, base_dir, lambda shard_path: shards[shard_path][1]), runtimes)
+
+        shard_digests = {shard_path: shard_digest for shard_path, (shard_digest, _) in shards.items()}
+        self._store(self._entry_path(digest), _ConfigEntry(config, data.get("include", dict()), shard_digests))
+        return config
+
+    def _load_shard(self, path: str) -> Tuple[str, Dict[Any, Any]]:
+        """Returns the hash and the parsed content of the included file."""
+        content = _read_file(path)
+        digest = _digest(content)
+
+        shard = self._lookup(self._shard_path(digest))
+        if shard is None:
+            shard = parse_yaml(content)
+            self._store(self._shard_path(digest), shard)
+
+        return digest, shard
+
+    @staticmethod
+    def _lookup(path: str) -> Optional[Any]:
+        try:
+            with open(path, "rb") as entry_file:
+                return pickle.load(entry_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # The entry is missing, or it's broken or stored by an incompatible version of the launcher.
+            return None
+
+    @staticmethod
+    def _store(path: str, value: Any) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(prefix=".tmp_", dir=os.path.dirname(path))
+            with os.fdopen(file_descriptor, "wb") as entry_file:
+                pickle.dump(value, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+
+def _flatten(paths: Dict[str, List[str]]) -> List[str]:
+    """Returns the paths of the included files without duplicates."""
+    return list({path: None for section_paths in paths.values() for path in section_paths})
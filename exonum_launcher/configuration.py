@@ -1,55 +1,216 @@
 """Module capable of parsing config file"""
-from typing import Any, Dict, List, Optional
+import glob
+import os
+import warnings
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
 
 import yaml
-from exonum_client.crypto import PublicKey
 
+from .concurrency import parallel_map
+
+# Runtimes known to every configuration by default.
 RUNTIMES = {"rust": 0}
 SUPERVISOR_MODES = ["simple", "decentralized"]
+# Default limit of the serialized configuration proposal size in bytes. It's below the default
+# `max_message_len` of the Exonum consensus (1 MiB) to leave room for the transaction envelope.
+MAX_PROPOSAL_SIZE = 1024 * 1024 - 1024
+# LibYAML-based loader is much faster than the pure Python one, but it's available only if PyYAML is built with it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Sections which can be split into several files, see `resolve_includes`.
+INCLUDE_SECTIONS = ["artifacts", "instances", "migrations"]
 
 
 class Artifact:
-    """Representation of parsed artifact description."""
+    """Representation of parsed artifact description.
+
+    Artifacts are identified by the runtime ID, the name and the version: these fields are read-only,
+    and artifacts with the same identity are equal regardless of the other fields."""
+
+    __slots__ = ("_runtime_id", "_name", "_version", "runtime", "spec", "deadline_height", "action")
 
     @staticmethod
-    def from_dict(data: Dict[Any, Any]) -> "Artifact":
-        """Parses an `Artifact` entity from provided dict."""
+    def from_dict(data: Dict[Any, Any], runtimes: Optional[Dict[str, int]] = None) -> "Artifact":
+        """Parses an `Artifact` entity from provided dict.
+
+        Runtime ID is taken from the provided runtimes (or from the default ones)."""
         actions = ["none", "deploy", "unload"]
         spec = data.get("spec", dict())
         # Check whether we need to deploy the artifact or not
         action = data.get("action", "none")
         if action not in actions:
             raise RuntimeError(f"Incorrect action '{action}'. Available actions are: {actions}")
-        return Artifact(name=data["name"], version=data["version"], runtime=data["runtime"], spec=spec, action=action)
+        return Artifact(
+            name=data["name"],
+            version=data["version"],
+            runtime=data["runtime"],
+            spec=spec,
+            action=action,
+            runtimes=runtimes,
+        )
 
     # pylint: disable=too-many-arguments
-    def __init__(self, name: str, version: str, runtime: str, spec: Any, action: str) -> None:
-        self.name = name
-        self.version = version
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        runtime: str,
+        spec: Any,
+        action: str,
+        *,
+        runtimes: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._name = name
+        self._version = version
         self.runtime = runtime
-        self.runtime_id = RUNTIMES[runtime]
+        self._runtime_id = (runtimes if runtimes is not None else RUNTIMES)[runtime]
         self.spec = spec
-        self.deadline_height = None
+        self.deadline_height: Optional[int] = None
         self.action = action
 
+    @property
+    def name(self) -> str:
+        """Name of the artifact."""
+        return self._name
+
+    @property
+    def version(self) -> str:
+        """Version of the artifact."""
+        return self._version
+
+    @property
+    def runtime_id(self) -> int:
+        """ID of the artifact runtime."""
+        return self._runtime_id
+
+    def key(self) -> Tuple[int, str, str]:
+        """Returns the identity of the artifact: the runtime ID, the name and the version."""
+        return self._runtime_id, self._name, self._version
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Artifact):
+            return NotImplemented
+
+        return self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
     def __str__(self) -> str:
         return f"{self.runtime_id}:{self.name}:{self.version}"
 
+    def __repr__(self) -> str:
+        return f"Artifact({self})"
+
 
 class Instance:
-    """Representation of parsed service instance description."""
+    """Representation of parsed service instance description.
+
+    Instances are identified by the name and the artifact: these fields are read-only,
+    and instances with the same identity are equal regardless of the other fields."""
+
+    __slots__ = ("_artifact", "_name", "config", "instance_id", "action")
 
     def __init__(self, artifact: Artifact, name: str, action: str, config: Any) -> None:
         actions = ["start", "stop", "config", "resume", "freeze"]
         if action not in actions:
             raise RuntimeError(f"Incorrect action '{action}', available actions are: {actions}")
 
-        self.artifact = artifact
-        self.name = name
+        self._artifact = artifact
+        self._name = name
         self.config = config
         self.instance_id: Optional[int] = None
         self.action = action
 
+    @property
+    def artifact(self) -> Artifact:
+        """Artifact of the instance."""
+        return self._artifact
+
+    @property
+    def name(self) -> str:
+        """Name of the instance."""
+        return self._name
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Instance):
+            return NotImplemented
+
+        return (self._name, self._artifact) == (other.name, other.artifact)
+
+    def __hash__(self) -> int:
+        return hash((self._name, self._artifact))
+
+    def __repr__(self) -> str:
+        return f"Instance({self._name}, {self._artifact})"
+
+
+class InstanceCollection(Sequence[Instance]):
+    """List of service instances indexed by the instance name, artifact and action.
+
+    Instances keep the order of addition. Names of the instances are unique."""
+
+    def __init__(self, instances: Iterable[Instance] = ()) -> None:
+        self._instances: List[Instance] = list()
+        self._by_name: Dict[str, Instance] = dict()
+        self._by_artifact: Dict[Artifact, List[Instance]] = dict()
+        self._by_action: Dict[str, List[Instance]] = dict()
+
+        for instance in instances:
+            self.append(instance)
+
+    def append(self, instance: Instance) -> None:
+        """Adds the instance to the end of the collection."""
+        if instance.name in self._by_name:
+            raise ValueError(f"Instance '{instance.name}' is already added")
+
+        self._instances.append(instance)
+        self._by_name[instance.name] = instance
+        self._by_artifact.setdefault(instance.artifact, list()).append(instance)
+        self._by_action.setdefault(instance.action, list()).append(instance)
+
+    def get(self, name: str) -> Optional[Instance]:
+        """Returns the instance with the given name, if any."""
+        return self._by_name.get(name)
+
+    def by_artifact(self, artifact: Artifact) -> List[Instance]:
+        """Returns the instances of the given artifact."""
+        return list(self._by_artifact.get(artifact, list()))
+
+    def by_action(self, action: str) -> List[Instance]:
+        """Returns the instances with the given action, e.g. `start`."""
+        return list(self._by_action.get(action, list()))
+
+    def artifacts(self) -> List[Artifact]:
+        """Returns the artifacts of the instances."""
+        return list(self._by_artifact)
+
+    @overload
+    def __getitem__(self, index: int) -> Instance: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Instance]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Instance, List[Instance]]:
+        return self._instances[index]
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __iter__(self) -> Iterator[Instance]:
+        return iter(self._instances)
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, Instance) and self._by_name.get(item.name) == item
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (InstanceCollection, list)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"InstanceCollection({self._instances!r})"
+
 
 def _get_specific(name: Any, value: Dict[Any, Any], parent: Dict[Any, Any]) -> Any:
     """Attempts to find a key in value, and if there is no such key in it,
@@ -62,12 +223,20 @@ class Configuration:
 
     @staticmethod
     def declare_runtime(runtime: str, runtime_id: int) -> None:
-        """With this method you can declare an additional runtime, for example:
+        """With this method you can declare an additional default runtime, for example:
 
         >>> Configuration.declare_runtime("java", 1)
 
         Please note that this method should be called before config parsing.
+
+        Deprecated: default runtimes are shared by the whole process, provide the runtimes
+        to the `Configuration` instead (see `with_runtimes`).
         """
+        warnings.warn(
+            "Configuration.declare_runtime is deprecated, provide the runtimes to the Configuration instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         if runtime in RUNTIMES:
             raise ValueError(f"Runtime {runtime} is already declared (it has id {RUNTIMES[runtime]})")
 
@@ -75,20 +244,31 @@ class Configuration:
 
     @staticmethod
     def runtimes() -> Dict[str, int]:
-        """Returns a list of added runtimes."""
+        """Returns a list of default runtimes."""
         return RUNTIMES
 
     @staticmethod
-    def from_yaml(path: str) -> "Configuration":
-        """Parses configuration from YAML file."""
-        data = load_yaml(path)
-        return Configuration(data)
+    def with_runtimes(runtimes: Dict[str, int], base: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """Returns the runtimes from `base` (or the default ones) with the additional runtimes declared."""
+        result = dict(base if base is not None else RUNTIMES)
+        for runtime, runtime_id in runtimes.items():
+            if runtime in result:
+                raise ValueError(f"Runtime {runtime} is already declared (it has id {result[runtime]})")
 
-    def __init__(self, data: Dict[Any, Any]) -> None:
-        runtimes = data.get("runtimes")
-        if runtimes is not None:
-            for runtime in runtimes:
-                self.declare_runtime(runtime, runtimes[runtime])
+            result[runtime] = runtime_id
+
+        return result
+
+    @staticmethod
+    def from_yaml(path: str, runtimes: Optional[Dict[str, int]] = None) -> "Configuration":
+        """Parses configuration from YAML file (along with the files included by it)."""
+        data = resolve_includes(load_yaml(path), os.path.dirname(path))
+        return Configuration(data, runtimes)
+
+    def __init__(self, data: Dict[Any, Any], runtimes: Optional[Dict[str, int]] = None) -> None:
+        # Runtimes are scoped to the configuration: the provided (or default) ones along with
+        # the runtimes declared in the config.
+        self.runtime_ids = self.with_runtimes(data.get("runtimes") or dict(), runtimes)
 
         self.networks = data["networks"]
         self.supervisor_mode = data.get("supervisor_mode", "simple")
@@ -99,10 +279,14 @@ class Configuration:
             )
         self.actual_from = data.get("actual_from", 0)
         self.artifacts: Dict[str, Artifact] = dict()
-        self.instances: List[Instance] = list()
+        self.instances = InstanceCollection()
         self.migrations: Dict[str, Artifact] = dict()
         self.plugins: Dict[str, Dict[str, str]] = data.get("plugins", dict())
         self.consensus: Any = data.get("consensus", None)
+        self.connection_pool: Dict[str, Any] = data.get("connection_pool", dict())
+        self.max_proposal_size: int = data.get("max_proposal_size", MAX_PROPOSAL_SIZE)
+        if self.max_proposal_size <= 0:
+            raise ValueError(f"The max_proposal_size must be positive, but '{self.max_proposal_size}' was given.")
 
         if self.consensus is not None:
             self._validate_consensus_config()
@@ -117,7 +301,7 @@ class Configuration:
         # Imports configuration parser for each artifact.
         artifacts = data.get("artifacts", dict())
         for name, value in artifacts.items():
-            artifact = Artifact.from_dict(value)
+            artifact = Artifact.from_dict(value, self.runtime_ids)
             artifact.deadline_height = _get_specific("deadline_height", value, parent=data)
             self.artifacts[str(name)] = artifact
 
@@ -126,12 +310,12 @@ class Configuration:
         for (name, value) in instances.items():
             artifact = self.artifacts[value["artifact"]]
             instance = Instance(artifact, name, value.get("action", "start"), value.get("config", None))
-            self.instances += [instance]
+            self.instances.append(instance)
 
         # Import configuration parser for each migration.
         migrations = data.get("migrations", dict())
         for name, value in migrations.items():
-            artifact = Artifact.from_dict(value)
+            artifact = Artifact.from_dict(value, self.runtime_ids)
             artifact.deadline_height = _get_specific("deadline_height", value, parent=data)
             self.migrations[str(name)] = artifact
 
@@ -161,7 +345,10 @@ class Configuration:
                     "Validator keys should be a list of pairs (consensus_key, service_key) in hexadecimal form"
                 )
 
-            # Check that keys can be parsed correctly.
+            # Check that keys can be parsed correctly. The client is imported here, since it's heavy
+            # and not needed for anything else while the config is parsed.
+            from exonum_client.crypto import PublicKey  # pylint: disable=import-outside-toplevel
+
             _ = PublicKey(bytes.fromhex(key_pair[0]))
             _ = PublicKey(bytes.fromhex(key_pair[1]))
 
@@ -172,5 +359,67 @@ class Configuration:
 
 def load_yaml(path: str) -> Dict[Any, Any]:
     """Loads YAML from file."""
-    with open(path, "r") as config_file:
-        return yaml.safe_load(config_file)
+    with open(path, "rb") as config_file:
+        return parse_yaml(config_file.read())
+
+
+def parse_yaml(content: bytes) -> Dict[Any, Any]:
+    """Parses YAML from the file content."""
+    return yaml.load(content, Loader=YAML_LOADER)
+
+
+def include_paths(data: Dict[Any, Any], base_dir: str) -> Dict[str, List[str]]:
+    """Returns the paths of the files included by the config for every section, see `resolve_includes`."""
+    include = data.get("include", dict())
+    paths: Dict[str, List[str]] = dict()
+    for section, patterns in include.items():
+        if section not in INCLUDE_SECTIONS:
+            raise ValueError(f"Section '{section}' can't be included. Available sections are: {INCLUDE_SECTIONS}")
+
+        patterns = [patterns] if isinstance(patterns, str) else patterns
+        paths[section] = list()
+        for pattern in patterns:
+            matched = sorted(glob.glob(os.path.join(os.path.abspath(base_dir), pattern)))
+            paths[section] += [path for path in matched if path not in paths[section]]
+
+    return paths
+
+
+def resolve_includes(
+    data: Dict[Any, Any], base_dir: str, load_shard: Callable[[str], Dict[Any, Any]] = load_yaml
+) -> Dict[Any, Any]:
+    """Merges the files included by the config into it, so large configs can be split into several files:
+
+    ```yaml
+    include:
+      artifacts: "artifacts.yml"
+      instances: ["instances/*.yml", "extra/instances.yml"]
+    ```
+
+    Every included file contains the entries of the section, the same as the section of the config does.
+    Glob patterns are relative to the `base_dir` (the directory of the config), files matched by every
+    pattern are included in the alphabetical order. Included files are loaded concurrently.
+    Entries with the same name in different files are considered an error."""
+    if "include" not in data:
+        return data
+
+    paths = include_paths(data, base_dir)
+    all_paths = list({path: None for section_paths in paths.values() for path in section_paths})
+    shards = dict(zip(all_paths, parallel_map(load_shard, all_paths)))
+
+    result = {key: value for key, value in data.items() if key != "include"}
+    for section, section_paths in paths.items():
+        entries = dict(data.get(section) or dict())
+        for path in section_paths:
+            shard = shards[path] or dict()
+            if not isinstance(shard, dict):
+                raise ValueError(f"Included file {path} should contain a mapping of the '{section}' entries")
+
+            duplicates = [name for name in shard if name in entries]
+            if duplicates:
+                raise ValueError(f"Entries {duplicates} from the included file {path} are already defined")
+
+            entries.update(shard)
+        result[section] = entries
+
+    return result
@@ -0,0 +1,119 @@
+"""Module with a pool of keep-alive HTTP connections shared by the Exonum clients."""
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from exonum_client import ExonumClient
+from exonum_client.api import Api, ServiceApi
+from exonum_client.protobuf_provider import ExonumApiProvider
+
+from .concurrency import MAX_WORKERS
+
+
+class ConnectionPool:
+    """Pool of keep-alive HTTP sessions, one session per host.
+
+    Every session keeps up to `pool_size` open connections to its host, so the numerous small
+    API requests made during the launch reuse connections instead of paying for TCP/TLS setup.
+
+    Pool can be configured in the `connection_pool` section of the config:
+
+    >>> connection_pool:
+    >>>   pool_size: 16
+    >>>   connect_timeout: 10
+    >>>   read_timeout: 60
+    """
+
+    OPTIONS = ["pool_size", "connect_timeout", "read_timeout"]
+
+    @staticmethod
+    def from_config(data: Dict[str, Any]) -> "ConnectionPool":
+        """Creates a pool from the `connection_pool` section of the config."""
+        for option in data:
+            if option not in ConnectionPool.OPTIONS:
+                raise ValueError(
+                    f"Unknown connection pool option '{option}'. Available options are: {ConnectionPool.OPTIONS}"
+                )
+
+        return ConnectionPool(**data)
+
+    def __init__(self, pool_size: int = MAX_WORKERS, connect_timeout: float = 10.0, read_timeout: float = 60.0):
+        if pool_size < 1:
+            raise ValueError(f"Connection pool size must be positive, but {pool_size} was given")
+
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[str, str], requests.Session] = dict()
+
+    def session(self, url: str) -> requests.Session:
+        """Returns a session for the host of the given URL."""
+        parts = urlsplit(url)
+        key = parts.scheme, parts.netloc
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(f"{parts.scheme}://{parts.netloc}", adapter)
+                self._sessions[key] = session
+
+            return session
+
+    def get(self, url: str, params: Optional[Dict[Any, Any]] = None) -> requests.Response:
+        """Performs a GET request using a pooled connection."""
+        return self.session(url).get(url, params=params, timeout=self.timeout)
+
+    def post(self, url: str, data: Any, headers: Dict[str, str]) -> requests.Response:
+        """Performs a POST request using a pooled connection."""
+        return self.session(url).post(url, data=data, headers=headers, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Closes all the open connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+
+class PooledExonumClient(ExonumClient):
+    """ExonumClient which sends all the API requests through the shared connection pool,
+    including the requests for the Rust runtime proto sources made by its `protobuf_provider`."""
+
+    # ID of the Rust runtime, for which the client fetches proto sources from the node.
+    RUST_RUNTIME_ID = 0
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, pool: ConnectionPool, hostname: str, public_api_port: int, private_api_port: int, ssl: bool
+    ) -> None:
+        super().__init__(hostname, public_api_port, private_api_port, ssl)
+
+        self.pool = pool
+        self._use_pool(self.public_api)
+        self._use_pool(self.private_api)
+
+        # Default provider of the Rust runtime sources is replaced with the pooled one.
+        proto_sources_api = ExonumApiProvider(hostname, public_api_port, self.schema)
+        self._use_pool(proto_sources_api)
+        self.protobuf_provider.add_fallback_provider(self.RUST_RUNTIME_ID, proto_sources_api)
+
+    def _use_pool(self, api: Api) -> None:
+        # `Api` performs requests via its `get` and `post` methods, so they are replaced for this object.
+        api.get = self.pool.get  # type: ignore
+        api.post = self.pool.post  # type: ignore
+
+    def service_private_api(self, service_name: str) -> ServiceApi:
+        service_api = super().service_private_api(service_name)
+        self._use_pool(service_api)
+        return service_api
+
+    def service_public_api(self, service_name: str) -> ServiceApi:
+        service_api = super().service_public_api(service_name)
+        self._use_pool(service_api)
+        return service_api
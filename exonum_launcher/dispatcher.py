@@ -0,0 +1,38 @@
+"""Module with a snapshot of the dispatcher state."""
+from typing import Any, Dict, Optional, Tuple
+
+from .configuration import Artifact, Instance
+
+# Artifact identifier: (runtime ID, name, version).
+ArtifactKey = Tuple[int, str, str]
+
+
+class DispatcherState:
+    """Snapshot of the artifacts and service instances known to the dispatcher.
+
+    Artifacts are indexed by `(runtime_id, name, version)` and services are indexed by the instance name,
+    so every lookup takes constant time."""
+
+    def __init__(self, dispatcher_info: Dict[str, Any]) -> None:
+        self.artifacts: Dict[ArtifactKey, Dict[str, Any]] = {
+            (value["runtime_id"], value["name"], value["version"]): value for value in dispatcher_info["artifacts"]
+        }
+        self.services: Dict[str, Dict[str, Any]] = {
+            status["spec"]["name"]: status for status in dispatcher_info["services"]
+        }
+
+    def is_deployed(self, artifact: Artifact) -> bool:
+        """Returns True if artifact is deployed. Otherwise returns False."""
+        return artifact.key() in self.artifacts
+
+    def get_service(self, name: str) -> Optional[Dict[str, Any]]:
+        """Returns the status of the service instance with the given name, or None if there is no such service."""
+        return self.services.get(name)
+
+    def get_instance_id(self, instance: Instance) -> Optional[int]:
+        """Returns ID of the service instance. If service instance was not found, None is returned."""
+        status = self.get_service(instance.name)
+        if status is None:
+            return None
+
+        return int(status["spec"]["id"])
@@ -1,14 +1,18 @@
 """Module encapsulating the interaction with the Explorer."""
 
 from enum import auto as enum_auto, Enum
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
+import threading
 import time
 
 from requests.exceptions import ConnectionError as RequestsConnectionError, HTTPError
 from exonum_client import ExonumClient
 
 from .action_result import ActionResult
+from .block_stream import BlockStream
+from .concurrency import parallel_map
 from .configuration import Artifact, Instance
+from .dispatcher import DispatcherState
 
 
 class NotCommittedError(Exception):
@@ -28,6 +32,16 @@ class TxStatus(Enum):
     Unknown = enum_auto()
 
 
+def check_tx_statuses(txs: List[str], statuses: Dict[str, Tuple[TxStatus, str]]) -> None:
+    """Raises an error for the first transaction (in the order of the list) which failed or was not committed."""
+    for tx_hash in txs:
+        status, description = statuses[tx_hash]
+        if status == TxStatus.Error:
+            raise ExecutionFailError(f"Tx [{tx_hash}] was committed with error: {description}")
+        if status != TxStatus.Success:
+            raise NotCommittedError(f"Tx [{tx_hash}] was not committed")
+
+
 class Explorer:
     """Interface to interact with the Explorer service."""
 
@@ -35,35 +49,63 @@ class Explorer:
     RECONNECT_RETRIES = 10
     # Wait interval between connection attempts in seconds.
     RECONNECT_INTERVAL = 0.5
+    # Maximum time to wait for a new block in seconds.
+    BLOCK_TIMEOUT = 30.0
+    # Maximum time to wait for the dispatcher to pick up deployed artifacts in seconds.
+    DEPLOY_TIMEOUT = 60.0
 
     def __init__(self, client: ExonumClient):
         self._client = client
+        self._blocks = BlockStream(client)
+        self._dispatcher_lock = threading.Lock()
+        self._dispatcher_state: Optional[Tuple[int, DispatcherState]] = None
 
-    def is_deployed(self, artifact: Artifact) -> bool:
-        """Returns True if artifact is deployed. Otherwise returns False."""
-        dispatcher_info = self._client.public_api.available_services().json()
+    def initialize(self) -> None:
+        """Subscribes to the new blocks, so the blocks committed from now on are observed by the waiters."""
+        self._blocks.start()
+
+    def close(self) -> None:
+        """Closes the subscription to the new blocks."""
+        self._blocks.stop()
+
+    def blocks(self) -> BlockStream:
+        """Returns the stream of the new blocks shared by all the waiters."""
+        return self._blocks
+
+    def _wait_for_block(self, seen: int) -> int:
+        return self._blocks.wait_for_block(seen, self.BLOCK_TIMEOUT)
+
+    def dispatcher_state(self) -> DispatcherState:
+        """Returns a snapshot of the dispatcher state.
+
+        The dispatcher state can only change when a new block is committed, so the snapshot
+        is cached until the next block is observed by the block stream."""
+        self._blocks.start()
+
+        with self._dispatcher_lock:
+            # Block number is taken before the request, so a block committed during the request
+            # invalidates the snapshot.
+            seen = self._blocks.latest()
+            if self._dispatcher_state is not None and self._dispatcher_state[0] == seen:
+                return self._dispatcher_state[1]
 
-        for value in dispatcher_info["artifacts"]:
-            if (
-                value["runtime_id"] == artifact.runtime_id
-                and value["name"] == artifact.name
-                and value["version"] == artifact.version
-            ):
-                return True
+            state = DispatcherState(self._client.public_api.available_services().json())
+            # Without the subscription the new blocks can't be tracked, so the snapshot can't be cached.
+            if self._blocks.is_connected():
+                self._dispatcher_state = seen, state
+            else:
+                self._dispatcher_state = None
 
-        return False
+            return state
+
+    def is_deployed(self, artifact: Artifact) -> bool:
+        """Returns True if artifact is deployed. Otherwise returns False."""
+        return self.dispatcher_state().is_deployed(artifact)
 
     def get_instance_id(self, instance: Instance) -> Optional[int]:
         """Returns ID if running instance. Is service instance was not found,
         None is returned."""
-        dispatcher_info = self._client.public_api.available_services().json()
-
-        for status in dispatcher_info["services"]:
-            spec = status["spec"]
-            if spec["name"] == instance.name:
-                return int(spec["id"])
-
-        return None
+        return self.dispatcher_state().get_instance_id(instance)
 
     def get_tx_status(self, tx_hash: str) -> Tuple[TxStatus, str]:
         """Returns status of the transaction by its hash."""
@@ -79,48 +121,98 @@ class Explorer:
 
         return TxStatus.NotCommitted, "not committed"
 
+    def _try_get_tx_status(self, tx_hash: str) -> Optional[Tuple[TxStatus, str]]:
+        """Returns status of the transaction or None if the Exonum API is unavailable."""
+        try:
+            return self.get_tx_status(tx_hash)
+        except (RequestsConnectionError, ConnectionRefusedError, HTTPError):
+            return None
+
+    def wait_for_tx_statuses(self, txs: List[str]) -> Dict[str, Tuple[TxStatus, str]]:
+        """Waits until every transaction from the list is committed and returns the status of each one.
+
+        All the pending transactions are checked concurrently, and on every new block only the transactions
+        which are not committed yet are checked again. Transactions which are not committed after
+        `RECONNECT_RETRIES` attempts get the `NotCommitted` status (or `Unknown` if the API was unavailable)."""
+        statuses: Dict[str, Tuple[TxStatus, str]] = {tx_hash: (TxStatus.Unknown, "unknown") for tx_hash in txs}
+        pending = list(statuses)
+
+        seen = self._blocks.latest()
+        for _ in range(self.RECONNECT_RETRIES):
+            results = parallel_map(self._try_get_tx_status, pending)
+
+            api_available = True
+            for tx_hash, result in zip(pending, results):
+                if result is None:
+                    api_available = False
+                else:
+                    statuses[tx_hash] = result
+
+            pending = [
+                tx_hash for tx_hash in pending if statuses[tx_hash][0] in (TxStatus.Unknown, TxStatus.NotCommitted)
+            ]
+            if not pending:
+                break
+
+            if api_available:
+                seen = self._wait_for_block(seen)
+            else:
+                # Exonum API server may be rebooting. Wait for it.
+                time.sleep(self.RECONNECT_INTERVAL)
+
+        return statuses
+
     def wait_for_tx(self, tx_hash: str) -> None:
         """Waits until the tx is committed."""
-        for _ in range(self.RECONNECT_RETRIES):
+        self.wait_for_txs([tx_hash])
+
+    def wait_for_txs(self, txs: List[str]) -> None:
+        """Waits until every transaction from the list is committed.
+
+        Raises an error for the first transaction (in the order of the list) which failed or was not committed."""
+        check_tx_statuses(txs, self.wait_for_tx_statuses(txs))
+
+    def wait_for_deploys(self, artifacts: List[Artifact]) -> Dict[Artifact, ActionResult]:
+        """Waits for the deployment of all the artifacts to be completed.
+
+        Dispatcher state is checked once per block for all the artifacts which are not deployed yet.
+        Since it can take several seconds for the dispatcher to pick up the deployed artifact, artifacts
+        are waited for up to `DEPLOY_TIMEOUT` seconds."""
+        results = {artifact: ActionResult.Fail for artifact in artifacts}
+        pending = list(results)
+
+        deadline = time.monotonic() + self.DEPLOY_TIMEOUT
+        seen = self._blocks.latest()
+        while pending:
             try:
-                status, description = self.get_tx_status(tx_hash)
-                if status == TxStatus.Success:
-                    return
-                if status == TxStatus.Error:
-                    raise ExecutionFailError(f"Tx [{tx_hash}] was committed with error: {description}")
-                with self._client.create_subscriber("blocks") as subscriber:
-                    subscriber.wait_for_new_event()
+                state = self.dispatcher_state()
+                for artifact in pending:
+                    if state.is_deployed(artifact):
+                        results[artifact] = ActionResult.Success
+                pending = [artifact for artifact in pending if results[artifact] != ActionResult.Success]
             except (RequestsConnectionError, ConnectionRefusedError, HTTPError):
                 # Exonum API server may be rebooting. Wait for it.
-                time.sleep(self.RECONNECT_INTERVAL)
-                continue
-        raise NotCommittedError(f"Tx [{tx_hash}] was not committed")
+                pass
 
-    def wait_for_txs(self, txs: List[str]) -> None:
-        """Waits until every transaction from the list is committed."""
-        for tx_hash in txs:
-            self.wait_for_tx(tx_hash)
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
 
-    def wait_for_deploy(self, artifact: Artifact) -> ActionResult:
-        """Waits for all the deployment of artifact to be completed."""
-        for _ in range(self.RECONNECT_RETRIES):
-            if self.is_deployed(artifact):
-                return ActionResult.Success
+            seen = self._blocks.wait_for_block(seen, min(remaining, self.BLOCK_TIMEOUT))
 
-            with self._client.create_subscriber("blocks") as subscriber:
-                # TODO Temporary solution because currently it takes up to 10 seconds to update dispatcher info.
-                time.sleep(2)
-                subscriber.wait_for_new_event()
+        return results
 
-        return ActionResult.Fail
+    def wait_for_deploy(self, artifact: Artifact) -> ActionResult:
+        """Waits for all the deployment of artifact to be completed."""
+        return self.wait_for_deploys([artifact])[artifact]
 
     def wait_for_start(self, instance: Instance) -> ActionResult:
         """Waits for all the initializations to be completed."""
+        seen = self._blocks.latest()
         for _ in range(self.RECONNECT_RETRIES):
             if self.get_instance_id(instance):
                 return ActionResult.Success
 
-            with self._client.create_subscriber("blocks") as subscriber:
-                subscriber.wait_for_new_event()
+            seen = self._wait_for_block(seen)
 
         return ActionResult.Fail
@@ -0,0 +1,108 @@
+"""Module running launches on many independent networks concurrently."""
+import concurrent.futures
+import contextlib
+import io
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .configuration import load_yaml, resolve_includes
+
+# Function running a launch for the config data and the command line arguments.
+LaunchFunction = Callable[[Dict[Any, Any], Any], Dict[str, Any]]
+
+
+class LaunchResult(NamedTuple):
+    """Summary of a launch on a single network."""
+
+    name: str
+    # Deploy statuses keyed by the artifact ID.
+    artifacts: Dict[str, str]
+    # Instance IDs keyed by the instance name, `None` if the instance was not started.
+    instances: Dict[str, Optional[int]]
+    # Error which interrupted the launch, empty if the launch was completed.
+    error: str
+    # Output printed by the launcher.
+    output: str
+
+
+def load_fleet(paths: List[str]) -> List[Tuple[str, Dict[Any, Any]]]:
+    """Loads the launch configs from the files, returning them along with the launch names.
+
+    A file with the `network_groups` section instead of `networks` describes a launch
+    for every group of networks, e.g.:
+
+    ```yaml
+    network_groups:
+      staging:
+        - host: "staging.example.com"
+          ...
+      testnet:
+        - host: "testnet.example.com"
+          ...
+    ```
+    """
+    launches: List[Tuple[str, Dict[Any, Any]]] = list()
+    for path in paths:
+        data = resolve_includes(load_yaml(path), os.path.dirname(path))
+        network_groups = data.pop("network_groups", None)
+        if network_groups is None:
+            launches.append((path, data))
+            continue
+
+        if "networks" in data:
+            raise ValueError(f"Config {path} can't have both `networks` and `network_groups` sections")
+
+        for group, networks in network_groups.items():
+            launches.append((f"{path}:{group}", dict(data, networks=networks)))
+
+    return launches
+
+
+def _run_launch(launch: LaunchFunction, name: str, data: Dict[Any, Any], args: Any) -> LaunchResult:
+    """Runs the launch in a worker process."""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            results = launch(data, args)
+    # Errors of a launch must not affect the other launches, they're reported in the results instead.
+    # pylint: disable=broad-except
+    except Exception as error:
+        return LaunchResult(name, dict(), dict(), f"{type(error).__name__}: {error}", output.getvalue())
+
+    artifacts = {str(artifact): status for artifact, status in results["artifacts"].items()}
+    instances = {instance.name: instance_id for instance, instance_id in results["instances"].items()}
+    return LaunchResult(name, artifacts, instances, "", output.getvalue())
+
+
+def run_fleet(
+    launches: List[Tuple[str, Dict[Any, Any]]], launch: LaunchFunction, args: Any, workers: int
+) -> List[LaunchResult]:
+    """Runs the launches concurrently in at most `workers` processes, returning results in the order of launches.
+
+    Launches are run in separate processes, since the protobuf loader and the declared runtimes
+    are process-wide. Compiled proto modules are still shared through the on-disk cache."""
+    # `concurrent.futures` loads the process pool (and `multiprocessing`) on the first access only.
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, min(workers, len(launches)))) as executor:
+        futures = [executor.submit(_run_launch, launch, name, data, args) for name, data in launches]
+        return [future.result() for future in futures]
+
+
+def format_fleet_results(results: List[LaunchResult]) -> str:
+    """Formats the results of the launches as a table."""
+    rows = [("NETWORK", "DEPLOYED", "STARTED", "RESULT")]
+    for result in results:
+        deployed = sum(1 for status in result.artifacts.values() if status == "success")
+        started = sum(1 for instance_id in result.instances.values() if instance_id is not None)
+        rows.append(
+            (
+                result.name,
+                f"{deployed}/{len(result.artifacts)}",
+                f"{started}/{len(result.instances)}",
+                result.error or "OK",
+            )
+        )
+
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]) - 1)]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)) + "  " + row[-1] for row in rows
+    )
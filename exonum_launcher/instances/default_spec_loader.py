@@ -1,13 +1,14 @@
 """Default spec loader which will be attempted to be used in case
 if concrete loader was not provided for artifact."""
 
-from typing import Any
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from exonum_client.protobuf_loader import ProtobufLoader
 from exonum_client.module_manager import ModuleManager
 from exonum_client.proofs.encoder import build_encoder_function
 
-from exonum_launcher.configuration import Instance
+from exonum_launcher.configuration import Artifact, Instance
 
 from .instance_spec_loader import InstanceSpecLoader, InstanceSpecLoadError
 
@@ -17,32 +18,53 @@ class DefaultInstanceSpecLoader(InstanceSpecLoader):
     It attempts to load artifact proto files and recursively merge
     Config message from provided instance config dict.
 
-    For changing service configuration, Config message is attempted to be used as well"""
+    For changing service configuration, Config message is attempted to be used as well.
+
+    Encoders are built once per artifact and shared by all the loaders. Since they depend on
+    the loaded proto modules, the cache must be invalidated when the modules are unloaded."""
+
+    # Encoders of the `Config` message keyed by the artifact name and version.
+    _encoders: Dict[Tuple[str, str], Callable[[Any], bytes]] = dict()
+    _encoders_lock = threading.Lock()
+
+    @classmethod
+    def invalidate_cache(cls, artifact: Optional[Artifact] = None) -> None:
+        """Drops the cached encoder for the given artifact, or all the cached encoders if artifact is not provided."""
+        with cls._encoders_lock:
+            if artifact is None:
+                cls._encoders.clear()
+            else:
+                cls._encoders.pop((artifact.name, artifact.version), None)
+
+    @staticmethod
+    def _build_encoder(loader: ProtobufLoader, artifact: Artifact) -> Callable[[Any], bytes]:
+        try:
+            # Try to load module (if it's already compiled) first.
+            service_module = ModuleManager.import_service_module(artifact.name, artifact.version, "service")
+        except (ModuleNotFoundError, ImportError):
+            # If it's not compiled, load & compile protobuf.
+            loader.load_service_proto_files(artifact.runtime_id, artifact.name, artifact.version)
+            service_module = ModuleManager.import_service_module(artifact.name, artifact.version, "service")
+
+        config_class = service_module.Config
+
+        # `build_encoder_function` will create a recursive binary serializer for the
+        # provided message type. In our case we want to serialize `Config`.
+        return build_encoder_function(config_class)
 
     def load_spec(self, loader: ProtobufLoader, instance: Instance) -> bytes:
         return self.serialize_config(loader, instance, instance.config)
 
     def serialize_config(self, loader: ProtobufLoader, instance: Instance, config: Any) -> bytes:
+        artifact = instance.artifact
         try:
-            try:
-                # Try to load module (if it's already compiled) first.
-                service_module = ModuleManager.import_service_module(
-                    instance.artifact.name, instance.artifact.version, "service"
-                )
-            except (ModuleNotFoundError, ImportError):
-                # If it's not compiled, load & compile protobuf.
-                loader.load_service_proto_files(
-                    instance.artifact.runtime_id, instance.artifact.name, instance.artifact.version
-                )
-                service_module = ModuleManager.import_service_module(
-                    instance.artifact.name, instance.artifact.version, "service"
-                )
-
-            config_class = service_module.Config
-
-            # `build_encoder_function` will create a recursive binary serializer for the
-            # provided message type. In our case we want to serialize `Config`.
-            config_encoder = build_encoder_function(config_class)
+            with self._encoders_lock:
+                key = artifact.name, artifact.version
+                config_encoder = self._encoders.get(key)
+                if config_encoder is None:
+                    config_encoder = self._build_encoder(loader, artifact)
+                    self._encoders[key] = config_encoder
+
             result = config_encoder(config)
 
         # We're catching all the exceptions to shutdown gracefully (on the caller side) just in case.
@@ -0,0 +1,69 @@
+"""Module with the persisted journal of the launch."""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class Journal:
+    """Append-only journal of the launch events stored as JSON lines.
+
+    Every record is flushed and synced to the disk before `append` returns, so after a crash
+    the journal contains every record appended before it. A partially written last line
+    (if the process died while writing it) is ignored on reading.
+
+    The journal file is kept open until `close` is called, so the journal should be closed
+    explicitly or used as a context manager:
+
+    >>> with Journal(path) as journal:
+    >>>     journal.append({"event": "pending_deploy"})
+    """
+
+    def __init__(self, path: str, truncate: bool = False) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        if not truncate and os.path.exists(path):
+            _drop_incomplete_record(path)
+        # The file is owned by the journal and closed by `close`.
+        self._file = open(path, "w" if truncate else "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_value: Optional[object], exc_traceback: Optional[object]) -> None:
+        self.close()
+
+    @staticmethod
+    def read(path: str) -> List[Dict[str, Any]]:
+        """Reads all the complete records from the journal."""
+        records: List[Dict[str, Any]] = list()
+        with open(path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                if not line.endswith("\n"):
+                    # The last record was not written completely.
+                    break
+
+                records.append(json.loads(line))
+
+        return records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Appends a record to the journal."""
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        with self._lock:
+            self._file.close()
+
+
+def _drop_incomplete_record(path: str) -> None:
+    """Truncates the partially written last line, so the appended records start on a new line."""
+    with open(path, "rb+") as journal_file:
+        content = journal_file.read()
+        if content and not content.endswith(b"\n"):
+            journal_file.truncate(content.rfind(b"\n") + 1)
@@ -1,14 +1,24 @@
 """Launch process state module"""
-from typing import Dict, List, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from .action_result import ActionResult
 from .configuration import Artifact, Configuration
+from .journal import Journal
 
 
 class LaunchState:
-    """State of the deploy&init process."""
+    """State of the deploy&init process.
 
-    def __init__(self) -> None:
+    If the journal is provided, every change of the state is recorded to it,
+    so the state can be restored after the crash of the launcher (see `restore`).
+
+    Launch tasks update the state concurrently (see `Scheduler`), so all the accesses
+    to the state are done under the lock, and only the copies of the state are returned."""
+
+    def __init__(self, journal: Optional[Journal] = None) -> None:
+        self._journal = journal
+        self._lock = threading.Lock()
         self._pending_configs: Dict[Configuration, List[str]] = dict()
         self._pending_deployments: Dict[Artifact, List[str]] = dict()
         self._pending_migrations: Dict[Tuple[str, Artifact, int], List[str]] = dict()
@@ -16,70 +26,146 @@ class LaunchState:
         self._completed_deployments: Dict[Artifact, Tuple[ActionResult, str]] = dict()
         self._complete_migrations: Dict[str, Tuple[ActionResult, str]] = dict()
         self._pending_unloads: List[str] = list()
-        self.unload_status = ActionResult.Unknown, ""
+        self._unload_status = ActionResult.Unknown, ""
+
+    def _record(self, event: str, **data: Any) -> None:
+        if self._journal is not None:
+            self._journal.append(dict(data, event=event))
+
+    def restore(self, records: List[Dict[str, Any]], config: Configuration) -> None:
+        """Restores the state from the journal records.
+
+        Artifacts are matched with the artifacts from the config by their IDs,
+        records about unknown artifacts are ignored."""
+        artifacts = {str(artifact): artifact for artifact in config.artifacts.values()}
+        artifacts.update({str(artifact): artifact for artifact in config.migrations.values()})
+
+        with self._lock:
+            for record in records:
+                event = record["event"]
+                artifact = artifacts.get(record.get("artifact", ""))
+                if event == "pending_deploy" and artifact is not None:
+                    self._pending_deployments[artifact] = record["txs"]
+                elif event == "complete_deploy" and artifact is not None:
+                    self._completed_deployments[artifact] = ActionResult[record["result"]], record["description"]
+                    self._pending_deployments.pop(artifact, None)
+                elif event == "pending_config":
+                    self._pending_configs[config] = record["txs"]
+                elif event == "complete_config":
+                    self._completed_configs[config] = ActionResult[record["result"]]
+                    self._pending_configs.pop(config, None)
+                elif event == "pending_unload":
+                    self._pending_unloads = record["txs"]
+                elif event == "complete_unload":
+                    self._unload_status = ActionResult[record["result"]], record["description"]
+                elif event == "pending_migration" and artifact is not None:
+                    self._pending_migrations[(record["service"], artifact, record["seed"])] = record["txs"]
+                elif event == "complete_migration":
+                    result = ActionResult[record["result"]], record["description"]
+                    self._complete_migrations[record["service"]] = result
+                    self._pending_migrations = {
+                        migration: txs
+                        for migration, txs in self._pending_migrations.items()
+                        if migration[0] != record["service"]
+                    }
 
     def add_pending_deploy(self, artifact: Artifact, txs: List[str]) -> None:
         """Adds a pending deploy to the state."""
-        self._pending_deployments[artifact] = txs
+        with self._lock:
+            self._record("pending_deploy", artifact=str(artifact), txs=txs)
+            self._pending_deployments[artifact] = txs
 
     def add_pending_config(self, config: Configuration, txs: List[str]) -> None:
         """Adds a pending config to the state."""
-        self._pending_configs[config] = txs
+        with self._lock:
+            self._record("pending_config", txs=txs)
+            self._pending_configs[config] = txs
 
     def pending_deployments(self) -> Dict[Artifact, List[str]]:
         """Returns a copy of pending deployments dict."""
-        return dict(self._pending_deployments)
+        with self._lock:
+            return dict(self._pending_deployments)
 
     def pending_configs(self) -> Dict[Configuration, List[str]]:
         """Returns a copy of pending initializations dict."""
-        return dict(self._pending_configs)
+        with self._lock:
+            return dict(self._pending_configs)
 
     def complete_deploy(self, artifact: Artifact, result: ActionResult, description: str) -> None:
         """Completes the deploy process."""
-        self._completed_deployments[artifact] = result, description
-        del self._pending_deployments[artifact]
+        with self._lock:
+            self._record("complete_deploy", artifact=str(artifact), result=result.name, description=description)
+            self._completed_deployments[artifact] = result, description
+            del self._pending_deployments[artifact]
 
     def complete_config(self, config: Configuration, result: ActionResult) -> None:
         """Adds a pending config to the state."""
-        self._completed_configs[config] = result
-        if config in self._pending_configs:
-            del self._pending_configs[config]
+        with self._lock:
+            self._record("complete_config", result=result.name)
+            self._completed_configs[config] = result
+            if config in self._pending_configs:
+                del self._pending_configs[config]
 
     def completed_deployments(self) -> Dict[Artifact, Tuple[ActionResult, str]]:
         """Returns a copy of completed deployments dict."""
-        return dict(self._completed_deployments)
+        with self._lock:
+            return dict(self._completed_deployments)
 
     def completed_configs(self) -> Dict[Configuration, ActionResult]:
         """Returns a copy of completed configs dict."""
-        return dict(self._completed_configs)
+        with self._lock:
+            return dict(self._completed_configs)
 
     def get_completed_config_state(self, config: Configuration) -> ActionResult:
         """Returns completed config state."""
-        if config not in self._completed_configs:
-            return ActionResult.Unknown
+        with self._lock:
+            if config not in self._completed_configs:
+                return ActionResult.Unknown
 
-        return self._completed_configs[config]
+            return self._completed_configs[config]
 
     def add_pending_unload(self, txs: List[str]) -> None:
         """Adds status for unloaded artifact."""
-        self._pending_unloads = txs
+        with self._lock:
+            self._record("pending_unload", txs=txs)
+            self._pending_unloads = txs
 
     def pending_unloads(self) -> List[str]:
         """Returns pending unload statuses."""
-        return self._pending_unloads
+        with self._lock:
+            return list(self._pending_unloads)
+
+    @property
+    def unload_status(self) -> Tuple[ActionResult, str]:
+        """Status of the unload along with the description."""
+        with self._lock:
+            return self._unload_status
+
+    @unload_status.setter
+    def unload_status(self, status: Tuple[ActionResult, str]) -> None:
+        with self._lock:
+            self._record("complete_unload", result=status[0].name, description=status[1])
+            self._unload_status = status
 
     def add_pending_migration(self, service: Tuple[str, Artifact, int], txs: List[str]) -> None:
         """Adds a pending migration to the state"""
-        self._pending_migrations[service] = txs
+        with self._lock:
+            service_name, artifact, seed = service
+            self._record("pending_migration", service=service_name, artifact=str(artifact), seed=seed, txs=txs)
+            self._pending_migrations[service] = txs
 
     def pending_migrations(self) -> Dict[Tuple[str, Artifact, int], List[str]]:
-        """Returns pending migrations."""
-        return self._pending_migrations
+        """Returns a copy of pending migrations dict."""
+        with self._lock:
+            return dict(self._pending_migrations)
 
     def complete_migration(self, service_name: str, result: Tuple[ActionResult, str]) -> None:
         """Adds a status of the migration for the service."""
-        self._complete_migrations[service_name] = result
+        with self._lock:
+            self._record("complete_migration", service=service_name, result=result[0].name, description=result[1])
+            self._complete_migrations[service_name] = result
 
     def completed_migrations(self) -> Dict[str, Tuple[ActionResult, str]]:
-        """Returns completed migrations statuses."""
-        return self._complete_migrations
+        """Returns a copy of completed migrations statuses."""
+        with self._lock:
+            return dict(self._complete_migrations)
@@ -1,48 +1,61 @@
 """Main module of the Exonum Launcher."""
-import importlib
+import itertools
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from google.protobuf.message import Message
 from requests.exceptions import ConnectionError as RequestsConnectionError, HTTPError
 
 from exonum_client import ExonumClient
 
 from .action_result import ActionResult
-from .configuration import Artifact, Configuration
-from .explorer import Explorer, NotCommittedError, ExecutionFailError, TxStatus
+from .compiled_plan import PlanRecord, RecordKind, proposal_record
+from .concurrency import parallel_map
+from .configuration import Artifact, Configuration, Instance
+from .connection_pool import ConnectionPool, PooledExonumClient
+from .dispatcher import DispatcherState
+from .explorer import Explorer, NotCommittedError, ExecutionFailError, TxStatus, check_tx_statuses
 from .instances import DefaultInstanceSpecLoader, InstanceSpecLoader
+from .journal import Journal
 from .launch_state import LaunchState
-from .runtimes import RuntimeSpecLoader, RustSpecLoader
-from .supervisor import Supervisor
+from .plugins import artifact_plugins, runtime_plugins
+from .runtimes import RuntimeSpecLoader
+from .supervisor import Supervisor, SupervisorRequestError
 
 
 class Launcher:
     """Launcher class provides an interface to deploy and initialize
     services in Exonum blockchain."""
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(self, config: Configuration, journal: Optional[Journal] = None) -> None:
         self.config = config
 
+        # Keep-alive connections shared by all the clients.
+        self._pool = ConnectionPool.from_config(self.config.connection_pool)
         self.clients = self._load_clients()
 
-        self.launch_state = LaunchState()
+        # Changes of the launch state are recorded to the journal (if provided), so the launch can be resumed.
+        self.launch_state = LaunchState(journal)
 
-        # Load runtime plugins and add rust (as default).
-        self._runtime_plugins: Dict[str, RuntimeSpecLoader] = self._load_runtime_plugins()
-        self._runtime_plugins["rust"] = RustSpecLoader()
+        # Declare runtime and artifact plugins. Plugins are loaded on the first use.
+        self._runtime_plugins = runtime_plugins(self.config)
+        self._artifact_plugins = artifact_plugins(self.config)
 
-        # Load artifact plugins.
-        self._artifact_plugins: Dict[Artifact, InstanceSpecLoader] = self._load_artifact_plugins()
-
-        # Create supervisor and explorer.
-        self._supervisor = Supervisor(self.config.supervisor_mode, self.clients)
+        # Create explorer and supervisor sharing the same dispatcher state.
         self._explorer = Explorer(self.clients[0])
+        self._supervisor = Supervisor(self.config.supervisor_mode, self.clients, self._explorer)
+
+        # Parts of the split configuration proposal which are not sent yet.
+        self._pending_proposals: List[Message] = list()
+        self._sent_proposal: Optional[Message] = None
+        # Instances changed by the proposal sent by `start_all`.
+        self._proposed_instances: List[Instance] = list()
 
     def _load_clients(self) -> List[ExonumClient]:
         clients: List[ExonumClient] = []
 
         for network in self.config.networks:
-            client = ExonumClient(
-                network["host"], network["public-api-port"], network["private-api-port"], network["ssl"]
+            client = PooledExonumClient(
+                self._pool, network["host"], network["public-api-port"], network["private-api-port"], network["ssl"]
             )
             clients.append(client)
 
@@ -52,27 +65,6 @@ class Launcher:
 
         return clients
 
-    def _load_runtime_plugins(self) -> Dict[str, RuntimeSpecLoader]:
-        runtime_loaders: Dict[str, RuntimeSpecLoader] = dict()
-        for runtime_name, class_path in self.config.plugins["runtime"].items():
-            try:
-                runtime_loaders[runtime_name] = _import_class(class_path, RuntimeSpecLoader)
-            except (ValueError, ImportError, ModuleNotFoundError, AttributeError) as error:
-                raise RuntimeError(f"Could not load runtime parser {class_path}: {error}")
-
-        return runtime_loaders
-
-    def _load_artifact_plugins(self) -> Dict[Artifact, InstanceSpecLoader]:
-        instance_loaders: Dict[Artifact, InstanceSpecLoader] = dict()
-        for artifact_name, class_path in self.config.plugins["artifact"].items():
-            try:
-                artifact = self.config.artifacts[artifact_name]
-                instance_loaders[artifact] = _import_class(class_path, InstanceSpecLoader)
-            except (ValueError, KeyError, ImportError, ModuleNotFoundError, AttributeError) as error:
-                raise RuntimeError(f"Could not load runtime parser {class_path}: {error}")
-
-        return instance_loaders
-
     def __enter__(self) -> "Launcher":
         self.initialize()
 
@@ -90,72 +82,143 @@ class Launcher:
                 )
                 raise RuntimeError(f"Client from network {network} doesn't respond to API requests")
 
+        self._explorer.initialize()
         self._supervisor.initialize()
 
     def deinitialize(self) -> None:
-        """De-initializes the Launcher by de-initializing the Supervisor."""
+        """De-initializes the Launcher by de-initializing the Supervisor and closing the connections."""
         self._supervisor.deinitialize()
+        # Proto modules are unloaded with the Supervisor, so encoders built from them are not valid anymore.
+        DefaultInstanceSpecLoader.invalidate_cache()
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connections. Unlike `deinitialize`, can be called on the launcher which was not initialized."""
+        self._explorer.close()
+        self._pool.close()
 
     def add_runtime_spec_loader(self, runtime: str, spec_loader: RuntimeSpecLoader) -> None:
         """Adds a runtime-specific spec loader to encode runtime artifact spec into bytes."""
-        if runtime in self._runtime_plugins:
+        if self._runtime_plugins.is_declared(runtime):
             raise ValueError(f"Spec loader for runtime '{runtime}' is already added")
 
-        self._runtime_plugins[runtime] = spec_loader
+        self._runtime_plugins.add(runtime, spec_loader)
 
     def add_instance_spec_loader(self, artifact: Artifact, spec_loader: InstanceSpecLoader) -> None:
         """Adds an artifact-specific config spec loader to encode instance configs into bytes."""
-        if artifact in self._artifact_plugins:
+        if self._artifact_plugins.is_declared(artifact):
             raise ValueError(f"Instance spec loader for artifact '{artifact.name}' is already added")
 
-        self._artifact_plugins[artifact] = spec_loader
+        self._artifact_plugins.add(artifact, spec_loader)
 
-    def deploy_all(self) -> None:
-        """Deploys all the services from the provided config."""
-        for artifact in self.config.artifacts.values():
-            if artifact.action != "deploy":
-                continue
+    def _send_deploy_request(self, deploy_request: Message) -> Tuple[List[str], str]:
+        try:
+            return self._supervisor.send_deploy_request(deploy_request), ""
+        except SupervisorRequestError as error:
+            return list(), str(error)
+
+    def deploy_all(self, artifacts: Optional[List[Artifact]] = None) -> None:
+        """Deploys all the services from the provided config (or only the provided artifacts from the config).
+
+        Artifact specs are encoded first, and then all the deploy requests are sent concurrently."""
+        if artifacts is None:
+            artifacts = list(self.config.artifacts.values())
+        artifacts = [artifact for artifact in artifacts if artifact.action == "deploy"]
+
+        deploy_requests = [
+            self._supervisor.create_deploy_request(artifact, self._runtime_plugins[artifact.runtime])
+            for artifact in artifacts
+        ]
 
-            spec_loader = self._runtime_plugins[artifact.runtime]
-            deploy_request = self._supervisor.create_deploy_request(artifact, spec_loader)
-            txs = self._supervisor.send_deploy_request(deploy_request)
+        for artifact, (txs, error) in zip(artifacts, parallel_map(self._send_deploy_request, deploy_requests)):
             self.launch_state.add_pending_deploy(artifact, txs)
+            if error:
+                self.launch_state.complete_deploy(artifact, ActionResult.Fail, error)
+
+    def wait_for_deploy(self, artifacts: Optional[List[Artifact]] = None) -> None:
+        """Waits for all the deployments (or deployments of the provided artifacts) to be completed.
+
+        Transactions of all the deployments are awaited at once, and then all the successfully
+        deployed artifacts are awaited to appear in the dispatcher at once."""
+        pending_deployments = self.launch_state.pending_deployments()
+        if artifacts is not None:
+            pending_deployments = {
+                artifact: txs for artifact, txs in pending_deployments.items() if artifact in artifacts
+            }
+        statuses = self._explorer.wait_for_tx_statuses(
+            [tx_hash for tx_hashes in pending_deployments.values() for tx_hash in tx_hashes]
+        )
 
-    def wait_for_deploy(self) -> None:
-        """Waits for all the deployments to be completed."""
         descriptions: Dict[Artifact, str] = dict()
         check_for_deploy: List[Artifact] = list()
-        for artifact, tx_hashes in self.launch_state.pending_deployments().items():
+        for artifact, tx_hashes in pending_deployments.items():
             try:
-                self._explorer.wait_for_txs(tx_hashes)
+                check_tx_statuses(tx_hashes, statuses)
                 descriptions[artifact] = "deployed successfully"
                 check_for_deploy.append(artifact)  # Should be checked for deploy status since no exception occurs.
             except ExecutionFailError as error:
                 descriptions[artifact] = str(error)
             except NotCommittedError as error:
                 descriptions[artifact] = str(error)
-        for artifact in self.launch_state.pending_deployments():
-            result = self._explorer.wait_for_deploy(artifact) if artifact in check_for_deploy else ActionResult.Fail
+
+        results = self._explorer.wait_for_deploys(check_for_deploy)
+        for artifact in pending_deployments:
+            result = results.get(artifact, ActionResult.Fail)
             self.launch_state.complete_deploy(artifact, result, descriptions[artifact])
 
+    def _config_loaders(self, instances: List[Instance]) -> List[InstanceSpecLoader]:
+        """Returns the config spec loaders for the instances (in the same order)."""
+        default_loader = DefaultInstanceSpecLoader()
+        return [self._artifact_plugins.get(instance.artifact, default_loader) for instance in instances]
+
     def start_all(self, skipped_artifacts: List[Artifact] = None) -> None:
-        """Starts all the service instances from the provided config."""
+        """Starts all the service instances from the provided config (except the instances of the skipped artifacts)."""
         skipped_artifacts = skipped_artifacts or []
-        config_loaders = [
-            self._artifact_plugins.get(instance.artifact, DefaultInstanceSpecLoader())
-            for instance in self.config.instances
-            if instance.artifact not in skipped_artifacts
-        ]
+        instances = [instance for instance in self.config.instances if instance.artifact not in skipped_artifacts]
 
-        if not config_loaders:
+        if not instances:
             return
 
         config_proposal = self._supervisor.create_config_change_request(
-            self.config.consensus, self.config.instances, config_loaders, self.config.actual_from
+            self.config.consensus, instances, self._config_loaders(instances), self.config.actual_from
         )
+        self._proposed_instances = instances
+
+        # Proposal which exceeds the message size limit is sent in parts, one after another.
+        self._pending_proposals = self._supervisor.split_config_proposal(config_proposal, self.config.max_proposal_size)
+        self._send_next_proposal()
 
+    def _send_next_proposal(self) -> None:
+        config_proposal = self._pending_proposals.pop(0)
         txs = self._supervisor.send_propose_config_request(config_proposal)
         self.launch_state.add_pending_config(self.config, txs)
+        self._sent_proposal = config_proposal
+
+    def _wait_for_proposals(self) -> None:
+        """Waits for the sent proposal to be committed, sending the rest of the split proposal parts."""
+        while True:
+            tx_hashes = self.launch_state.pending_configs()[self.config]
+            try:
+                self._explorer.wait_for_txs(tx_hashes)
+            except (ExecutionFailError, NotCommittedError):
+                self._supervisor.complete_proposal(False)
+                raise
+            self._supervisor.complete_proposal(True)
+
+            if not self._pending_proposals:
+                return
+
+            # The next part can only be proposed once the previous one is applied.
+            self._wait_for_applied_proposal()
+            self._send_next_proposal()
+
+    def _wait_for_applied_proposal(self) -> None:
+        """Waits until the last sent proposal is applied, so the next one can be sent."""
+        assert self._sent_proposal is not None
+        configuration_number = self._sent_proposal.configuration_number + 1
+        if not self._supervisor.wait_for_configuration(configuration_number):
+            self._pending_proposals = list()
+            raise NotCommittedError(f"Configuration proposal {configuration_number - 1} was not applied")
 
     def wait_for_start(self) -> None:
         """Waits for all the initializations to be completed."""
@@ -163,12 +226,13 @@ class Launcher:
         if not self.launch_state.pending_configs():
             return
 
-        tx_hashes = self.launch_state.pending_configs()[self.config]
-
-        self._explorer.wait_for_txs(tx_hashes)
+        self._wait_for_proposals()
+        self._wait_for_instances(self._proposed_instances)
 
+    def _wait_for_instances(self, instances: List[Instance]) -> None:
+        """Waits for the instances to be started once the proposals are committed."""
         result = ActionResult.Success
-        for instance in self.config.instances:
+        for instance in instances:
             if instance.action != "start":
                 continue
 
@@ -179,6 +243,85 @@ class Launcher:
 
         self.launch_state.complete_config(self.config, result)
 
+    def _deploy_result(self, artifact: Artifact, dispatcher_state: DispatcherState) -> ActionResult:
+        """Returns the result of the artifact deploy, or `ActionResult.Unknown` if it's still in progress."""
+        if artifact.action != "deploy" or dispatcher_state.is_deployed(artifact):
+            return ActionResult.Success
+
+        completed = self.launch_state.completed_deployments().get(artifact)
+        return completed[0] if completed is not None else ActionResult.Unknown
+
+    def _split_ready_instances(
+        self, instances: List[Instance], unsent_blocks: Dict[Artifact, int]
+    ) -> Tuple[List[Instance], List[Instance]]:
+        """Returns instances with deployed artifacts and instances with artifacts which are still being deployed.
+        Instances with the failed artifacts are dropped."""
+        dispatcher_state = self._explorer.dispatcher_state()
+        pending_deployments = self.launch_state.pending_deployments()
+
+        ready: List[Instance] = list()
+        waiting: List[Instance] = list()
+        for instance in instances:
+            deploy_result = self._deploy_result(instance.artifact, dispatcher_state)
+            if deploy_result == ActionResult.Unknown and instance.artifact not in pending_deployments:
+                unsent_blocks[instance.artifact] = unsent_blocks.get(instance.artifact, 0) + 1
+                if unsent_blocks[instance.artifact] > self._explorer.RECONNECT_RETRIES:
+                    deploy_result = ActionResult.Fail
+
+            if deploy_result == ActionResult.Success:
+                ready.append(instance)
+            elif deploy_result == ActionResult.Unknown:
+                waiting.append(instance)
+
+        return ready, waiting
+
+    def stream_start(self) -> None:
+        """Starts the service instances from the provided config as soon as their artifacts are deployed.
+
+        This method is intended to be run concurrently with the deploy. Artifacts are checked once per
+        block, and the instances of all the artifacts deployed by that time are started by one proposal.
+        Proposals are sent one at a time, each one after the previous one is applied. Instances
+        of the artifacts which failed to deploy (or were not sent for deploy) are skipped."""
+        pending = list(self.config.instances)
+        consensus = self.config.consensus
+        actual_from = self.config.actual_from
+        result = ActionResult.Success
+        # Amount of blocks observed while the deploy of the artifact was not sent.
+        unsent_blocks: Dict[Artifact, int] = dict()
+
+        blocks = self._explorer.blocks()
+        blocks.start()
+        seen = blocks.latest()
+        while True:
+            ready, pending = self._split_ready_instances(pending, unsent_blocks)
+
+            if ready or consensus is not None:
+                if self._sent_proposal is not None:
+                    self._wait_for_applied_proposal()
+
+                config_proposal = self._supervisor.create_config_change_request(
+                    consensus, ready, self._config_loaders(ready), actual_from
+                )
+                # Only the first proposal is bound to the `actual_from` height.
+                consensus, actual_from = None, 0
+
+                self._pending_proposals = self._supervisor.split_config_proposal(
+                    config_proposal, self.config.max_proposal_size
+                )
+                self._send_next_proposal()
+                self._wait_for_proposals()
+
+                for instance in ready:
+                    if instance.action == "start" and self._explorer.wait_for_start(instance) == ActionResult.Fail:
+                        result = ActionResult.Fail
+
+            if not pending:
+                break
+
+            seen = blocks.wait_for_block(seen, self._explorer.BLOCK_TIMEOUT)
+
+        self.launch_state.complete_config(self.config, result)
+
     def unload_all(self) -> None:
         """Unload all artifacts marked as unloaded."""
         unload_request = self._supervisor.create_unload_request(
@@ -205,49 +348,204 @@ class Launcher:
             self.launch_state.unload_status = ActionResult.Success, description
         else:
             self.launch_state.unload_status = ActionResult.Fail, description
+        self._supervisor.complete_proposal(tx_status == TxStatus.Success)
 
-    def migrate_all(self) -> None:
-        """Migrates all services from the provided config."""
+    def migrate_all(self, services: Optional[List[str]] = None) -> None:
+        """Migrates all services from the provided config (or only the provided services from the config)."""
         for service_name, artifact in self.config.migrations.items():
+            if services is not None and service_name not in services:
+                continue
+
             migration_request, seed = self._supervisor.create_migration_request(service_name, artifact)
             txs = self._supervisor.send_migration_request(migration_request)
             self.launch_state.add_pending_migration((service_name, artifact, seed), txs)
 
-    def wait_for_migration(self) -> None:
-        """Waits for all migrations to be completed."""
-        pending_migrations = self.launch_state.pending_migrations()
-        for tx_hashes in pending_migrations.values():
-            self._explorer.wait_for_txs(tx_hashes)
+    def _try_get_migration_state(self, migration: Tuple[str, Artifact, int]) -> Optional[Any]:
+        """Returns the migration state or None if the Exonum API is unavailable."""
+        service_name, artifact, seed = migration
+        try:
+            return self._supervisor.get_migration_state(service_name, artifact, seed)
+        except (RequestsConnectionError, ConnectionRefusedError, HTTPError):
+            return None
+
+    def wait_for_migration(self, services: Optional[List[str]] = None) -> None:
+        """Waits for all migrations (or migrations of the provided services) to be completed.
+
+        Transactions of all the migrations are awaited at once. Then the states of all the unfinished
+        migrations are requested concurrently on every new block, for up to `RECONNECT_RETRIES` blocks."""
+        pending_migrations = {
+            migration: txs
+            for migration, txs in self.launch_state.pending_migrations().items()
+            if services is None or migration[0] in services
+        }
+        statuses = self._explorer.wait_for_tx_statuses(
+            [tx_hash for tx_hashes in pending_migrations.values() for tx_hash in tx_hashes]
+        )
 
-        for (service_name, artifact, seed), _ in pending_migrations.items():
-            result = ActionResult.Fail
-            description = ""
-            for _ in range(0, self._explorer.RECONNECT_RETRIES):
-                try:
-                    state = self._supervisor.get_migration_state(service_name, artifact, seed)
-                    if "state" in state:
-                        if state["state"] == "succeed":
-                            result = ActionResult.Success
-                            description = "Success"
-                            break
-                        if "failed" in state["state"]:
-                            description = state["state"]["failed"]["error"]["description"]
-                    time.sleep(self._explorer.RECONNECT_INTERVAL)
-                except (RequestsConnectionError, ConnectionRefusedError, HTTPError):
-                    time.sleep(self._explorer.RECONNECT_INTERVAL)
-            self.launch_state.complete_migration(service_name, (result, description))
+        results: Dict[Tuple[str, Artifact, int], Tuple[ActionResult, str]] = dict()
+        pending: List[Tuple[str, Artifact, int]] = list()
+        for migration, tx_hashes in pending_migrations.items():
+            try:
+                check_tx_statuses(tx_hashes, statuses)
+                # Migrations which are not finished in time are considered failed.
+                results[migration] = ActionResult.Fail, ""
+                pending.append(migration)
+            except (ExecutionFailError, NotCommittedError) as error:
+                results[migration] = ActionResult.Fail, str(error)
+
+        seen = self._explorer.blocks().latest()
+        for _ in range(self._explorer.RECONNECT_RETRIES):
+            api_available = True
+            unfinished: List[Tuple[str, Artifact, int]] = list()
+            for migration, state in zip(pending, parallel_map(self._try_get_migration_state, pending)):
+                if state is None:
+                    api_available = False
+                    unfinished.append(migration)
+                elif state.get("state") == "succeed":
+                    results[migration] = ActionResult.Success, "Success"
+                elif "failed" in state.get("state", ""):
+                    results[migration] = ActionResult.Fail, state["state"]["failed"]["error"]["description"]
+                else:
+                    unfinished.append(migration)
+
+            pending = unfinished
+            if not pending:
+                break
 
-    def explorer(self) -> Explorer:
-        """Returns used explorer"""
-        return self._explorer
+            if api_available:
+                seen = self._explorer.blocks().wait_for_block(seen, self._explorer.BLOCK_TIMEOUT)
+            else:
+                # Exonum API server may be rebooting. Wait for it.
+                time.sleep(self._explorer.RECONNECT_INTERVAL)
+
+        for (service_name, _, _), result in results.items():
+            self.launch_state.complete_migration(service_name, result)
+
+    def recover(self) -> None:
+        """Waits for the operations which were sent before the launch was interrupted to be completed.
+
+        Launch state should be restored from the journal before calling this method."""
+        if self.launch_state.pending_unloads() and self.launch_state.unload_status[0] == ActionResult.Unknown:
+            self.wait_for_unload()
+
+        if self.launch_state.pending_deployments():
+            self.wait_for_deploy()
 
+        if self.launch_state.pending_migrations():
+            self.wait_for_migration()
 
-def _import_class(class_path: str, res_type: Any) -> Any:
-    module_name, class_name = class_path.rsplit(".", 1)
-    module = importlib.import_module(module_name)
-    spec_loader = getattr(module, class_name)
+        pending_configs = self.launch_state.pending_configs()
+        if self.config in pending_configs:
+            tx_hashes = pending_configs[self.config]
+            statuses = self._explorer.wait_for_tx_statuses(tx_hashes)
+            committed = all(statuses[tx_hash][0] == TxStatus.Success for tx_hash in tx_hashes)
+            self.launch_state.complete_config(self.config, ActionResult.Success if committed else ActionResult.Fail)
 
-    if not issubclass(spec_loader, res_type):
-        raise ValueError(f"Class {spec_loader} is not a subclass of {res_type}")
+    def compile(self) -> List[PlanRecord]:
+        """Encodes the requests of the launch without sending them.
 
-    return spec_loader()
+        Records are ordered the same way the launch stages are run: deploys, migrations,
+        and then the unload and start proposals (see `main.build_schedule`)."""
+        records: List[PlanRecord] = list()
+        for artifact in self.config.artifacts.values():
+            if artifact.action == "deploy":
+                deploy_request = self._supervisor.create_deploy_request(
+                    artifact, self._runtime_plugins[artifact.runtime]
+                )
+                records.append(
+                    PlanRecord(RecordKind.Deploy, {"artifact": str(artifact)}, deploy_request.SerializeToString())
+                )
+
+        for service_name, artifact in self.config.migrations.items():
+            migration_request, seed = self._supervisor.create_migration_request(service_name, artifact)
+            meta = {"service": service_name, "artifact": str(artifact), "seed": seed}
+            records.append(PlanRecord(RecordKind.Migration, meta, migration_request.SerializeToString()))
+
+        proposals: List[PlanRecord] = list()
+        if self.config.instances or self.config.consensus is not None:
+            instances = list(self.config.instances)
+            config_proposal = self._supervisor.create_config_change_request(
+                self.config.consensus, instances, self._config_loaders(instances), self.config.actual_from
+            )
+            for part in self._supervisor.split_config_proposal(config_proposal, self.config.max_proposal_size):
+                proposals.append(proposal_record(RecordKind.Config, part))
+
+        unload_request = self._supervisor.create_unload_request(
+            list(self.config.artifacts.values()), self.config.actual_from
+        )
+        if unload_request:
+            unloaded = [artifact for artifact in self.config.artifacts.values() if artifact.action == "unload"]
+            unload_record = proposal_record(RecordKind.Unload, unload_request)
+            # Instances of the unloaded artifacts should be stopped before the unload.
+            if any(instance.artifact in unloaded for instance in self.config.instances.by_action("stop")):
+                proposals.append(unload_record)
+            else:
+                proposals.insert(0, unload_record)
+
+        return records + proposals
+
+    def apply_compiled(self, records: List[PlanRecord]) -> None:
+        """Sends the requests of the compiled plan (see `compile`) in the order of the records.
+
+        Consecutive deploy and migration requests are sent at once, proposals are sent one at a time,
+        each one after the previous one is applied. Results are tracked in the launch state, so the
+        artifacts from the records are matched with the artifacts from the config by their IDs."""
+        artifacts = {str(artifact): artifact for artifact in self.config.artifacts.values()}
+        artifacts.update({str(artifact): artifact for artifact in self.config.migrations.values()})
+
+        for record in records:
+            if "artifact" in record.meta and record.meta["artifact"] not in artifacts:
+                raise ValueError(f"Artifact {record.meta['artifact']} from the compiled plan is not in the config")
+
+        configuration_number: Optional[int] = None
+        for kind, group in itertools.groupby(records, key=lambda record: record.kind):
+            kind_records = list(group)
+            if kind == RecordKind.Deploy:
+                responses = parallel_map(self._send_compiled_deploy, kind_records)
+                for record, (txs, error) in zip(kind_records, responses):
+                    artifact = artifacts[record.meta["artifact"]]
+                    self.launch_state.add_pending_deploy(artifact, txs)
+                    if error:
+                        self.launch_state.complete_deploy(artifact, ActionResult.Fail, error)
+                self.wait_for_deploy()
+            elif kind == RecordKind.Migration:
+                for record in kind_records:
+                    txs = self._supervisor.send_compiled_request("migrate", record.payload)
+                    migration = (record.meta["service"], artifacts[record.meta["artifact"]], record.meta["seed"])
+                    self.launch_state.add_pending_migration(migration, txs)
+                self.wait_for_migration()
+            else:
+                for record in kind_records:
+                    configuration_number = self._send_compiled_proposal(record, configuration_number)
+
+        if self.launch_state.pending_configs():
+            self._wait_for_instances(list(self.config.instances))
+
+    def _send_compiled_deploy(self, record: PlanRecord) -> Tuple[List[str], str]:
+        try:
+            return self._supervisor.send_compiled_request("deploy-artifact", record.payload), ""
+        except SupervisorRequestError as error:
+            return list(), str(error)
+
+    def _send_compiled_proposal(self, record: PlanRecord, previous_number: Optional[int]) -> int:
+        """Sends the compiled proposal once the previous one is applied and waits for its transactions.
+
+        Returns the configuration number of the sent proposal."""
+        if previous_number is not None and not self._supervisor.wait_for_configuration(previous_number + 1):
+            raise NotCommittedError(f"Configuration proposal {previous_number} was not applied")
+
+        txs, configuration_number = self._supervisor.send_compiled_config_proposal(
+            record.payload, record.meta["number_field"]
+        )
+        if record.kind == RecordKind.Unload:
+            self.launch_state.add_pending_unload(txs)
+            self.wait_for_unload()
+        else:
+            self.launch_state.add_pending_config(self.config, txs)
+            self._wait_for_proposals()
+
+        return configuration_number
+
+    def explorer(self) -> Explorer:
+        """Returns used explorer"""
+        return self._explorer
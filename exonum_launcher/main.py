@@ -1,10 +1,20 @@
 """Main module of the Exonum Launcher."""
+import functools
 import sys
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from .action_result import ActionResult
-from .configuration import Configuration
-from .launcher import Launcher
+from .compiled_plan import read_plan, write_plan
+from .config_cache import ConfigCache
+from .configuration import Artifact, Configuration, Instance
+from .fleet import format_fleet_results, load_fleet, run_fleet
+from .journal import Journal
+from .planner import LaunchPlan
+from .scheduler import Scheduler
+
+if TYPE_CHECKING:
+    from .launcher import Launcher  # pylint: disable=unused-import
 
 
 def load_config(path: str) -> Configuration:
@@ -12,35 +22,197 @@ def load_config(path: str) -> Configuration:
     return Configuration.from_yaml(path)
 
 
-def run_launcher(config: Configuration) -> Dict[str, Any]:
+def run_launcher(
+    config: Configuration,
+    stream_start: bool = False,
+    plan_only: bool = False,
+    journal_path: Optional[str] = None,
+    resume: bool = False,
+) -> Dict[str, Any]:
     """Runs the launcher.
 
+    If `journal_path` is provided, the launch progress is recorded to the journal. If `resume` is set,
+    the launch interrupted earlier is resumed: the operations recorded in the journal are awaited
+    instead of being sent again.
+
+    Then the launch plan is computed from the current dispatcher state and printed, so the operations
+    which are already applied are skipped (see `LaunchPlan`). If `plan_only` is set, nothing is applied.
+
+    Independent operations (e.g. deploys of different artifacts) are run concurrently,
+    see `build_schedule` for the dependencies between them. If `stream_start` is set,
+    instances are started as soon as their artifacts are deployed.
+
     Returns a dictionary with two entries:
 
     "artifacts" - contains a mapping `Artifact` => `bool denoting if artifact is deployed`
     "instances" - contains a mapping `Instance` => `Optional[InstanceId]`.
     """
-    with Launcher(config) as launcher:
+    journal = Journal(journal_path, truncate=not resume) if journal_path is not None else None
+    records = Journal.read(journal_path) if journal_path is not None and resume else list()
+
+    try:
+        return _run_launcher(config, stream_start, plan_only, journal, records)
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def _create_launcher(config: Configuration, journal: Optional[Journal] = None) -> "Launcher":
+    """Creates the launcher. It's imported on demand, since the Exonum client, protobuf and requests
+    take most of the startup time and aren't needed until the launch actually starts."""
+    from .launcher import Launcher  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    return Launcher(config, journal)
+
+
+def _run_launcher(
+    config: Configuration,
+    stream_start: bool,
+    plan_only: bool,
+    journal: Optional[Journal],
+    records: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    with _create_launcher(config, journal) as launcher:
         results: Dict[str, Any] = {"artifacts": dict(), "instances": dict()}
-        # Unload stage
-        _unload(launcher)
 
-        # Deploy stage
-        _deploy(launcher, results)
+        if records:
+            launcher.launch_state.restore(records, config)
+            launcher.recover()
+
+        plan = LaunchPlan(config, launcher.explorer().dispatcher_state())
+        print(plan)
+        if plan_only:
+            return results
 
-        # Migration stage
-        _migration(launcher)
+        # Operations which are already applied are reported as successful.
+        for artifact in plan.deployed:
+            results["artifacts"][artifact] = "success"
+        for instance, instance_id in plan.started.items():
+            results["instances"][instance] = instance_id
 
-        # Start stage
-        _start(launcher, results)
+        if not plan.is_empty():
+            # The launcher applies only the planned operations, while the provided config is left intact.
+            launcher.config = plan.apply_to(config)
+            build_schedule(launcher, results, stream_start).run()
 
         return results
 
 
-def _unload(launcher: Launcher) -> None:
+def compile_launch(config: Configuration, path: str) -> None:
+    """Encodes the requests of the launch and writes them to the compiled plan file.
+
+    Spec loaders are run (and proto files are loaded from the node) at this step only,
+    so the plan can be applied later by `apply_launch` without them."""
+    with _create_launcher(config) as launcher:
+        records = launcher.compile()
+
+    write_plan(path, records)
+    print(f"Compiled {len(records)} request(s) to {path}")
+
+
+def apply_launch(config: Configuration, path: str) -> Dict[str, Any]:
+    """Sends the requests from the compiled plan file and waits for them to be applied.
+
+    Returns a dictionary with the results, the same as `run_launcher` does."""
+    records = read_plan(path)
+    results: Dict[str, Any] = {"artifacts": dict(), "instances": dict()}
+
+    launcher = _create_launcher(config)
+    try:
+        launcher.apply_compiled(records)
+
+        launch_state = launcher.launch_state
+        results["artifacts"].update(_report_deploy(launcher, list(launch_state.completed_deployments())))
+        _report_migration(launcher, list(launch_state.completed_migrations()))
+        if launch_state.pending_unloads():
+            _report_unload(launcher)
+        if launch_state.completed_configs():
+            results["instances"].update(_report_start(launcher))
+    finally:
+        launcher.close()
+
+    return results
+
+
+def build_schedule(launcher: "Launcher", results: Dict[str, Any], stream_start: bool = False) -> Scheduler:
+    """Builds the launch tasks with the dependencies derived from the configuration:
+
+    - every artifact is deployed by a separate task;
+    - migration of a service waits for the deploy of its target artifact;
+    - start stage (which also stops, configures, freezes and resumes instances) waits for the deploys
+      of the instance artifacts and for the migrations of the instances;
+    - unload waits for the migrations, since they can move services away from the unloaded artifacts.
+      If instances of an unloaded artifact are stopped, unload also waits for the start stage.
+
+    Unload and start stages both send configuration proposals, and the supervisor accepts only one
+    proposal at a time, so these stages are never run concurrently.
+
+    In the streaming mode the start stage doesn't wait for the deploys, but starts the instances
+    of every artifact as soon as it's deployed (see `Launcher.stream_start`).
+
+    Tasks are run in different threads, so `results` are updated under the lock."""
+    config = launcher.config
+    scheduler = Scheduler()
+    results_lock = threading.Lock()
+
+    deploy_tasks = _deploy_tasks(config)
+    for artifact in config.artifacts.values():
+        if str(artifact) in deploy_tasks:
+            scheduler.add_task(
+                deploy_tasks[str(artifact)], functools.partial(_deploy, launcher, results, results_lock, [artifact])
+            )
+
+    migration_tasks: Dict[str, str] = dict()
+    for service, artifact in config.migrations.items():
+        migration_tasks[service] = f"migrate {service}"
+        depends_on = [deploy_tasks[str(artifact)]] if str(artifact) in deploy_tasks else []
+        scheduler.add_task(migration_tasks[service], functools.partial(_migration, launcher, [service]), depends_on)
+
+    start = functools.partial(_stream_start if stream_start else _start, launcher, results, results_lock)
+    start_depends_on = _start_dependencies(config, dict() if stream_start else deploy_tasks, migration_tasks)
+
+    unloaded = [str(artifact) for artifact in config.artifacts.values() if artifact.action == "unload"]
+    if not unloaded:
+        scheduler.add_task("start", start, start_depends_on)
+        return scheduler
+
+    unload_depends_on = list(migration_tasks.values())
+    if any(str(instance.artifact) in unloaded for instance in config.instances.by_action("stop")):
+        scheduler.add_task("start", start, start_depends_on)
+        scheduler.add_task("unload", functools.partial(_unload, launcher), unload_depends_on + ["start"])
+    else:
+        scheduler.add_task("unload", functools.partial(_unload, launcher), unload_depends_on)
+        scheduler.add_task("start", start, start_depends_on + ["unload"])
+
+    return scheduler
+
+
+def _deploy_tasks(config: Configuration) -> Dict[str, str]:
+    """Returns the names of the deploy tasks by the deployed artifacts."""
+    artifacts = config.artifacts.values()
+    return {str(artifact): f"deploy {artifact}" for artifact in artifacts if artifact.action == "deploy"}
+
+
+def _start_dependencies(
+    config: Configuration, deploy_tasks: Dict[str, str], migration_tasks: Dict[str, str]
+) -> List[str]:
+    start_depends_on: List[str] = list()
+    for instance in config.instances:
+        for task in (deploy_tasks.get(str(instance.artifact)), migration_tasks.get(instance.name)):
+            if task is not None and task not in start_depends_on:
+                start_depends_on.append(task)
+
+    return start_depends_on
+
+
+def _unload(launcher: "Launcher") -> None:
     launcher.unload_all()
     launcher.wait_for_unload()
 
+    _report_unload(launcher)
+
+
+def _report_unload(launcher: "Launcher") -> None:
     unload_status, error_message = launcher.launch_state.unload_status
     if unload_status == ActionResult.Success:
         for artifact in launcher.config.artifacts.values():
@@ -52,44 +224,82 @@ def _unload(launcher: Launcher) -> None:
         print(f"Artifacts unload status: {unload_status}, with error: {error_message}")
 
 
-def _deploy(launcher: Launcher, results: Dict[str, Any]) -> None:
-    launcher.deploy_all()
-    launcher.wait_for_deploy()
+def _deploy(
+    launcher: "Launcher", results: Dict[str, Any], results_lock: threading.Lock, artifacts: List[Artifact]
+) -> None:
+    launcher.deploy_all(artifacts)
+    launcher.wait_for_deploy(artifacts)
 
-    for artifact, (result, description) in launcher.launch_state.completed_deployments().items():
+    statuses = _report_deploy(launcher, artifacts)
+    with results_lock:
+        results["artifacts"].update(statuses)
+
+
+def _report_deploy(launcher: "Launcher", artifacts: List[Artifact]) -> Dict[Artifact, str]:
+    """Prints the deploy statuses of the artifacts and returns them."""
+    statuses: Dict[Artifact, str] = dict()
+    completed_deployments = launcher.launch_state.completed_deployments()
+    for artifact in artifacts:
+        result, description = completed_deployments[artifact]
         deployed = launcher.explorer().is_deployed(artifact) and result == ActionResult.Success
-        status_description = "success" if deployed else description
-        results["artifacts"][artifact] = status_description
-        print(f"Artifact {artifact} -> deploy status: {status_description}")
+        statuses[artifact] = "success" if deployed else description
+        print(f"Artifact {artifact} -> deploy status: {statuses[artifact]}")
+
+    return statuses
+
 
+def _migration(launcher: "Launcher", services: List[str]) -> None:
+    launcher.migrate_all(services)
+    launcher.wait_for_migration(services)
 
-def _migration(launcher: Launcher) -> None:
-    launcher.migrate_all()
-    launcher.wait_for_migration()
+    _report_migration(launcher, services)
 
-    for service, (status, description) in launcher.launch_state.completed_migrations().items():
+
+def _report_migration(launcher: "Launcher", services: List[str]) -> None:
+    completed_migrations = launcher.launch_state.completed_migrations()
+    for service in services:
+        status, description = completed_migrations[service]
         if status:
             print(f"The service {service} -> migrate status: {status}")
         else:
             print(f"The service {service} -> migrate status: {status}, with error: {description}")
 
 
-def _start(launcher: Launcher, results: Dict[str, Any]) -> None:
+def _start(launcher: "Launcher", results: Dict[str, Any], results_lock: threading.Lock) -> None:
     # Artifacts with erroneous deploy status
-    skipped_artifacts = [artifact for artifact, description in results["artifacts"].items() if description != "success"]
+    with results_lock:
+        skipped_artifacts = [
+            artifact for artifact, description in results["artifacts"].items() if description != "success"
+        ]
     launcher.start_all(skipped_artifacts)
     launcher.wait_for_start()
 
+    instance_ids = _report_start(launcher)
+    with results_lock:
+        results["instances"].update(instance_ids)
+
+
+def _stream_start(launcher: "Launcher", results: Dict[str, Any], results_lock: threading.Lock) -> None:
+    launcher.stream_start()
+
+    instance_ids = _report_start(launcher)
+    with results_lock:
+        results["instances"].update(instance_ids)
+
+
+def _report_start(launcher: "Launcher") -> Dict[Instance, Optional[int]]:
+    """Prints the statuses of the instances and returns the IDs of the started ones."""
+    instance_ids: Dict[Instance, Optional[int]] = dict()
     config_state = launcher.launch_state.get_completed_config_state(launcher.config)
 
     if config_state == ActionResult.Fail:
         print("Applying of config -> FAIL")
-        return
+        return instance_ids
 
     for instance in launcher.config.instances:
         if instance.action == "start":
             instance_id = launcher.explorer().get_instance_id(instance)
-            results["instances"][instance] = instance_id
+            instance_ids[instance] = instance_id
             id_str = "started with ID {}".format(instance_id) if instance_id else "start failed"
             print(f"Instance {instance.name} -> start status: {id_str}")
         elif instance.action == "stop":
@@ -101,42 +311,102 @@ def _start(launcher: Launcher, results: Dict[str, Any]) -> None:
         elif instance.action == "config":
             print(f"Instance {instance.name} -> config '{instance.config}' applied")
 
+    return instance_ids
+
+
+def _parse_runtimes(runtimes: List[str]) -> Dict[str, int]:
+    """Returns the default runtimes along with the runtimes from the command line."""
+    declared: Dict[str, int] = dict()
+    for runtime in runtimes:
+        try:
+            name, runtime_id = runtime.split("=")
+            declared[name] = int(runtime_id)
+        except ValueError:
+            raise ValueError("Runtimes must be provided in format `runtime_name=runtime_id`")
+
+    return Configuration.with_runtimes(declared)
+
+
+def _add_spec_loaders(config: Configuration, args: Any) -> None:
+    """Adds custom spec loaders from the command line to the config."""
+    for parser in args.runtime_parsers or list():
+        try:
+            runtime_name, class_path = parser.split("=")
+            config.plugins["runtime"][runtime_name] = class_path
+        except ValueError as error:
+            raise ValueError(f"Could not load runtime parser {parser}: {error}")
+
+    for parser in args.instance_parsers or list():
+        try:
+            artifact_name, class_path = parser.split("=")
+
+            config.plugins["runtime"][artifact_name] = class_path
+        except ValueError as error:
+            raise ValueError(f"Could not load runtime parser {parser}: {error}")
+
+
+def launch_config(data: Dict[Any, Any], args: Any) -> Dict[str, Any]:
+    """Runs the launcher for the config data with the command line arguments applied."""
+    config = Configuration(data, _parse_runtimes(args.runtimes or list()))
+    _add_spec_loaders(config, args)
+
+    return run_launcher(config, stream_start=args.stream_start, plan_only=args.plan)
+
 
 def main(args: Any) -> None:
-    """Runs the launcher to deploy and init all the instances from the config."""
+    """Runs the launcher to deploy and init all the instances from the config.
 
+    If several configs (or a config with several network groups) are provided, launches
+    on all the networks are run concurrently."""
     # Declare runtimes
-    if args.runtimes:
-        for runtime in args.runtimes:
-            try:
-                name, runtime_id = runtime.split("=")
-                Configuration.declare_runtime(name, int(runtime_id))
-            except ValueError:
-                print("Runtimes must be provided in format `runtime_name=runtime_id`")
-                sys.exit(1)
+    try:
+        runtimes = _parse_runtimes(args.runtimes or list())
+    except ValueError as error:
+        print(error)
+        sys.exit(1)
 
     # Load config
-    config = load_config(args.input)
+    paths = [args.input] if isinstance(args.input, str) else args.input
+    config = ConfigCache().load(paths[0], runtimes) if args.config_cache and len(paths) == 1 else None
+    if config is None:
+        launches = load_fleet(paths)
+        if len(launches) > 1:
+            _run_fleet(launches, args)
+            return
+
+        config = Configuration(launches[0][1], runtimes)
 
     # Add custom spec loaders to the config.
-    if args.runtime_parsers:
-        for parser in args.runtime_parsers:
-            try:
-                runtime_name, class_path = parser.split("=")
-                config.plugins["runtime"][runtime_name] = class_path
-            except ValueError as error:
-                print(f"Could not load runtime parser {parser}: {error}")
-                sys.exit(1)
-
-    if args.instance_parsers:
-        for parser in args.instance_parsers:
-            try:
-                artifact_name, class_path = parser.split("=")
-
-                config.plugins["runtime"][artifact_name] = class_path
-            except ValueError as error:
-                print(f"Could not load runtime parser {parser}: {error}")
-                sys.exit(1)
+    try:
+        _add_spec_loaders(config, args)
+    except ValueError as error:
+        print(error)
+        sys.exit(1)
+
+    if args.compile is not None:
+        compile_launch(config, args.compile)
+        return
+
+    if args.apply is not None:
+        apply_launch(config, args.apply)
+        return
 
     # Run the launcher
-    run_launcher(config)
+    run_launcher(
+        config, stream_start=args.stream_start, plan_only=args.plan, journal_path=args.journal, resume=args.resume
+    )
+
+
+def _run_fleet(launches: List[Tuple[str, Dict[Any, Any]]], args: Any) -> None:
+    if args.journal is not None or args.compile is not None or args.apply is not None:
+        print("Journal and compiled plans can't be used with several launches")
+        sys.exit(1)
+
+    results = run_fleet(launches, launch_config, args, args.workers)
+    for result in results:
+        for line in result.output.splitlines():
+            print(f"[{result.name}] {line}")
+    print(format_fleet_results(results))
+
+    if any(result.error for result in results):
+        sys.exit(1)
@@ -0,0 +1,132 @@
+"""Module computing the changes required to bring the blockchain to the state described by the configuration."""
+import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+from .configuration import Artifact, Configuration, Instance, InstanceCollection
+from .dispatcher import DispatcherState
+
+# Instance statuses which make the instance action unnecessary.
+_REACHED_STATUSES = {"stop": "stopped", "freeze": "frozen", "resume": "active"}
+
+
+def _service_artifact(service: Dict[str, Any]) -> Tuple[int, str, str]:
+    artifact = service["spec"]["artifact"]
+    return artifact["runtime_id"], artifact["name"], artifact["version"]
+
+
+def _service_status(service: Dict[str, Any]) -> Optional[str]:
+    """Returns the service status name, e.g. `active` or `migrating`."""
+    status = service.get("status")
+    if isinstance(status, dict):
+        # Statuses with data (e.g. `migrating`) are represented as a single-key dict.
+        return next(iter(status), None)
+
+    return status
+
+
+class LaunchPlan:
+    """Minimal set of changes bringing the blockchain to the state described by the configuration.
+
+    The plan is computed from a single snapshot of the dispatcher state, skipping operations which
+    are already applied: deploy of a deployed artifact, unload of an artifact which is not deployed,
+    start of an existing service, stop, freeze and resume of a service which already has the target
+    status, migration of a service to its current artifact. Consensus and service config changes
+    can't be compared with the current state, so they are always applied."""
+
+    def __init__(self, config: Configuration, dispatcher_state: DispatcherState) -> None:
+        self.deploy: List[Artifact] = list()
+        self.unload: List[Artifact] = list()
+        self.instances: List[Instance] = list()
+        self.migrations: Dict[str, Artifact] = dict()
+        self.consensus = config.consensus is not None
+        # Skipped operations along with the reasons.
+        self.skipped: List[Tuple[str, str]] = list()
+        # Artifacts and instances which are already in the desired state.
+        self.deployed: List[Artifact] = list()
+        self.started: Dict[Instance, int] = dict()
+
+        for artifact in config.artifacts.values():
+            deployed = dispatcher_state.is_deployed(artifact)
+            if artifact.action == "deploy" and deployed:
+                self.deployed.append(artifact)
+                self.skipped.append((f"deploy {artifact}", "already deployed"))
+            elif artifact.action == "deploy":
+                self.deploy.append(artifact)
+            elif artifact.action == "unload" and not deployed:
+                self.skipped.append((f"unload {artifact}", "not deployed"))
+            elif artifact.action == "unload":
+                self.unload.append(artifact)
+
+        for instance in config.instances:
+            skip_reason = self._skip_reason(instance, dispatcher_state)
+            if skip_reason is None:
+                self.instances.append(instance)
+            else:
+                self.skipped.append((f"{instance.action} {instance.name}", skip_reason))
+
+        for service_name, artifact in config.migrations.items():
+            service = dispatcher_state.get_service(service_name)
+            if service is not None and _service_artifact(service) == artifact.key():
+                self.skipped.append((f"migrate {service_name}", f"already uses {artifact}"))
+            else:
+                self.migrations[service_name] = artifact
+
+    def _skip_reason(self, instance: Instance, dispatcher_state: DispatcherState) -> Optional[str]:
+        service = dispatcher_state.get_service(instance.name)
+        if service is None:
+            return None
+
+        # Service with the same name but a different artifact is not skipped, so the conflict is reported.
+        if instance.action == "start" and _service_artifact(service) == instance.artifact.key():
+            self.started[instance] = int(service["spec"]["id"])
+            return "already started"
+
+        status = _service_status(service)
+        if status is not None and _REACHED_STATUSES.get(instance.action) == status:
+            return f"already {status}"
+
+        return None
+
+    def is_empty(self) -> bool:
+        """Returns True if there is nothing to apply."""
+        return not (self.deploy or self.unload or self.instances or self.migrations or self.consensus)
+
+    def apply_to(self, config: Configuration) -> Configuration:
+        """Returns a copy of the configuration narrowed down to the planned operations.
+
+        The provided configuration is left intact, so it can be planned and launched again."""
+        narrowed = copy.copy(config)
+
+        # Artifacts are copied, since the actions of the skipped ones are changed.
+        artifacts: Dict[Artifact, Artifact] = dict()
+        narrowed.artifacts = dict()
+        for name, artifact in config.artifacts.items():
+            artifacts[artifact] = narrowed.artifacts[name] = copy.copy(artifact)
+            if artifact.action in ("deploy", "unload") and artifact not in self.deploy + self.unload:
+                artifacts[artifact].action = "none"
+
+        narrowed.instances = InstanceCollection(
+            self._copy_instance(instance, artifacts.get(instance.artifact, instance.artifact))
+            for instance in self.instances
+        )
+        narrowed.migrations = dict(self.migrations)
+
+        return narrowed
+
+    @staticmethod
+    def _copy_instance(instance: Instance, artifact: Artifact) -> Instance:
+        copied = Instance(artifact, instance.name, instance.action, instance.config)
+        copied.instance_id = instance.instance_id
+        return copied
+
+    def __str__(self) -> str:
+        lines = [f"deploy {artifact}" for artifact in self.deploy]
+        lines += [f"unload {artifact}" for artifact in self.unload]
+        lines += [f"migrate {service_name} to {artifact}" for service_name, artifact in self.migrations.items()]
+        lines += ["change consensus config"] if self.consensus else []
+        lines += [f"{instance.action} {instance.name}" for instance in self.instances]
+        lines += [f"skip {operation}: {reason}" for operation, reason in self.skipped]
+
+        if self.is_empty():
+            lines.insert(0, "nothing to do")
+        return "\n".join(["Launch plan:"] + [f"  {line}" for line in lines])
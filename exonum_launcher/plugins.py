@@ -0,0 +1,155 @@
+"""Module with the spec loader plugins, which are discovered through the package entry points and loaded lazily.
+
+Packages providing spec loaders register them in the `exonum_launcher.runtimes` group (keyed by the runtime name)
+or in the `exonum_launcher.instances` group (keyed by the artifact name), e.g. in `setup.py`:
+
+    entry_points={"exonum_launcher.runtimes": ["python = exonum_launcher_python:PythonSpecLoader"]}"""
+import functools
+import importlib
+import threading
+from typing import Any, Dict, Generic, Iterator, Mapping, Optional, Set, TypeVar
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python < 3.8
+    importlib_metadata = None  # type: ignore
+
+from .configuration import Artifact, Configuration
+from .instances import InstanceSpecLoader
+from .runtimes import RuntimeSpecLoader, RustSpecLoader
+
+RUNTIMES_GROUP = "exonum_launcher.runtimes"
+INSTANCES_GROUP = "exonum_launcher.instances"
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_points(group: str) -> Dict[str, str]:
+    if importlib_metadata is None:
+        import pkg_resources  # pylint: disable=import-outside-toplevel
+
+        return {
+            entry_point.name: f"{entry_point.module_name}:{'.'.join(entry_point.attrs)}"
+            for entry_point in pkg_resources.iter_entry_points(group)
+        }
+
+    entry_points: Any = importlib_metadata.entry_points()
+    # `select` was added in Python 3.10, older versions return a dict of groups.
+    selected = entry_points.select(group=group) if hasattr(entry_points, "select") else entry_points.get(group, [])
+
+    return {entry_point.name: entry_point.value for entry_point in selected}
+
+
+def discover(group: str) -> Dict[str, str]:
+    """Returns the class paths of the plugins registered in the entry point group, keyed by the entry point names.
+
+    Installed distributions are scanned only once per process."""
+    return dict(_entry_points(group))
+
+
+def load_class(class_path: str, base: type) -> type:
+    """Imports the class by its path, either `module.Class` or the entry point form `module:Class`."""
+    if ":" in class_path:
+        module_name, class_name = class_path.split(":", 1)
+    else:
+        module_name, class_name = class_path.rsplit(".", 1)
+
+    plugin: Any = importlib.import_module(module_name)
+    for attribute in class_name.split("."):
+        plugin = getattr(plugin, attribute)
+
+    if not isinstance(plugin, type) or not issubclass(plugin, base):
+        raise ValueError(f"Class {plugin} is not a subclass of {base}")
+
+    return plugin
+
+
+class PluginRegistry(Mapping[K, T], Generic[K, T]):
+    """Spec loaders keyed by the runtime name or by the artifact.
+
+    Plugins are declared by their class paths and are imported and instantiated on the first use,
+    so the unused plugins don't slow down the launch. Loaded instances are cached. Plugins discovered
+    through the entry points can be replaced by the explicitly declared or added ones."""
+
+    def __init__(self, base: type, kind: str, discovered: Optional[Mapping[K, str]] = None) -> None:
+        self._base = base
+        self._kind = kind
+        self._lock = threading.Lock()
+        self._paths: Dict[K, str] = dict(discovered or dict())
+        self._discovered: Set[K] = set(self._paths)
+        self._loaded: Dict[K, T] = dict()
+
+    def declare(self, key: K, class_path: str) -> None:
+        """Declares the plugin by its class path."""
+        with self._lock:
+            self._paths[key] = class_path
+            self._discovered.discard(key)
+            self._loaded.pop(key, None)
+
+    def add(self, key: K, plugin: T) -> None:
+        """Adds the already created plugin."""
+        with self._lock:
+            self._paths.pop(key, None)
+            self._discovered.discard(key)
+            self._loaded[key] = plugin
+
+    def is_declared(self, key: K) -> bool:
+        """Returns true if the plugin for the key is declared or added explicitly (i.e. not discovered)."""
+        return key in self and key not in self._discovered
+
+    def loaded(self) -> Dict[K, T]:
+        """Returns a copy of the already loaded plugins."""
+        with self._lock:
+            return dict(self._loaded)
+
+    def __getitem__(self, key: K) -> T:
+        with self._lock:
+            if key not in self._loaded:
+                class_path = self._paths[key]
+                try:
+                    self._loaded[key] = load_class(class_path, self._base)()
+                except (ValueError, ImportError, AttributeError) as error:
+                    raise RuntimeError(f"Could not load {self._kind} parser {class_path}: {error}")
+
+            return self._loaded[key]
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._loaded) + [key for key in self._paths if key not in self._loaded])
+
+    def __len__(self) -> int:
+        return len(set(self._paths) | set(self._loaded))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._paths or key in self._loaded
+
+
+def runtime_plugins(config: Configuration) -> PluginRegistry[str, RuntimeSpecLoader]:
+    """Returns the runtime plugins from the entry points and the config (the latter take precedence),
+    along with the default rust runtime plugin."""
+    runtime_loaders: PluginRegistry[str, RuntimeSpecLoader] = PluginRegistry(
+        RuntimeSpecLoader, "runtime", discover(RUNTIMES_GROUP)
+    )
+    for runtime_name, class_path in config.plugins["runtime"].items():
+        runtime_loaders.declare(runtime_name, class_path)
+    runtime_loaders.add("rust", RustSpecLoader())
+
+    return runtime_loaders
+
+
+def artifact_plugins(config: Configuration) -> PluginRegistry[Artifact, InstanceSpecLoader]:
+    """Returns the artifact plugins from the entry points (matched by the artifact name) and the config."""
+    discovered = discover(INSTANCES_GROUP)
+    instance_loaders: PluginRegistry[Artifact, InstanceSpecLoader] = PluginRegistry(
+        InstanceSpecLoader,
+        "instance",
+        {artifact: discovered[artifact.name] for artifact in config.artifacts.values() if artifact.name in discovered},
+    )
+    for artifact_name, class_path in config.plugins["artifact"].items():
+        try:
+            instance_loaders.declare(config.artifacts[artifact_name], class_path)
+        except KeyError as error:
+            raise RuntimeError(f"Could not load runtime parser {class_path}: {error}")
+
+    return instance_loaders
@@ -0,0 +1,233 @@
+"""Module with the on-disk cache of the compiled protobuf modules and the protobuf loader shared by the launchers."""
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Callable, Iterator, List, Optional
+
+from google.protobuf import __version__ as PROTOBUF_VERSION
+from exonum_client.protobuf_loader import PYTHON_RUNTIME, ProtobufLoader, ProtobufProviderInterface, ProtoFile
+
+from .cache import cache_dir
+
+# Version of the cache layout, should be bumped on incompatible changes.
+CACHE_FORMAT = "1"
+
+
+def _sources_digest(sources: List[ProtoFile], *extra: str) -> str:
+    """Calculates a hash of the proto sources (and the extra parameters affecting the compilation)."""
+    digest = hashlib.sha256()
+    for part in (CACHE_FORMAT, PROTOBUF_VERSION) + extra:
+        digest.update(part.encode() + b"\0")
+
+    for proto_file in sorted(sources):
+        digest.update(proto_file.name.encode() + b"\0" + proto_file.content.encode() + b"\0")
+
+    return digest.hexdigest()
+
+
+class ProtoCache:
+    """Content-addressed storage of the compiled protobuf modules shared by the launcher runs and processes.
+
+    Compiled modules are stored under the hash of their proto sources. Additionally, the index maps
+    artifact IDs to those hashes, so the sources of the already known artifacts are not even downloaded.
+
+    Every entry is written into a temporary directory first and then renamed, so concurrent processes
+    never observe partially written entries. Cache is a best-effort one: if it can't be written,
+    modules are compiled as usual."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path if path is not None else cache_dir("proto")
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.path, "modules", digest)
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.path, "index", hashlib.sha256(key.encode()).hexdigest())
+
+    def lookup(self, digest: str) -> Optional[str]:
+        """Returns a path to the compiled modules with the given sources hash, if they are cached."""
+        path = self._entry_path(digest)
+        return path if os.path.isdir(path) else None
+
+    def resolve(self, key: str) -> Optional[str]:
+        """Returns a sources hash for the given key, if modules for that key are cached."""
+        try:
+            with open(self._index_path(key), "r", encoding="utf-8") as index_file:
+                digest = index_file.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        return digest if self.lookup(digest) is not None else None
+
+    def store(self, digest: str, modules_path: str) -> None:
+        """Puts the compiled modules into the cache."""
+        try:
+            os.makedirs(os.path.join(self.path, "modules"), exist_ok=True)
+            temp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=os.path.join(self.path, "modules"))
+            try:
+                entry_path = os.path.join(temp_dir, "entry")
+                shutil.copytree(modules_path, entry_path, ignore=shutil.ignore_patterns("__pycache__"))
+                os.rename(entry_path, self._entry_path(digest))
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        except OSError:
+            # The entry was already stored by another process or the cache is not writable.
+            pass
+
+    def remember(self, key: str, digest: str) -> None:
+        """Stores the sources hash for the given key in the index."""
+        index_path = self._index_path(key)
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(prefix=".tmp_", dir=os.path.dirname(index_path))
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as index_file:
+                index_file.write(digest)
+            os.replace(temp_path, index_path)
+        except OSError:
+            pass
+
+
+class CachingProtobufLoader(ProtobufLoader):
+    """ProtobufLoader which takes the compiled modules from the `ProtoCache` when possible
+    and puts the freshly compiled modules there.
+
+    Core proto sources are always downloaded (they're used as includes for the service protos),
+    but compiled only if they have changed. Service proto sources are neither downloaded
+    nor compiled if the artifact is already cached.
+
+    Please note that `ProtobufLoader` is a singleton which only accepts positional arguments."""
+
+    def __init__(self, client: Optional[ProtobufProviderInterface] = None, cache: Optional[ProtoCache] = None):
+        super().__init__(client)
+
+        # Loader is a singleton, so the attributes are set only on the first creation.
+        if not hasattr(self, "cache"):
+            self.cache = cache if cache is not None else ProtoCache()
+            self._main_digest = ""
+
+    def _initialized_dir(self) -> str:
+        if self._proto_dir is None:
+            raise RuntimeError("Attempt to use uninitialized ProtobufLoader")
+
+        return self._proto_dir
+
+    def _load_modules(self, digest: str, modules_path: str, compile_modules: Callable[[], None]) -> None:
+        cached_path = self.cache.lookup(digest)
+        if cached_path is not None:
+            shutil.copytree(cached_path, modules_path)
+            return
+
+        compile_modules()
+        self.cache.store(digest, modules_path)
+
+    def load_main_proto_files(self) -> None:
+        """Loads the main Exonum proto files, taking the compiled modules from the cache if possible."""
+        proto_dir = self._initialized_dir()
+
+        proto_contents = self.client.get_main_proto_sources()
+        main_digest = _sources_digest(proto_contents)
+
+        modules_path = os.path.join(proto_dir, "exonum_modules", "main")
+        if os.path.isdir(modules_path):
+            # Main modules are already loaded by another user of the shared loader.
+            if main_digest != self._main_digest:
+                raise RuntimeError("Main Exonum proto files differ from the ones already loaded in this process")
+            return
+
+        self._main_digest = main_digest
+        main_dir = os.path.join(proto_dir, "proto", "main")
+        self._save_files(main_dir, proto_contents)
+
+        self._load_modules(self._main_digest, modules_path, lambda: self.protoc.compile(main_dir, modules_path))
+
+    def load_service_proto_files(self, runtime_id: int, artifact_name: str, artifact_version: str) -> None:
+        """Loads proto files for a service, taking the compiled modules from the cache if possible."""
+        proto_dir = self._initialized_dir()
+
+        service_module_name = re.sub(r"[-. :/]", "_", f"{artifact_name}:{artifact_version}")
+        modules_path = os.path.join(proto_dir, "exonum_modules", service_module_name)
+        if os.path.isdir(modules_path):
+            # Modules for this artifact are already loaded.
+            return
+
+        # Python services do not rely on the `includes` from the exonum core.
+        main_digest = self._main_digest if runtime_id != PYTHON_RUNTIME else ""
+        key = f"{runtime_id}:{artifact_name}:{artifact_version}:{main_digest}"
+
+        digest = self.cache.resolve(key)
+        cached_path = self.cache.lookup(digest) if digest is not None else None
+        if cached_path is not None:
+            shutil.copytree(cached_path, modules_path)
+            return
+
+        proto_contents = self.client.get_proto_sources_for_artifact(runtime_id, artifact_name, artifact_version)
+        digest = _sources_digest(proto_contents, main_digest)
+
+        service_dir = os.path.join(proto_dir, "proto", service_module_name)
+        self._save_files(service_dir, proto_contents)
+
+        def _compile() -> None:
+            if runtime_id != PYTHON_RUNTIME:
+                self.protoc.compile(service_dir, modules_path, include=os.path.join(proto_dir, "proto", "main"))
+            else:
+                self.protoc.compile(service_dir, modules_path)
+
+        self._load_modules(digest, modules_path, _compile)
+        self.cache.remember(key, digest)
+
+
+class SharedProtobufProvider(ProtobufProviderInterface):
+    """Proto sources provider of the protobuf loader shared by all the launchers in the process.
+
+    `ProtobufLoader` is a process-wide singleton bound to a single provider, while every launcher
+    downloads the proto sources from its own network. So the loader is always created with this
+    provider, which forwards the requests to the provider of the launcher currently using the loader
+    (see `use`). Launchers use the loader one at a time."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._provider: Optional[ProtobufProviderInterface] = None
+
+    @contextlib.contextmanager
+    def use(self, provider: ProtobufProviderInterface) -> Iterator[None]:
+        """Forwards the requests to the given provider until the context is exited.
+        Other threads using the shared provider wait for that."""
+        with self._lock:
+            previous, self._provider = self._provider, provider
+            try:
+                yield
+            finally:
+                self._provider = previous
+
+    def _current(self) -> ProtobufProviderInterface:
+        if self._provider is None:
+            raise RuntimeError("Proto sources are requested outside of SharedProtobufProvider.use")
+
+        return self._provider
+
+    def get_main_proto_sources(self) -> List[ProtoFile]:
+        return self._current().get_main_proto_sources()
+
+    def get_proto_sources_for_artifact(
+        self, runtime_id: int, artifact_name: str, artifact_version: str
+    ) -> List[ProtoFile]:
+        return self._current().get_proto_sources_for_artifact(runtime_id, artifact_name, artifact_version)
+
+
+SHARED_PROVIDER = SharedProtobufProvider()
+
+
+@contextlib.contextmanager
+def protobuf_loader(provider: ProtobufProviderInterface) -> Iterator[CachingProtobufLoader]:
+    """Returns the protobuf loader shared by all the launchers in the process, which downloads
+    the proto sources from the given provider while the context is active.
+
+    The loader is looked up on every use, since the singleton is recreated after it's deinitialized
+    by its last user. Compiled modules are shared by the whole process as well, so the launchers
+    working with different versions of the same artifact can't be run in one process."""
+    with SHARED_PROVIDER.use(provider):
+        yield CachingProtobufLoader(SHARED_PROVIDER)
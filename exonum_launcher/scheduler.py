@@ -0,0 +1,96 @@
+"""Module with the scheduler running the launch operations concurrently."""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .concurrency import MAX_WORKERS
+
+
+class Scheduler:
+    """Runs tasks concurrently, respecting the dependencies between them.
+
+    Every task is started as soon as all of its dependencies are completed. If a task fails,
+    tasks depending on it (directly or not) are skipped, while the independent tasks are still run."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS) -> None:
+        self._max_workers = max_workers
+        self._tasks: Dict[str, Tuple[Callable[[], None], List[str]]] = dict()
+
+    def add_task(self, name: str, func: Callable[[], None], depends_on: Iterable[str] = ()) -> None:
+        """Adds a task which will be run after all the tasks it depends on."""
+        if name in self._tasks:
+            raise ValueError(f"Task '{name}' is already added")
+
+        self._tasks[name] = func, list(depends_on)
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Returns a mapping of task names to the names of the tasks they depend on."""
+        return {name: list(depends_on) for name, (_, depends_on) in self._tasks.items()}
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        """Checks that the dependencies form a DAG and returns the reversed dependencies."""
+        dependents: Dict[str, List[str]] = {name: list() for name in self._tasks}
+        for name, (_, depends_on) in self._tasks.items():
+            for dependency in depends_on:
+                if dependency not in self._tasks:
+                    raise ValueError(f"Task '{name}' depends on unknown task '{dependency}'")
+                dependents[dependency].append(name)
+
+        # Kahn's algorithm: if some tasks can't be ordered, there is a cycle.
+        remaining = {name: len(depends_on) for name, (_, depends_on) in self._tasks.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        ordered = 0
+        while ready:
+            ordered += 1
+            for dependent in dependents[ready.pop()]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if ordered != len(self._tasks):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Tasks have cyclic dependencies: {cycle}")
+
+        return dependents
+
+    def run(self) -> None:
+        """Runs all the tasks and waits for them to finish.
+
+        Once all the tasks which could be run are finished, the first (in the order of addition)
+        exception raised by a task is re-raised."""
+        dependents = self._dependents()
+        remaining = {name: len(depends_on) for name, (_, depends_on) in self._tasks.items()}
+        errors: Dict[str, BaseException] = dict()
+        skipped: Set[str] = set()
+
+        def _skip(name: str) -> None:
+            for dependent in dependents[name]:
+                if dependent not in skipped:
+                    skipped.add(dependent)
+                    _skip(dependent)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            running: Dict[Future, str] = dict()
+
+            def _submit_ready(names: Iterable[str]) -> None:
+                for name in names:
+                    if remaining[name] == 0 and name not in skipped:
+                        running[executor.submit(self._tasks[name][0])] = name
+
+            _submit_ready(self._tasks)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error: Optional[BaseException] = future.exception()
+                    if error is not None:
+                        errors[name] = error
+                        _skip(name)
+                        continue
+
+                    for dependent in dependents[name]:
+                        remaining[dependent] -= 1
+                    _submit_ready(dependents[name])
+
+        for name in self._tasks:
+            if name in errors:
+                raise errors[name]
@@ -1,30 +1,59 @@
 """Module encapsulating the interaction with the supervisor."""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 import random
-from typing import Any, List, Optional, Tuple
+import threading
+import time
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
 from google.protobuf.message import Message
+from requests.exceptions import RequestException
 
 from exonum_client import ExonumClient
 from exonum_client.module_manager import ModuleManager
+from exonum_client.protobuf_loader import ProtobufLoader
 
+from .concurrency import MAX_WORKERS
 from .configuration import Artifact, Instance
+from .dispatcher import DispatcherState
 from .explorer import Explorer
 from .instances import InstanceSpecLoader
+from .proto_cache import protobuf_loader
 from .runtimes import RuntimeSpecLoader
 
 
+class SupervisorRequestError(Exception):
+    """Error raised when a request to the supervisor fails on some of the nodes."""
+
+    def __init__(self, endpoint: str, errors: Dict[str, Exception]) -> None:
+        details = "; ".join(f"{node}: {error}" for node, error in errors.items())
+        super().__init__(f"Request to the supervisor endpoint '{endpoint}' failed on {len(errors)} node(s): {details}")
+        self.errors = errors
+
+
 # pylint: disable=too-many-instance-attributes
 class Supervisor:
     """Interface to interact with the Supervisor service."""
 
-    def __init__(self, mode: str, clients: List[ExonumClient]) -> None:
+    # Timeout for a request to a single node in seconds.
+    REQUEST_TIMEOUT = 30.0
+    # Amount of blocks to wait for a proposal to be applied.
+    APPLY_BLOCKS = 10
+
+    def __init__(self, mode: str, clients: List[ExonumClient], explorer: Optional[Explorer] = None) -> None:
         self._mode = mode
         self._clients = clients
         self._main_client = clients[0]
-        self._loader = self._main_client.protobuf_loader()
+        self._explorer = explorer if explorer is not None else Explorer(self._main_client)
+        # Set once the protobuf loader shared by the launchers in the process is initialized for this supervisor.
+        self._loader_initialized = False
         self._supervisor_runtime_id: Optional[int] = None
         self._supervisor_artifact_name: Optional[str] = None
         self._supervisor_artifact_version: Optional[str] = None
         self._service_module: Optional[Any] = None
+        # Locally tracked configuration number, see `_get_configuration_number`.
+        self._configuration_lock = threading.Lock()
+        self._configuration_number: Optional[int] = None
+        self._configuration_number_block = 0
+        self._proposal_pending = False
 
     def __enter__(self) -> "Supervisor":
         self.initialize()
@@ -34,21 +63,24 @@ class Supervisor:
     def __exit__(self, exc_type: Optional[type], exc_value: Optional[Any], exc_traceback: Optional[object]) -> None:
         self.deinitialize()
 
-    def initialize(self) -> None:
+    def initialize(self, dispatcher_state: Optional[DispatcherState] = None) -> None:
         """Initializes the Supervisor interface, doing the following:
 
         - Initializes protobuf loader;
-        - Finds the ID and the name of the exonum supervisor service instance;
+        - Finds the ID and the name of the exonum supervisor service instance
+          (in the provided dispatcher state, or in the one requested from the node);
         - Loading the supervisor proto files;
         - Importing the supervisor's `service` proto module.
         """
-        self._loader.initialize()
-
-        self._loader.load_main_proto_files()
+        with self._protobuf_loader() as loader:
+            loader.initialize()
+            self._loader_initialized = True
 
-        services = self._main_client.public_api.available_services().json()
+            loader.load_main_proto_files()
 
-        for artifact in services["artifacts"]:
+        if dispatcher_state is None:
+            dispatcher_state = self._explorer.dispatcher_state()
+        for artifact in dispatcher_state.artifacts.values():
             if artifact["name"].startswith("exonum-supervisor"):
                 self._supervisor_runtime_id = artifact["runtime_id"]
                 self._supervisor_artifact_name = artifact["name"]
@@ -61,37 +93,130 @@ class Supervisor:
                 "Please check that exonum node configuration is correct"
             )
 
-        self._loader.load_service_proto_files(
-            self._supervisor_runtime_id, self._supervisor_artifact_name, self._supervisor_artifact_version
-        )
-        self._service_module = ModuleManager.import_service_module(
-            self._supervisor_artifact_name, self._supervisor_artifact_version, "service"
-        )
+        assert self._supervisor_runtime_id is not None and self._supervisor_artifact_version is not None
+        with self._protobuf_loader() as loader:
+            loader.load_service_proto_files(
+                self._supervisor_runtime_id, self._supervisor_artifact_name, self._supervisor_artifact_version
+            )
+            self._service_module = ModuleManager.import_service_module(
+                self._supervisor_artifact_name, self._supervisor_artifact_version, "service"
+            )
 
     def deinitialize(self) -> None:
         """Deinitializes the Supervisor by deinitializing the Protobuf Loader."""
-        self._loader.deinitialize()
+        if not self._loader_initialized:
+            return
+
+        with self._protobuf_loader() as loader:
+            loader.deinitialize()
+            self._loader_initialized = False
+
+    def _protobuf_loader(self) -> ContextManager[ProtobufLoader]:
+        """Returns the protobuf loader shared by all the launchers in the process (see `proto_cache.protobuf_loader`).
+        Compiled proto modules are taken from the on-disk cache shared by the launcher runs."""
+        return protobuf_loader(self._main_client.protobuf_provider)
 
     def _post_to_supervisor(self, endpoint: str, message: Message, private: bool = True) -> List[str]:
-        responses: List[str] = list()
+        """Sends the message to the supervisor of every node concurrently, see `_post_bytes_to_supervisor`."""
+        return self._post_bytes_to_supervisor(endpoint, message.SerializeToString(), private)
 
-        data = message.SerializeToString()
+    def _post_bytes_to_supervisor(self, endpoint: str, data: bytes, private: bool = True) -> List[str]:
+        """Sends the serialized message to the supervisor of every node concurrently.
 
-        for client in self._clients:
+        Responses are returned in the order of clients. If the request fails or times out on some
+        of the nodes, `SupervisorRequestError` with errors for every failed node is raised."""
+
+        def _post(client: ExonumClient) -> str:
             supervisor_api = (
                 client.service_private_api("supervisor") if private else client.service_public_api("supervisor")
             )
             response = supervisor_api.post_service(endpoint, data, data_format="binary")
-            responses.append(response.json())
+            response.raise_for_status()
+            return response.json()
+
+        responses: List[str] = list()
+        errors: Dict[str, Exception] = dict()
+
+        executor = ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(self._clients)))
+        try:
+            futures = [executor.submit(_post, client) for client in self._clients]
+            # Requests are sent at the same time, so they share the deadline.
+            deadline = time.monotonic() + self.REQUEST_TIMEOUT
+            for client, future in zip(self._clients, futures):
+                node = f"{client.hostname}:{client.private_api_port if private else client.public_api_port}"
+                try:
+                    responses.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+                except FuturesTimeoutError:
+                    errors[node] = TimeoutError(f"no response in {self.REQUEST_TIMEOUT} seconds")
+                except (RequestException, ValueError) as error:
+                    errors[node] = error
+        finally:
+            # Do not wait for the requests which have timed out.
+            executor.shutdown(wait=False)
+
+        if errors:
+            raise SupervisorRequestError(endpoint, errors)
 
         return responses
 
-    def _get_configuration_number(self) -> int:
+    def _request_configuration_number(self) -> int:
         supervisor_private_api = self._main_client.service_private_api("supervisor")
         response = supervisor_private_api.get_service("configuration-number")
-
         return int(response.json())
 
+    def _get_configuration_number(self) -> int:
+        """Returns the configuration number for the next proposal.
+
+        The number is requested from the supervisor once and then tracked locally: it's bumped when
+        a proposal is sent, and requested again only if a new block was committed while there are
+        no pending proposals (since someone else could change the configuration) or if the proposal
+        was rejected (see `complete_proposal`)."""
+        blocks = self._explorer.blocks()
+        with self._configuration_lock:
+            if self._configuration_number is not None and (
+                self._proposal_pending or self._configuration_number_block == blocks.latest()
+            ):
+                return self._configuration_number
+
+            # Block number is taken before the request, so a block committed during the request
+            # invalidates the number.
+            block = blocks.latest()
+            configuration_number = self._request_configuration_number()
+
+            # Without the subscription the new blocks can't be tracked, so the number can't be cached.
+            if blocks.is_connected():
+                self._configuration_number = configuration_number
+                self._configuration_number_block = block
+
+            return configuration_number
+
+    def complete_proposal(self, accepted: bool) -> None:
+        """Notifies the Supervisor about the outcome of the sent proposal.
+
+        If the proposal was rejected, the configuration number is requested again for the next proposal."""
+        blocks = self._explorer.blocks()
+        with self._configuration_lock:
+            self._proposal_pending = False
+            if accepted:
+                self._configuration_number_block = blocks.latest()
+            else:
+                self._configuration_number = None
+
+    def wait_for_configuration(self, configuration_number: int) -> bool:
+        """Waits until the supervisor configuration number reaches the given one, i.e. until all the proposals
+        with the lesser numbers are applied. The number is checked once per block for up to `APPLY_BLOCKS` blocks.
+
+        Returns False if the number was not reached."""
+        blocks = self._explorer.blocks()
+        seen = blocks.latest()
+        for _ in range(self.APPLY_BLOCKS):
+            if self._request_configuration_number() >= configuration_number:
+                return True
+
+            seen = blocks.wait_for_block(seen, self._explorer.BLOCK_TIMEOUT)
+
+        return False
+
     def get_migration_state(self, service: str, artifact: Artifact, seed: int) -> Any:
         """Retrieves a state of the migration for the service."""
         height = artifact.deadline_height
@@ -130,8 +255,12 @@ class Supervisor:
 
         return migration_request, seed
 
-    def create_unload_request(self, artifacts: List[Artifact], actual_from: int) -> Optional[Message]:
-        """Creates unload request for the given artifact."""
+    def create_unload_request(
+        self, artifacts: List[Artifact], actual_from: int, *, configuration_number: Optional[int] = None
+    ) -> Optional[Message]:
+        """Creates unload request for the given artifact.
+
+        If the configuration number is not provided, it's taken from the supervisor."""
         assert self._service_module is not None
 
         artifacts_to_unload = list(filter(lambda a: a.action == "unload", artifacts))
@@ -140,7 +269,9 @@ class Supervisor:
             return None
 
         unload_artifact_request = self._service_module.ConfigPropose()
-        unload_artifact_request.configuration_number = self._get_configuration_number()
+        unload_artifact_request.configuration_number = (
+            configuration_number if configuration_number is not None else self._get_configuration_number()
+        )
         unload_artifact_request.actual_from = actual_from
 
         for artifact in artifacts_to_unload:
@@ -175,7 +306,8 @@ class Supervisor:
             start_service.artifact.version = instance.artifact.version
             start_service.name = instance.name
             if instance.config:
-                start_service.config = config_loader.load_spec(self._loader, instance)
+                with self._protobuf_loader() as loader:
+                    start_service.config = config_loader.load_spec(loader, instance)
 
             config_change.start_service.CopyFrom(start_service)
             start_request.changes.append(config_change)
@@ -187,8 +319,12 @@ class Supervisor:
         instances: List[Instance],
         config_loaders: List[InstanceSpecLoader],
         actual_from: int,
+        *,
+        configuration_number: Optional[int] = None,
     ) -> Message:
-        """Creates a configuration change request."""
+        """Creates a configuration change request.
+
+        If the configuration number is not provided, it's taken from the supervisor."""
 
         if self._mode != "simple":
             raise RuntimeError("Changing configuration for decentralized supervisor is not yet supported")
@@ -196,7 +332,9 @@ class Supervisor:
         assert self._service_module is not None
 
         config_change_request = self._service_module.ConfigPropose()
-        config_change_request.configuration_number = self._get_configuration_number()
+        config_change_request.configuration_number = (
+            configuration_number if configuration_number is not None else self._get_configuration_number()
+        )
         config_change_request.actual_from = actual_from
 
         if consensus is not None:
@@ -224,6 +362,46 @@ class Supervisor:
 
         return config_change_request
 
+    @staticmethod
+    def split_config_proposal(config_proposal: Message, max_size: int) -> List[Message]:
+        """Splits the configuration proposal into a sequence of proposals, each of which takes no more
+        than `max_size` bytes when serialized.
+
+        Changes keep their order and are packed greedily, which gives the minimal number of proposals.
+        Proposals get successive configuration numbers, so every proposal should be sent only after
+        the previous one is applied. Only the first proposal keeps the `actual_from` height, the rest
+        are applied as soon as possible."""
+        if config_proposal.ByteSize() <= max_size:
+            return [config_proposal]
+
+        changes_field = config_proposal.DESCRIPTOR.fields_by_name["changes"]
+        tag_size = _varint_size(changes_field.number << 3)
+
+        proposals: List[Message] = list()
+        proposal_size = 0
+        for change in config_proposal.changes:
+            change_size = change.ByteSize()
+            # Every change is serialized as a length-delimited field.
+            entry_size = tag_size + _varint_size(change_size) + change_size
+
+            if not proposals or proposal_size + entry_size > max_size:
+                proposal = type(config_proposal)()
+                proposal.configuration_number = config_proposal.configuration_number + len(proposals)
+                proposal.actual_from = config_proposal.actual_from if not proposals else 0
+                proposal_size = proposal.ByteSize()
+                if proposal_size + entry_size > max_size:
+                    raise RuntimeError(
+                        f"Configuration change of {change_size} bytes doesn't fit into the proposal size limit "
+                        f"of {max_size} bytes"
+                    )
+
+                proposals.append(proposal)
+
+            proposals[-1].changes.append(change)
+            proposal_size += entry_size
+
+        return proposals
+
     def _build_consensus_change(self, consensus: Any, change: Any) -> None:
         """Creates a ConfigChange for consensus config."""
 
@@ -267,8 +445,7 @@ class Supervisor:
 
         if instance.instance_id is None:
             # Instance ID is currently unknown, retrieve it.
-            explorer = Explorer(self._main_client)
-            instance_id = explorer.get_instance_id(instance)
+            instance_id = self._explorer.get_instance_id(instance)
 
             if instance_id is None:
                 raise RuntimeError(f"Instance {instance} doesn't seem to be deployed, can't change configuration")
@@ -276,7 +453,8 @@ class Supervisor:
             instance.instance_id = instance_id
 
         service_config.instance_id = instance.instance_id
-        service_config.params = config_loader.serialize_config(self._loader, instance, instance.config)
+        with self._protobuf_loader() as loader:
+            service_config.params = config_loader.serialize_config(loader, instance, instance.config)
 
         change.service.CopyFrom(service_config)
 
@@ -291,7 +469,8 @@ class Supervisor:
         start_service.artifact.version = instance.artifact.version
         start_service.name = instance.name
         if instance.config:
-            start_service.config = config_loader.load_spec(self._loader, instance)
+            with self._protobuf_loader() as loader:
+                start_service.config = config_loader.load_spec(loader, instance)
 
         change.start_service.CopyFrom(start_service)
 
@@ -303,8 +482,7 @@ class Supervisor:
 
         if instance.instance_id is None:
             # Instance ID is currently unknown, retrieve it.
-            explorer = Explorer(self._main_client)
-            instance_id = explorer.get_instance_id(instance)
+            instance_id = self._explorer.get_instance_id(instance)
 
             if instance_id is None:
                 raise RuntimeError(f"Instance {instance} does not seem to be deployed, it can't be stopped")
@@ -323,8 +501,7 @@ class Supervisor:
 
         if instance.instance_id is None:
             # Instance ID is currently unknown, retrieve it.
-            explorer = Explorer(self._main_client)
-            instance_id = explorer.get_instance_id(instance)
+            instance_id = self._explorer.get_instance_id(instance)
 
             if instance_id is None:
                 raise RuntimeError(f"Instance {instance} does not seem to be deployed, it can't be resumed")
@@ -334,7 +511,8 @@ class Supervisor:
         resume_service.instance_id = instance.instance_id
 
         if instance.config:
-            resume_service.params = config_loader.serialize_config(self._loader, instance, instance.config)
+            with self._protobuf_loader() as loader:
+                resume_service.params = config_loader.serialize_config(loader, instance, instance.config)
 
         change.resume_service.CopyFrom(resume_service)
 
@@ -346,8 +524,7 @@ class Supervisor:
 
         if instance.instance_id is None:
             # Instance ID is currently unknown, retrieve it.
-            explorer = Explorer(self._main_client)
-            instance_id = explorer.get_instance_id(instance)
+            instance_id = self._explorer.get_instance_id(instance)
 
             if instance_id is None:
                 raise RuntimeError(f"Instance {instance} does not seem to be deployed, it can't be frozen")
@@ -362,8 +539,39 @@ class Supervisor:
         return self._post_to_supervisor("deploy-artifact", deploy_request)
 
     def send_propose_config_request(self, config_proposal: Message) -> List[str]:
-        """Sends propose config request to the Supervisor."""
-        return self._post_to_supervisor("propose-config", config_proposal)
+        """Sends propose config request to the Supervisor.
+
+        Once the proposal is applied, the configuration number will be incremented, so the next
+        proposal gets the incremented number without asking the supervisor."""
+        return self._propose_config(config_proposal.SerializeToString(), config_proposal.configuration_number)
+
+    def send_compiled_config_proposal(self, data: bytes, number_field: int) -> Tuple[List[str], int]:
+        """Sends the serialized `ConfigPropose` message which lacks the configuration number.
+
+        The current configuration number is appended to the message as the field with the given number
+        (protobuf allows fields to be serialized in any order). Returns the transaction hashes along with
+        the configuration number of the proposal."""
+        configuration_number = self._get_configuration_number()
+        data += _encode_varint(number_field << 3) + _encode_varint(configuration_number)
+
+        return self._propose_config(data, configuration_number), configuration_number
+
+    def _propose_config(self, data: bytes, configuration_number: int) -> List[str]:
+        try:
+            txs = self._post_bytes_to_supervisor("propose-config", data)
+        except SupervisorRequestError:
+            self.complete_proposal(False)
+            raise
+
+        with self._configuration_lock:
+            self._configuration_number = configuration_number + 1
+            self._proposal_pending = True
+
+        return txs
+
+    def send_compiled_request(self, endpoint: str, data: bytes) -> List[str]:
+        """Sends the serialized deploy or migration request to the Supervisor."""
+        return self._post_bytes_to_supervisor(endpoint, data)
 
     def send_migration_request(self, migration_request: Message) -> List[str]:
         """Sends migration request to the Supervisor"""
@@ -372,3 +580,24 @@ class Supervisor:
 
 def _get_seed() -> int:
     return random.getrandbits(64)
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encodes the non-negative value as a protobuf varint."""
+    result = bytearray()
+    while value >= 0x80:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+
+    return bytes(result)
+
+
+def _varint_size(value: int) -> int:
+    """Returns the amount of bytes taken by the varint-encoded value."""
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+
+    return size
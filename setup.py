@@ -4,6 +4,9 @@ import setuptools
 
 INSTALL_REQUIRES = ["pyyaml", "exonum-python-client==1.0.1"]
 
+# `AsyncLauncher` requires aiohttp.
+EXTRAS_REQUIRE = {"async": ["aiohttp"]}
+
 PYTHON_REQUIRES = ">=3.6"
 
 with open("README.md", "r") as readme:
@@ -20,6 +23,7 @@ setuptools.setup(
     url="https://github.com/exonum/exonum-launcher",
     packages=["exonum_launcher", "exonum_launcher.instances", "exonum_launcher.runtimes"],
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     python_requires=PYTHON_REQUIRES,
     classifiers=[
         "Programming Language :: Python :: 3",
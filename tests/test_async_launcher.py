@@ -0,0 +1,258 @@
+# pylint: disable=missing-docstring, protected-access
+
+import asyncio
+import copy
+import unittest
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from unittest.mock import MagicMock
+
+from exonum_launcher.action_result import ActionResult
+from exonum_launcher.configuration import Configuration
+from exonum_launcher.supervisor import SupervisorRequestError
+from .test_explorer import DISPATCHER_INFO
+from .test_supervisor import _proposal_classes
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from exonum_launcher.async_client import AsyncClient
+    from exonum_launcher.async_launcher import AsyncLauncher
+except ImportError:  # aiohttp is an optional dependency.
+    web = None  # type: ignore
+
+
+class FakeNode:
+    """Exonum node API for a single node, which commits a block every `BLOCK_INTERVAL` seconds.
+
+    Deploy requests carry the artifact ID, and every change of the configuration proposals carries
+    the name of the started instance."""
+
+    BLOCK_INTERVAL = 0.02
+
+    def __init__(self) -> None:
+        self.dispatcher: Dict[str, Any] = copy.deepcopy(DISPATCHER_INFO)
+        self.configuration_number = 0
+        self.requests: List[Tuple[str, bytes]] = list()
+        self._statuses: Dict[str, Dict[str, Any]] = dict()
+        self._pending: List[Tuple[str, Callable[[], Optional[str]]]] = list()
+        self._subscribers: List[web.WebSocketResponse] = list()
+        self._blocks: Optional["asyncio.Future[None]"] = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/api/system/v1/stats", self._get(lambda: {}))
+        self.app.router.add_get("/api/services/supervisor/services", self._get(lambda: self.dispatcher))
+        self.app.router.add_get(
+            "/api/services/supervisor/configuration-number", self._get(lambda: self.configuration_number)
+        )
+        self.app.router.add_get("/api/explorer/v1/transactions", self._get_tx)
+        self.app.router.add_get("/api/explorer/v1/blocks/subscribe", self._subscribe)
+        self.app.router.add_post("/api/services/supervisor/{endpoint}", self._post)
+        self.app.on_startup.append(self._start_blocks)
+        self.app.on_shutdown.append(self._stop_blocks)
+
+    @staticmethod
+    def _get(value: Callable[[], Any]) -> Callable[[web.Request], Awaitable[web.Response]]:
+        async def _handler(_request: web.Request) -> web.Response:
+            return web.json_response(value())
+
+        return _handler
+
+    async def _start_blocks(self, _app: web.Application) -> None:
+        self._blocks = asyncio.ensure_future(self._produce_blocks())
+
+    async def _stop_blocks(self, _app: web.Application) -> None:
+        assert self._blocks is not None
+        self._blocks.cancel()
+        for subscriber in self._subscribers:
+            await subscriber.close()
+
+    async def _produce_blocks(self) -> None:
+        while True:
+            await asyncio.sleep(self.BLOCK_INTERVAL)
+            pending, self._pending = self._pending, list()
+            for tx_hash, apply in pending:
+                error = apply()
+                status = {"type": "success"} if error is None else {"type": "error", "description": error}
+                self._statuses[tx_hash] = {"type": "committed", "status": status}
+
+            for subscriber in list(self._subscribers):
+                await subscriber.send_str("{}")
+
+    async def _subscribe(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self._subscribers.append(websocket)
+        async for _ in websocket:
+            pass
+        self._subscribers.remove(websocket)
+        return websocket
+
+    async def _get_tx(self, request: web.Request) -> web.Response:
+        return web.json_response(self._statuses.get(request.query["hash"], {"type": "in-pool"}))
+
+    async def _post(self, request: web.Request) -> web.Response:
+        endpoint, data = request.match_info["endpoint"], await request.read()
+        self.requests.append((endpoint, data))
+        tx_hash = f"{endpoint}-{len(self.requests)}"
+        if endpoint == "deploy-artifact":
+            self._pending.append((tx_hash, lambda: self._deploy(data.decode())))
+        elif endpoint == "propose-config":
+            self._pending.append((tx_hash, lambda: self._apply_proposal(data)))
+        else:
+            return web.json_response({"error": "unsupported"}, status=400)
+
+        return web.json_response(tx_hash)
+
+    def _deploy(self, artifact: str) -> None:
+        runtime_id, name, version = artifact.split(":")
+        self.dispatcher["artifacts"].append({"runtime_id": int(runtime_id), "name": name, "version": version})
+
+    def _apply_proposal(self, data: bytes) -> Optional[str]:
+        proposal = _proposal_classes()[0].FromString(data)  # type: ignore
+        if proposal.configuration_number != self.configuration_number:
+            return f"Wrong configuration number {proposal.configuration_number}"
+
+        for change in proposal.changes:
+            artifact = next(artifact for artifact in self.dispatcher["artifacts"] if artifact["version"] == "0.2.0")
+            spec = {"id": 1025 + len(self.dispatcher["services"]), "name": change.data.decode(), "artifact": artifact}
+            self.dispatcher["services"].append({"spec": spec, "status": "active"})
+        self.configuration_number += 1
+
+        return None
+
+
+def _config(port: int) -> Configuration:
+    return Configuration(
+        {
+            "networks": [{"host": "127.0.0.1", "ssl": False, "public-api-port": port, "private-api-port": port}],
+            # Every instance is started by a separate proposal.
+            "max_proposal_size": 15,
+            "artifacts": {
+                "cryptocurrency": {
+                    "runtime": "rust",
+                    "name": "exonum-cryptocurrency",
+                    "version": "0.2.0",
+                    "action": "deploy",
+                },
+                "legacy": {"runtime": "rust", "name": "legacy", "version": "0.1.0", "action": "none"},
+            },
+            "instances": {"token-a": {"artifact": "cryptocurrency"}, "token-b": {"artifact": "cryptocurrency"}},
+        }
+    )
+
+
+def _encoder() -> MagicMock:
+    """Mocks the encoding of the supervisor requests."""
+    config_propose, config_change = _proposal_classes()
+
+    def create_config_change_request(
+        _consensus: Any, instances: List[Any], _loaders: List[Any], actual_from: int, configuration_number: int
+    ) -> Any:
+        proposal = config_propose(actual_from=actual_from, configuration_number=configuration_number)
+        for instance in instances:
+            proposal.changes.append(config_change(data=instance.name.encode()))
+        return proposal
+
+    encoder = MagicMock()
+    encoder.create_deploy_request.side_effect = lambda artifact, _: MagicMock(
+        SerializeToString=lambda: str(artifact).encode()
+    )
+    encoder.create_config_change_request.side_effect = create_config_change_request
+    return encoder
+
+
+def _run_on_node(node: FakeNode, scenario: Callable[["AsyncLauncher"], Awaitable[None]]) -> "AsyncLauncher":
+    """Runs the scenario with the launcher connected to the node (encoding of the requests is mocked)."""
+    return _run_on_nodes([node], scenario)[0]
+
+
+def _run_on_nodes(
+    nodes: List[FakeNode], scenario: Callable[["AsyncLauncher"], Awaitable[None]]
+) -> List["AsyncLauncher"]:
+    """Runs the scenario concurrently on one event loop, with a separate launcher for every node."""
+
+    async def run(node: FakeNode) -> AsyncLauncher:
+        server = TestServer(node.app)
+        await server.start_server()
+        try:
+            assert server.port is not None
+            launcher = AsyncLauncher(_config(server.port))
+            launcher._supervisor.encoder = _encoder()
+            await scenario(launcher)
+            return launcher
+        finally:
+            await server.close()
+
+    async def run_all() -> List[AsyncLauncher]:
+        return list(await asyncio.gather(*[run(node) for node in nodes]))
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+
+
+@unittest.skipUnless(web is not None, "aiohttp is not installed")
+class TestAsyncLauncher(unittest.TestCase):
+    def test_launch(self) -> None:
+        node = FakeNode()
+
+        async def launch(launcher: AsyncLauncher) -> None:
+            async with launcher:
+                await launcher.deploy_all()
+                await launcher.wait_for_deploy()
+                await launcher.start_all()
+                await launcher.wait_for_start()
+
+        launcher = _run_on_node(node, launch)
+
+        cryptocurrency = launcher.config.artifacts["cryptocurrency"]
+        self.assertEqual(launcher.launch_state.completed_deployments()[cryptocurrency][0], ActionResult.Success)
+        self.assertEqual(launcher.launch_state.get_completed_config_state(launcher.config), ActionResult.Success)
+        self.assertEqual(
+            [service["spec"]["name"] for service in node.dispatcher["services"][2:]], ["token-a", "token-b"]
+        )
+        # Only the artifacts marked for deploy are deployed, the proposal is split into two parts.
+        self.assertEqual(
+            [endpoint for endpoint, _ in node.requests], ["deploy-artifact", "propose-config", "propose-config"]
+        )
+        self.assertEqual(node.configuration_number, 2)
+
+    def test_concurrent_launches(self) -> None:
+        nodes = [FakeNode(), FakeNode()]
+
+        async def launch(launcher: AsyncLauncher) -> None:
+            async with launcher:
+                await launcher.deploy_all()
+                await launcher.wait_for_deploy()
+                await launcher.start_all()
+                await launcher.wait_for_start()
+
+        # Launchers are created and run in the same process and on the same event loop.
+        launchers = _run_on_nodes(nodes, launch)
+
+        for launcher, node in zip(launchers, nodes):
+            self.assertEqual(launcher.launch_state.get_completed_config_state(launcher.config), ActionResult.Success)
+            self.assertEqual(
+                [service["spec"]["name"] for service in node.dispatcher["services"][2:]], ["token-a", "token-b"]
+            )
+
+    def test_failed_request_is_reported(self) -> None:
+        async def deploy(launcher: AsyncLauncher) -> None:
+            # The second node is not available.
+            launcher._supervisor._clients.append(AsyncClient(launcher._pool, "127.0.0.1", 1, 1))
+
+            await launcher.deploy_all()
+            with self.assertRaises(SupervisorRequestError):
+                await launcher._supervisor.send_migration_request(MagicMock(SerializeToString=lambda: b""))
+
+            await launcher.close()
+
+        launcher = _run_on_node(FakeNode(), deploy)
+
+        cryptocurrency = launcher.config.artifacts["cryptocurrency"]
+        result, description = launcher.launch_state.completed_deployments()[cryptocurrency]
+        self.assertEqual(result, ActionResult.Fail)
+        self.assertIn("127.0.0.1:1", description)
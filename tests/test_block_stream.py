@@ -0,0 +1,149 @@
+# pylint: disable=missing-docstring, protected-access
+
+import queue
+import threading
+import time
+import unittest
+from typing import List, Optional
+
+from websocket import WebSocketConnectionClosedException
+
+from exonum_launcher.block_stream import BlockStream
+
+
+class FakeSubscriber:
+    """Subscriber which receives the events from the queue instead of the websocket."""
+
+    def __init__(self) -> None:
+        self.events: "queue.Queue[Optional[Exception]]" = queue.Queue()
+        self.connected = False
+
+    def connect(self) -> None:
+        self.connected = True
+
+    def wait_for_new_event(self) -> None:
+        event = self.events.get()
+        if event is not None:
+            raise event
+
+    def stop(self) -> None:
+        if self.connected:
+            self.connected = False
+            self.events.put(WebSocketConnectionClosedException("closed"))
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.subscribers: List[FakeSubscriber] = list()
+        self.created = threading.Event()
+
+    def create_subscriber(self, subscription_type: str) -> FakeSubscriber:
+        assert subscription_type == "blocks"
+        subscriber = FakeSubscriber()
+        self.subscribers.append(subscriber)
+        self.created.set()
+        return subscriber
+
+
+class TestBlockStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = FakeClient()
+        self.stream = BlockStream(self.client)  # type: ignore
+        self.stream.start()
+        self._wait_connected()
+
+    def tearDown(self) -> None:
+        self.stream.stop()
+
+    def _wait_connected(self) -> None:
+        self.assertTrue(self.client.created.wait(1.0))
+        self.client.created.clear()
+        deadline = time.monotonic() + 1.0
+        while not self.stream.is_connected():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_connect_is_not_a_block(self) -> None:
+        self.assertEqual(self.stream.latest(), 0)
+        self.assertEqual(self.stream.wait_for_block(0, timeout=0.1), 0)
+
+        self.client.subscribers[0].events.put(None)
+        self.assertEqual(self.stream.wait_for_block(0, timeout=1.0), 1)
+
+    def test_single_connection_for_many_waits(self) -> None:
+        subscriber = self.client.subscribers[0]
+        seen = self.stream.latest()
+        for _ in range(5):
+            subscriber.events.put(None)
+            seen = self.stream.wait_for_block(seen, timeout=1.0)
+
+        self.assertEqual(len(self.client.subscribers), 1)
+        self.assertEqual(self.stream.latest(), seen)
+
+    def test_block_is_not_missed_between_waits(self) -> None:
+        seen = self.stream.latest()
+        # Block is committed before the waiter starts waiting.
+        self.client.subscribers[0].events.put(None)
+        self.assertEqual(self.stream.wait_for_block(seen, timeout=1.0), seen + 1)
+
+    def test_fan_out_to_all_waiters(self) -> None:
+        seen = self.stream.latest()
+        results: "queue.Queue[int]" = queue.Queue()
+        waiters = [
+            threading.Thread(target=lambda: results.put(self.stream.wait_for_block(seen, timeout=1.0)))
+            for _ in range(3)
+        ]
+        for waiter in waiters:
+            waiter.start()
+
+        self.client.subscribers[0].events.put(None)
+        for waiter in waiters:
+            waiter.join()
+
+        self.assertEqual([results.get() for _ in waiters], [seen + 1] * 3)
+
+    def test_reconnect(self) -> None:
+        seen = self.stream.latest()
+        self.client.subscribers[0].events.put(WebSocketConnectionClosedException("dropped"))
+
+        # Waiters are woken up on reconnect, since blocks could be missed while the stream was disconnected.
+        self._wait_connected()
+        self.assertGreater(self.stream.wait_for_block(seen, timeout=1.0), seen)
+        self.assertEqual(len(self.client.subscribers), 2)
+        self.assertTrue(self.stream.is_connected())
+
+    def test_stopped_stream_is_not_restarted(self) -> None:
+        self.stream.stop()
+
+        with self.assertRaises(RuntimeError):
+            self.stream.wait_for_block(self.stream.latest(), timeout=0.1)
+        self.assertEqual(len(self.client.subscribers), 1)
+
+    def test_stop_during_connect(self) -> None:
+        self.stream.stop()
+
+        connecting, release = threading.Event(), threading.Event()
+
+        class SlowSubscriber(FakeSubscriber):
+            def connect(self) -> None:
+                connecting.set()
+                release.wait(1.0)
+                super().connect()
+
+        client = FakeClient()
+        subscriber = SlowSubscriber()
+        client.create_subscriber = lambda _subscription_type: subscriber  # type: ignore
+        stream = BlockStream(client)  # type: ignore
+        stream.start()
+        self.assertTrue(connecting.wait(1.0))
+        thread = stream._thread
+        assert thread is not None
+
+        # Stream is stopped before the connection is established, so the subscriber is stopped by the listener.
+        stopper = threading.Thread(target=stream.stop)
+        stopper.start()
+        release.set()
+        stopper.join()
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(subscriber.connected)
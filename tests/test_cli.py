@@ -0,0 +1,64 @@
+# pylint: disable=missing-docstring
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Modules which take most of the launcher startup time and are needed only to talk to the nodes.
+HEAVY_MODULES = ["exonum_client", "google.protobuf", "requests", "multiprocessing"]
+
+# Budget for importing the CLI module, in seconds. It's measured in a fresh interpreter, excluding its own startup.
+CLI_IMPORT_BUDGET = 0.1
+# Number of measurements, the fastest of which is checked against the budget.
+CLI_IMPORT_RUNS = 5
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{statements}
+elapsed = time.perf_counter() - start
+heavy = [module for module in {heavy!r} if module in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+def _run_imports(*statements: str) -> dict:
+    """Runs the statements in a fresh interpreter, returns the time spent and the heavy modules loaded."""
+    script = _IMPORT_SCRIPT.format(statements="\n".join(statements), heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, stdout=subprocess.PIPE, check=True).stdout
+
+    return json.loads(output.decode())
+
+
+class TestCliStartup(unittest.TestCase):
+    def test_cli_import_does_not_load_client(self) -> None:
+        result = _run_imports("import exonum_launcher.cli")
+
+        self.assertEqual(result["heavy"], [])
+
+    def test_cli_import_is_fast(self) -> None:
+        # The fastest of several runs is checked, so a cold disk cache or a busy machine doesn't fail the test.
+        # Without the heavy modules the import takes a fraction of the budget.
+        runs = [_run_imports("import exonum_launcher.cli") for _ in range(CLI_IMPORT_RUNS)]
+
+        self.assertLess(min(run["elapsed"] for run in runs), CLI_IMPORT_BUDGET)
+
+    def test_config_validation_does_not_load_client(self) -> None:
+        result = _run_imports(
+            "from exonum_launcher.main import load_config",
+            "load_config('tests/test_data/sample_config.yml')",
+            "load_config('tests/test_data/sharded/config.yml')",
+        )
+
+        self.assertEqual(result["heavy"], [])
+
+    def test_help(self) -> None:
+        output = subprocess.run(
+            [sys.executable, "-m", "exonum_launcher", "--help"], cwd=ROOT, stdout=subprocess.PIPE, check=True
+        ).stdout
+
+        self.assertIn(b"--input", output)
@@ -0,0 +1,55 @@
+# pylint: disable=missing-docstring
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from exonum_launcher.compiled_plan import MAGIC, PlanRecord, RecordKind, proposal_record, read_plan, write_plan
+from .test_supervisor import _proposal_classes
+
+
+class TestCompiledPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "launch.plan")
+
+    def test_write_and_read(self) -> None:
+        propose_class, change_class = _proposal_classes()
+        proposal = propose_class(actual_from=100, configuration_number=5)
+        proposal.changes.append(change_class(data=b"start"))
+
+        records = [
+            PlanRecord(RecordKind.Deploy, {"artifact": "0:exonum-cryptocurrency:0.1.0"}, b"deploy"),
+            PlanRecord(RecordKind.Migration, {"service": "xnm-token", "artifact": "0:a:1", "seed": 3}, b""),
+            proposal_record(RecordKind.Config, proposal),
+        ]
+        write_plan(self.path, records)
+
+        self.assertEqual(read_plan(self.path), records)
+
+        # Configuration number is not stored in the plan.
+        config_record = records[2]
+        self.assertEqual(config_record.meta, {"number_field": 3})
+        stored = propose_class.FromString(config_record.payload)
+        self.assertEqual((stored.configuration_number, stored.actual_from), (0, 100))
+        self.assertEqual(list(stored.changes), list(proposal.changes))
+
+    def test_invalid_plan(self) -> None:
+        with open(self.path, "wb") as plan_file:
+            plan_file.write(b"networks: []\n")
+        with self.assertRaises(ValueError):
+            read_plan(self.path)
+
+        write_plan(self.path, [PlanRecord(RecordKind.Deploy, {"artifact": "0:a:1"}, b"deploy")])
+        with open(self.path, "rb+") as plan_file:
+            plan_file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            read_plan(self.path)
+
+        # Plan without records is valid.
+        write_plan(self.path, list())
+        with open(self.path, "rb") as plan_file:
+            self.assertEqual(plan_file.read(), MAGIC)
+        self.assertEqual(read_plan(self.path), list())
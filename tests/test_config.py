@@ -4,7 +4,7 @@ import copy
 import os
 import unittest
 
-from exonum_launcher.configuration import Configuration
+from exonum_launcher.configuration import Artifact, Configuration, Instance, InstanceCollection, resolve_includes
 
 _RUNTIMES_START_STATE = copy.deepcopy(Configuration.runtimes())
 _DIR_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -30,7 +30,8 @@ class TestConfiguration(unittest.TestCase):
         self.assertEqual(Configuration.runtimes()["rust"], 0)
 
     def test_declare_runtime(self) -> None:
-        Configuration.declare_runtime("test", 2)
+        with self.assertWarns(DeprecationWarning):
+            Configuration.declare_runtime("test", 2)
 
         runtimes = Configuration.runtimes()
         self.assertTrue("rust" in runtimes)
@@ -80,9 +81,10 @@ class TestConfiguration(unittest.TestCase):
     def test_parse_runtimes(self) -> None:
         config = self.load_config("custom_runtimes.yml")
 
-        runtimes = config.runtimes()
         expected_layout = {"rust": 0, "example": 2, "other_example": 42}
-        self.assertEqual(runtimes, expected_layout)
+        self.assertEqual(config.runtime_ids, expected_layout)
+        # Runtimes declared in the config don't affect the default ones.
+        self.assertEqual(Configuration.runtimes(), {"rust": 0})
 
         self.assertTrue("cryptocurrency" in config.artifacts)
         self.assertTrue("other_cryptocurrency" in config.artifacts)
@@ -91,6 +93,20 @@ class TestConfiguration(unittest.TestCase):
         self.assertEqual(config.artifacts["other_cryptocurrency"].runtime, "other_example")
         self.assertEqual(config.artifacts["other_cryptocurrency"].runtime_id, 42)
 
+    def test_runtimes_are_scoped_to_config(self) -> None:
+        config_path = os.path.join(_DIR_PATH, "test_data", "custom_runtimes.yml")
+
+        # The same config can be parsed several times, and runtimes can differ between configs.
+        config = Configuration.from_yaml(config_path)
+        other_config = Configuration.from_yaml(config_path, runtimes={"rust": 0, "java": 1})
+
+        self.assertEqual(config.artifacts["cryptocurrency"].runtime_id, 2)
+        self.assertEqual(other_config.runtime_ids, {"rust": 0, "java": 1, "example": 2, "other_example": 42})
+        self.assertEqual(Configuration.with_runtimes({"java": 1}), {"rust": 0, "java": 1})
+
+        with self.assertRaises(ValueError):
+            Configuration.from_yaml(config_path, runtimes={"rust": 0, "example": 3})
+
     def test_parse_plugins(self) -> None:
         config = self.load_config("custom_plugins.yml")
 
@@ -115,3 +131,73 @@ class TestConfiguration(unittest.TestCase):
         self.assertEqual(len(config.consensus["validator_keys"]), 1)
         self.assertEqual(len(config.consensus["validator_keys"][0]), 2)
         self.assertEqual(config.consensus["first_round_timeout"], 100)
+
+    def test_parse_includes(self) -> None:
+        config = self.load_config(os.path.join("sharded", "config.yml"))
+
+        self.assertEqual(str(config.artifacts["cryptocurrency"]), "0:exonum-cryptocurrency:0.1.0")
+        self.assertEqual(config.artifacts["cryptocurrency"].deadline_height, 10000)
+        # Entries from the config go first, and then the entries of the included files in the alphabetical order.
+        self.assertEqual([instance.name for instance in config.instances], ["xnm-token", "nnm-token", "abc-token"])
+        self.assertEqual(config.instances[2].action, "stop")
+
+    def test_invalid_includes(self) -> None:
+        base_dir = os.path.join(_DIR_PATH, "test_data", "sharded")
+        data = {"instances": {"nnm-token": {"artifact": "cryptocurrency"}}}
+
+        with self.assertRaises(ValueError):
+            resolve_includes(dict(data, include={"instances": "instances/*.yml"}), base_dir)
+
+        with self.assertRaises(ValueError):
+            resolve_includes(dict(data, include={"networks": "networks.yml"}), base_dir)
+
+        with self.assertRaises(ValueError):
+            resolve_includes(dict(data, include={"artifacts": "instances/*.yml"}), base_dir, lambda _: ["not a map"])
+
+    def test_instance_collection(self) -> None:
+        config = self.load_config(os.path.join("sharded", "config.yml"))
+        instances = config.instances
+        artifact = config.artifacts["cryptocurrency"]
+        xnm_token, nnm_token, abc_token = instances
+
+        self.assertIsInstance(instances, InstanceCollection)
+        self.assertEqual(len(instances), 3)
+        self.assertEqual(instances[1:], [nnm_token, abc_token])
+        self.assertIs(instances.get("abc-token"), abc_token)
+        self.assertIsNone(instances.get("unknown"))
+        self.assertEqual(instances.by_artifact(artifact), [xnm_token, nnm_token, abc_token])
+        self.assertEqual(instances.by_action("start"), [xnm_token, nnm_token])
+        self.assertEqual(instances.by_action("freeze"), [])
+        self.assertEqual(instances.artifacts(), [artifact])
+        self.assertIn(nnm_token, instances)
+        self.assertIn(Instance(artifact, "nnm-token", "stop", None), instances)
+        self.assertNotIn(Instance(config.artifacts["cryptocurrency"], "unknown", "start", None), instances)
+
+        with self.assertRaises(ValueError):
+            instances.append(Instance(artifact, "nnm-token", "stop", None))
+
+    def test_value_types(self) -> None:
+        config = self.load_config("sample_config.yml")
+        other_config = self.load_config("sample_config.yml")
+        artifact = config.artifacts["cryptocurrency"]
+
+        # Artifacts and instances parsed from different configs are equal.
+        self.assertEqual(artifact, other_config.artifacts["cryptocurrency"])
+        self.assertEqual({artifact: "deployed"}[other_config.artifacts["cryptocurrency"]], "deployed")
+        self.assertEqual(config.instances[0], other_config.instances[0])
+        self.assertEqual(hash(config.instances[0]), hash(other_config.instances[0]))
+
+        # Only the identity is compared.
+        self.assertEqual(artifact, Artifact("exonum-cryptocurrency", "0.1.0", "rust", {"spec": 1}, "none"))
+        self.assertNotEqual(artifact, Artifact("exonum-cryptocurrency", "0.2.0", "rust", {}, "deploy"))
+        self.assertNotEqual(config.instances[0], config.instances[1])
+
+        # Identity can't be changed, while the other fields can.
+        with self.assertRaises(AttributeError):
+            artifact.name = "other"  # type: ignore
+        with self.assertRaises(AttributeError):
+            config.instances[0].artifact = artifact  # type: ignore
+        artifact.action = "none"
+        # Slots are used instead of the per-object dict.
+        self.assertFalse(hasattr(artifact, "__dict__"))
+        self.assertFalse(hasattr(config.instances[0], "__dict__"))
@@ -0,0 +1,108 @@
+# pylint: disable=missing-docstring
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+import yaml
+
+from exonum_launcher.config_cache import ConfigCache
+from exonum_launcher.configuration import parse_yaml
+
+CONFIG = {
+    "networks": [{"host": "127.0.0.1", "ssl": False, "public-api-port": 8080, "private-api-port": 8081}],
+    "runtimes": {"java": 1},
+    "artifacts": {"token": {"runtime": "java", "name": "token", "version": "0.1.0", "action": "deploy"}},
+    "instances": {"xnm-token": {"artifact": "token"}},
+}
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.cache = ConfigCache(os.path.join(self.dir, "cache"))
+        self.path = os.path.join(self.dir, "config.yml")
+
+    def _write_config(self, data: Dict[str, Any]) -> None:
+        with open(self.path, "w") as config_file:
+            yaml.safe_dump(data, config_file)
+
+    def test_config_is_cached(self) -> None:
+        self._write_config(CONFIG)
+        config = self.cache.load(self.path)
+        assert config is not None
+
+        with patch("exonum_launcher.config_cache.parse_yaml", wraps=parse_yaml) as parse_mock:
+            cached = self.cache.load(self.path)
+            assert cached is not None
+            parse_mock.assert_not_called()
+
+            self.assertEqual(cached.runtime_ids, {"rust": 0, "java": 1})
+            self.assertEqual(cached.networks, config.networks)
+            self.assertEqual(str(cached.artifacts["token"]), "1:token:0.1.0")
+            self.assertIs(cached.instances[0].artifact, cached.artifacts["token"])
+
+            # Config parsed with other runtimes is not taken from the cache.
+            other = self.cache.load(self.path, {"rust": 0, "python": 2})
+            assert other is not None
+            parse_mock.assert_called_once()
+            self.assertEqual(other.runtime_ids, {"rust": 0, "python": 2, "java": 1})
+
+            # Changed config is parsed again.
+            self._write_config(dict(CONFIG, actual_from=10))
+            changed = self.cache.load(self.path)
+            assert changed is not None
+            self.assertEqual(parse_mock.call_count, 2)
+            self.assertEqual(changed.actual_from, 10)
+
+    def test_broken_entry_is_ignored(self) -> None:
+        self._write_config(CONFIG)
+        self.cache.load(self.path)
+        for entry in os.listdir(self.cache.path):
+            with open(os.path.join(self.cache.path, entry), "wb") as entry_file:
+                entry_file.write(b"broken")
+
+        config = self.cache.load(self.path)
+
+        assert config is not None
+        self.assertEqual(str(config.artifacts["token"]), "1:token:0.1.0")
+
+    def test_network_groups_are_not_cached(self) -> None:
+        data = dict(CONFIG, network_groups={"staging": CONFIG["networks"]})
+        del data["networks"]
+        self._write_config(data)
+
+        self.assertIsNone(self.cache.load(self.path))
+        self.assertFalse(os.path.exists(self.cache.path))
+
+    def test_only_changed_shards_are_parsed(self) -> None:
+        os.makedirs(os.path.join(self.dir, "instances"))
+        data = dict(CONFIG, include={"instances": "instances/*.yml"})
+        del data["instances"]
+        self._write_config(data)
+        for shard in ("a", "b"):
+            with open(os.path.join(self.dir, "instances", f"{shard}.yml"), "w") as shard_file:
+                yaml.safe_dump({f"{shard}-token": {"artifact": "token"}}, shard_file)
+
+        self.cache.load(self.path)
+
+        # Unchanged config with unchanged shards is not parsed.
+        with patch("exonum_launcher.config_cache.parse_yaml", wraps=parse_yaml) as parse_mock:
+            config = self.cache.load(self.path)
+            assert config is not None
+            parse_mock.assert_not_called()
+            self.assertEqual([instance.name for instance in config.instances], ["a-token", "b-token"])
+
+        # New shard is parsed along with the config itself.
+        with open(os.path.join(self.dir, "instances", "c.yml"), "w") as shard_file:
+            yaml.safe_dump({"c-token": {"artifact": "token"}}, shard_file)
+
+        with patch("exonum_launcher.config_cache.parse_yaml", wraps=parse_yaml) as parse_mock:
+            config = self.cache.load(self.path)
+            assert config is not None
+            self.assertEqual(parse_mock.call_count, 2)
+            self.assertEqual([instance.name for instance in config.instances], ["a-token", "b-token", "c-token"])
@@ -0,0 +1,55 @@
+# pylint: disable=missing-docstring, protected-access
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from exonum_launcher.configuration import Artifact, Instance
+from exonum_launcher.instances import DefaultInstanceSpecLoader, InstanceSpecLoadError
+
+
+class TestDefaultInstanceSpecLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        DefaultInstanceSpecLoader.invalidate_cache()
+        self.addCleanup(DefaultInstanceSpecLoader.invalidate_cache)
+
+        self.artifact = Artifact("exonum-token", "0.1.0", "rust", {}, "deploy")
+        self.loader = MagicMock()
+
+        import_patch = patch("exonum_launcher.instances.default_spec_loader.ModuleManager.import_service_module")
+        self.import_service_module = import_patch.start()
+        self.addCleanup(import_patch.stop)
+
+        build_patch = patch("exonum_launcher.instances.default_spec_loader.build_encoder_function")
+        self.build_encoder_function = build_patch.start()
+        self.build_encoder_function.return_value = lambda config: repr(config).encode()
+        self.addCleanup(build_patch.stop)
+
+    def test_encoder_is_built_once_per_artifact(self) -> None:
+        for i in range(100):
+            instance = Instance(self.artifact, f"token-{i}", "start", {"name": i})
+            result = DefaultInstanceSpecLoader().load_spec(self.loader, instance)
+            self.assertEqual(result, repr({"name": i}).encode())
+
+        self.import_service_module.assert_called_once_with("exonum-token", "0.1.0", "service")
+        self.build_encoder_function.assert_called_once()
+
+    def test_invalidate_cache(self) -> None:
+        instance = Instance(self.artifact, "token", "start", {})
+        DefaultInstanceSpecLoader().load_spec(self.loader, instance)
+
+        DefaultInstanceSpecLoader.invalidate_cache(self.artifact)
+        DefaultInstanceSpecLoader().load_spec(self.loader, instance)
+
+        self.assertEqual(self.build_encoder_function.call_count, 2)
+
+    def test_load_error_is_not_cached(self) -> None:
+        instance = Instance(self.artifact, "token", "start", {})
+        self.import_service_module.side_effect = ImportError("not compiled")
+        self.loader.load_service_proto_files.side_effect = RuntimeError("not available")
+
+        with self.assertRaises(InstanceSpecLoadError):
+            DefaultInstanceSpecLoader().load_spec(self.loader, instance)
+
+        self.import_service_module.side_effect = None
+        DefaultInstanceSpecLoader().load_spec(self.loader, instance)
+        self.build_encoder_function.assert_called_once()
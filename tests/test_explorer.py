@@ -0,0 +1,143 @@
+# pylint: disable=missing-docstring, protected-access
+
+import unittest
+from typing import Dict, List, Tuple
+from unittest.mock import MagicMock
+
+from exonum_launcher.action_result import ActionResult
+from exonum_launcher.configuration import Artifact, Instance
+from exonum_launcher.explorer import Explorer, ExecutionFailError, NotCommittedError, TxStatus
+
+
+class FakeBlockStream:
+    """Block stream which produces a new block on every wait."""
+
+    def __init__(self) -> None:
+        self.height = 0
+
+    def start(self) -> None:
+        pass
+
+    def is_connected(self) -> bool:
+        return True
+
+    def latest(self) -> int:
+        return self.height
+
+    def wait_for_block(self, seen: int, _timeout: float) -> int:
+        self.height = seen + 1
+        return self.height
+
+
+def _mock_statuses(explorer: Explorer, committed_at: Dict[str, Tuple[int, TxStatus]]) -> List[str]:
+    """Mocks `get_tx_status`, so every tx is committed at the given height with the given status.
+    Returns a list which is filled with the checked tx hashes."""
+    checked: List[str] = list()
+
+    def get_tx_status(tx_hash: str) -> Tuple[TxStatus, str]:
+        checked.append(tx_hash)
+        height, status = committed_at[tx_hash]
+        if explorer._blocks.latest() < height:
+            return TxStatus.NotCommitted, "not committed"
+        return status, "OK" if status == TxStatus.Success else "error"
+
+    explorer.get_tx_status = get_tx_status  # type: ignore
+    return checked
+
+
+DISPATCHER_INFO = {
+    "artifacts": [
+        {"runtime_id": 0, "name": "exonum-supervisor", "version": "1.0.0"},
+        {"runtime_id": 0, "name": "exonum-cryptocurrency", "version": "0.1.0"},
+    ],
+    "services": [
+        {
+            "spec": {
+                "id": 0,
+                "name": "supervisor",
+                "artifact": {"runtime_id": 0, "name": "exonum-supervisor", "version": "1.0.0"},
+            },
+            "status": "active",
+        },
+        {
+            "spec": {
+                "id": 1024,
+                "name": "xnm-token",
+                "artifact": {"runtime_id": 0, "name": "exonum-cryptocurrency", "version": "0.1.0"},
+            },
+            "status": "active",
+        },
+    ],
+}
+
+
+class TestExplorer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = MagicMock()
+        self.client.public_api.available_services.return_value.json.return_value = DISPATCHER_INFO
+        self.explorer = Explorer(self.client)
+        self.explorer._blocks = FakeBlockStream()  # type: ignore
+
+    def test_dispatcher_lookups(self) -> None:
+        deployed = Artifact("exonum-cryptocurrency", "0.1.0", "rust", {}, "none")
+        not_deployed = Artifact("exonum-cryptocurrency", "0.2.0", "rust", {}, "none")
+
+        self.assertTrue(self.explorer.is_deployed(deployed))
+        self.assertFalse(self.explorer.is_deployed(not_deployed))
+        self.assertEqual(self.explorer.get_instance_id(Instance(deployed, "xnm-token", "start", None)), 1024)
+        self.assertIsNone(self.explorer.get_instance_id(Instance(deployed, "nnm-token", "start", None)))
+
+    def test_dispatcher_state_is_cached_per_block(self) -> None:
+        available_services = self.client.public_api.available_services
+
+        first = self.explorer.dispatcher_state()
+        self.assertIs(self.explorer.dispatcher_state(), first)
+        self.assertEqual(available_services.call_count, 1)
+
+        self.explorer._blocks.wait_for_block(self.explorer._blocks.latest(), 0)
+        self.assertIsNot(self.explorer.dispatcher_state(), first)
+        self.assertEqual(available_services.call_count, 2)
+
+    def test_wait_for_deploys(self) -> None:
+        deployed = Artifact("exonum-cryptocurrency", "0.1.0", "rust", {}, "none")
+        not_deployed = Artifact("exonum-cryptocurrency", "0.2.0", "rust", {}, "none")
+        self.explorer.DEPLOY_TIMEOUT = 0.0
+
+        results = self.explorer.wait_for_deploys([deployed, not_deployed])
+
+        self.assertEqual(results, {deployed: ActionResult.Success, not_deployed: ActionResult.Fail})
+
+    def test_wait_for_tx_statuses(self) -> None:
+        checked = _mock_statuses(
+            self.explorer,
+            {"a": (0, TxStatus.Success), "b": (2, TxStatus.Error), "c": (3, TxStatus.Success)},
+        )
+
+        statuses = self.explorer.wait_for_tx_statuses(["a", "b", "c"])
+
+        self.assertEqual(statuses["a"], (TxStatus.Success, "OK"))
+        self.assertEqual(statuses["b"], (TxStatus.Error, "error"))
+        self.assertEqual(statuses["c"], (TxStatus.Success, "OK"))
+        # Whole set is resolved in the time of the slowest tx.
+        self.assertEqual(self.explorer._blocks.latest(), 3)
+        # Committed txs are not checked again.
+        self.assertEqual(checked.count("a"), 1)
+        self.assertEqual(checked.count("b"), 3)
+        self.assertEqual(checked.count("c"), 4)
+
+    def test_wait_for_tx_statuses_not_committed(self) -> None:
+        _mock_statuses(self.explorer, {"a": (0, TxStatus.Success), "b": (100, TxStatus.Success)})
+
+        statuses = self.explorer.wait_for_tx_statuses(["a", "b"])
+
+        self.assertEqual(statuses["a"][0], TxStatus.Success)
+        self.assertEqual(statuses["b"][0], TxStatus.NotCommitted)
+
+    def test_wait_for_txs_raises_errors(self) -> None:
+        _mock_statuses(self.explorer, {"a": (0, TxStatus.Error), "b": (100, TxStatus.Success)})
+
+        with self.assertRaises(ExecutionFailError):
+            self.explorer.wait_for_txs(["a", "b"])
+
+        with self.assertRaises(NotCommittedError):
+            self.explorer.wait_for_txs(["b"])
@@ -0,0 +1,87 @@
+# pylint: disable=missing-docstring, protected-access
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict
+
+import yaml
+
+from exonum_launcher.configuration import Artifact, Configuration, Instance
+from exonum_launcher.fleet import LaunchResult, format_fleet_results, load_fleet, run_fleet
+
+
+def _launch(data: Dict[Any, Any], _args: Any) -> Dict[str, Any]:
+    """Launch function run in the worker processes, it must be importable."""
+    network = data["networks"][0]["host"]
+    print(f"launching on {network}")
+    if network == "broken":
+        raise RuntimeError("network is down")
+
+    artifact = Artifact("token", "0.1.0", "java", {}, "deploy", runtimes=Configuration.with_runtimes({"java": 1}))
+    instance = Instance(artifact, "token", "start", None)
+    return {"artifacts": {artifact: "success"}, "instances": {instance: 1024}}
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _write_config(self, name: str, data: Dict[str, Any]) -> str:
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as config_file:
+            yaml.safe_dump(data, config_file)
+        return path
+
+    def test_load_fleet(self) -> None:
+        single = self._write_config("single.yml", {"networks": [{"host": "a"}], "actual_from": 5})
+        groups = self._write_config(
+            "groups.yml", {"network_groups": {"staging": [{"host": "b"}], "test": [{"host": "c"}]}, "actual_from": 7}
+        )
+
+        launches = load_fleet([single, groups])
+
+        self.assertEqual(
+            launches,
+            [
+                (single, {"networks": [{"host": "a"}], "actual_from": 5}),
+                (f"{groups}:staging", {"networks": [{"host": "b"}], "actual_from": 7}),
+                (f"{groups}:test", {"networks": [{"host": "c"}], "actual_from": 7}),
+            ],
+        )
+
+        both = self._write_config("both.yml", {"networks": [], "network_groups": {}})
+        with self.assertRaises(ValueError):
+            load_fleet([both])
+
+    def test_run_fleet(self) -> None:
+        launches = [(f"net-{i}", {"networks": [{"host": f"host-{i}"}]}) for i in range(3)]
+        launches.insert(1, ("net-broken", {"networks": [{"host": "broken"}]}))
+
+        results = run_fleet(launches, _launch, None, workers=2)
+
+        self.assertEqual([result.name for result in results], ["net-0", "net-broken", "net-1", "net-2"])
+        self.assertEqual(
+            results[0],
+            LaunchResult("net-0", {"1:token:0.1.0": "success"}, {"token": 1024}, "", "launching on host-0\n"),
+        )
+        self.assertEqual(results[1].error, "RuntimeError: network is down")
+        self.assertEqual(results[1].output, "launching on broken\n")
+        self.assertTrue(all(not result.error for result in results[2:]))
+
+    def test_format_fleet_results(self) -> None:
+        results = [
+            LaunchResult("staging", {"0:a:1": "success", "0:b:1": "error"}, {"a": 1024, "b": None}, "", ""),
+            LaunchResult("test", dict(), dict(), "RuntimeError: network is down", ""),
+        ]
+
+        self.assertEqual(
+            format_fleet_results(results).splitlines(),
+            [
+                "NETWORK  DEPLOYED  STARTED  RESULT",
+                "staging  1/2       1/2      OK",
+                "test     0/0       0/0      RuntimeError: network is down",
+            ],
+        )
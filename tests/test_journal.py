@@ -0,0 +1,69 @@
+# pylint: disable=missing-docstring, protected-access
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from exonum_launcher.action_result import ActionResult
+from exonum_launcher.journal import Journal
+from exonum_launcher.launch_state import LaunchState
+from . import test_config
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "journal.jsonl")
+
+    def test_incomplete_record_is_dropped(self) -> None:
+        with Journal(self.path) as journal:
+            journal.append({"event": "first"})
+
+        # The process died while writing the second record.
+        with open(self.path, "a", encoding="utf-8") as journal_file:
+            journal_file.write('{"event": "sec')
+
+        self.assertEqual(Journal.read(self.path), [{"event": "first"}])
+
+        journal = Journal(self.path)
+        journal.append({"event": "third"})
+        journal.close()
+
+        self.assertEqual(Journal.read(self.path), [{"event": "first"}, {"event": "third"}])
+
+        # New launch starts with an empty journal.
+        Journal(self.path, truncate=True).close()
+        self.assertEqual(Journal.read(self.path), [])
+
+    def test_launch_state_is_restored(self) -> None:
+        config = test_config.TestConfiguration.load_config("sample_config.yml")
+        deployed, pending = config.artifacts.values()
+
+        journal = Journal(self.path)
+        state = LaunchState(journal)
+        state.add_pending_deploy(deployed, ["deploy-1"])
+        state.add_pending_deploy(pending, ["deploy-2"])
+        state.complete_deploy(deployed, ActionResult.Success, "deployed successfully")
+        state.add_pending_migration(("token", deployed, 42), ["migrate-1"])
+        state.add_pending_migration(("wallet", deployed, 7), ["migrate-2"])
+        state.complete_migration("wallet", (ActionResult.Fail, "error"))
+        state.add_pending_unload(["unload-1"])
+        state.unload_status = ActionResult.Success, "OK"
+        state.add_pending_config(config, ["config-1"])
+        journal.close()
+
+        # State is restored for the freshly loaded config.
+        config = test_config.TestConfiguration.load_config("sample_config.yml")
+        deployed, pending = config.artifacts.values()
+        restored = LaunchState()
+        restored.restore(Journal.read(self.path), config)
+
+        self.assertEqual(restored.pending_deployments(), {pending: ["deploy-2"]})
+        self.assertEqual(restored.completed_deployments(), {deployed: (ActionResult.Success, "deployed successfully")})
+        self.assertEqual(restored.pending_migrations(), {("token", deployed, 42): ["migrate-1"]})
+        self.assertEqual(restored.completed_migrations(), {"wallet": (ActionResult.Fail, "error")})
+        self.assertEqual(restored.pending_unloads(), ["unload-1"])
+        self.assertEqual(restored.unload_status, (ActionResult.Success, "OK"))
+        self.assertEqual(restored.pending_configs(), {config: ["config-1"]})
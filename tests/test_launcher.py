@@ -1,16 +1,21 @@
 # pylint: disable=missing-docstring, protected-access, no-self-use
 
 import unittest
-from unittest.mock import call, MagicMock
+from unittest.mock import call, patch, MagicMock
 
 from requests import Response
 
 from exonum_launcher.action_result import ActionResult
+from exonum_launcher.compiled_plan import PlanRecord, RecordKind
+from exonum_launcher.configuration import Configuration
+from exonum_launcher.explorer import TxStatus
 from exonum_launcher.launcher import Launcher
 from exonum_launcher.runtimes.rust import RustSpecLoader
 from exonum_launcher.supervisor import Supervisor
 from .spec_loaders import TestInstanceSpecLoader, TestRuntimeSpecLoader
 from .test_config import TestConfiguration
+from .test_explorer import FakeBlockStream
+from .test_supervisor import _proposal_classes
 
 
 class MockDefaultInstanceSpecLoader:
@@ -45,6 +50,23 @@ class TestLauncher(unittest.TestCase):
             schema = "https" if network["ssl"] else "http"
             self.assertEqual(launcher.clients[i].schema, schema)
 
+    def test_clients_share_connection_pool(self) -> None:
+        """Tests that all the clients send requests through the launcher connection pool."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        launcher = Launcher(config)
+        pool = launcher._pool
+
+        for client in launcher.clients:
+            self.assertIs(client.pool, pool)
+            self.assertEqual(client.public_api.get, pool.get)
+            self.assertEqual(client.private_api.post, pool.post)
+            self.assertEqual(client.service_private_api("supervisor").post, pool.post)
+            self.assertEqual(client.protobuf_provider._fallback[0].get, pool.get)  # type: ignore
+
+        # Connections are kept per host.
+        self.assertIs(pool.session("http://127.0.0.1:8080/api/a"), pool.session("http://127.0.0.1:8080/api/b"))
+        self.assertIsNot(pool.session("http://127.0.0.1:8080/api"), pool.session("http://127.0.0.1:8081/api"))
+
     def test_initialize(self) -> None:
         """Tests that on initialize launcher initializes Supervisor and verifies clients."""
         config = TestConfiguration.load_config("sample_config.yml")
@@ -56,6 +78,7 @@ class TestLauncher(unittest.TestCase):
 
         # Setup mocks.
         launcher._supervisor.initialize = MagicMock(return_value=None)  # type: ignore
+        launcher._explorer.initialize = MagicMock(return_value=None)  # type: ignore
         for client in launcher.clients:
             client.private_api.get_stats = MagicMock(return_value=response)
 
@@ -64,6 +87,7 @@ class TestLauncher(unittest.TestCase):
 
         # Check that expected methods are called
         launcher._supervisor.initialize.assert_called()  # type: ignore
+        launcher._explorer.initialize.assert_called()  # type: ignore
         for client in launcher.clients:
             client.private_api.get_stats.assert_called()
 
@@ -78,6 +102,7 @@ class TestLauncher(unittest.TestCase):
 
         # Setup init mocks.
         launcher._supervisor.initialize = MagicMock(return_value=None)  # type: ignore
+        launcher._explorer.initialize = MagicMock(return_value=None)  # type: ignore
         for client in launcher.clients:
             client.private_api.get_stats = MagicMock(return_value=response)
 
@@ -135,6 +160,29 @@ class TestLauncher(unittest.TestCase):
         self.assertEqual(type(launcher._runtime_plugins["rust"]), RustSpecLoader)
         self.assertEqual(type(launcher._runtime_plugins["sample3"]), TestRuntimeSpecLoader)
 
+    def test_entry_point_plugins(self) -> None:
+        """Tests that plugins from the entry points are loaded on the first use and can be overridden by the config."""
+        config = TestConfiguration.load_config("custom_plugins_runtime_only.yml")
+        discovered = {
+            "exonum_launcher.runtimes": {"sample3": "tests.missing:SpecLoader", "other": "tests.missing:SpecLoader"},
+            "exonum_launcher.instances": {"cryptocurrency": "tests.spec_loaders:TestInstanceSpecLoader"},
+        }
+
+        with patch("exonum_launcher.plugins.discover", side_effect=discovered.get):
+            launcher = Launcher(config)
+
+        cryptocurrency = config.artifacts["cryptocurrency"]
+        self.assertEqual(launcher._artifact_plugins.loaded(), {})
+        self.assertEqual(type(launcher._artifact_plugins[cryptocurrency]), TestInstanceSpecLoader)
+        # The config plugin takes precedence over the discovered one.
+        self.assertEqual(type(launcher._runtime_plugins["sample3"]), TestRuntimeSpecLoader)
+        with self.assertRaises(RuntimeError):
+            _ = launcher._runtime_plugins["other"]
+
+        launcher.add_runtime_spec_loader("other", RustSpecLoader())
+        with self.assertRaises(ValueError):
+            launcher.add_runtime_spec_loader("sample3", RustSpecLoader())
+
     def test_deploy_all(self) -> None:
         """Tests that deploy method uses supervisor to deploy all artifacts from config."""
         config = TestConfiguration.load_config("sample_config.yml")
@@ -169,6 +217,101 @@ class TestLauncher(unittest.TestCase):
             else:
                 self.assertTrue(artifact not in launcher.launch_state._pending_deployments)
 
+    def test_wait_for_deploy(self) -> None:
+        """Tests that transactions and deploy status of all the artifacts are awaited at once."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        launcher = Launcher(config)
+        deployed = config.artifacts["cryptocurrency"]
+        failed = config.artifacts["should_not_be_deployed"]
+
+        launcher.launch_state.add_pending_deploy(deployed, ["a1", "a2"])
+        launcher.launch_state.add_pending_deploy(failed, ["b1", "b2"])
+
+        # Mock methods.
+        statuses = {
+            "a1": (TxStatus.Success, "OK"),
+            "a2": (TxStatus.Success, "OK"),
+            "b1": (TxStatus.Success, "OK"),
+            "b2": (TxStatus.Error, "error"),
+        }
+        launcher._explorer.wait_for_tx_statuses = MagicMock(return_value=statuses)  # type: ignore
+        launcher._explorer.wait_for_deploys = MagicMock(return_value={deployed: ActionResult.Success})  # type: ignore
+
+        launcher.wait_for_deploy()
+
+        launcher._explorer.wait_for_tx_statuses.assert_called_once_with(["a1", "a2", "b1", "b2"])  # type: ignore
+        launcher._explorer.wait_for_deploys.assert_called_once_with([deployed])  # type: ignore
+
+        completed = launcher.launch_state.completed_deployments()
+        self.assertEqual(completed[deployed], (ActionResult.Success, "deployed successfully"))
+        self.assertEqual(completed[failed], (ActionResult.Fail, "Tx [b2] was committed with error: error"))
+        self.assertEqual(launcher.launch_state.pending_deployments(), dict())
+
+    def test_wait_for_migration(self) -> None:
+        """Tests that the states of all the unfinished migrations are requested once per block."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        launcher = Launcher(config)
+        artifact = config.artifacts["cryptocurrency"]
+        for service in ("succeed", "failed", "not-committed"):
+            launcher.launch_state.add_pending_migration((service, artifact, 1), [f"{service}-tx"])
+
+        statuses = {
+            "succeed-tx": (TxStatus.Success, "OK"),
+            "failed-tx": (TxStatus.Success, "OK"),
+            "not-committed-tx": (TxStatus.NotCommitted, "not committed"),
+        }
+        launcher._explorer.wait_for_tx_statuses = MagicMock(return_value=statuses)  # type: ignore
+        blocks = FakeBlockStream()
+        launcher._explorer._blocks = blocks  # type: ignore
+
+        def get_migration_state(service: str, _artifact: object, _seed: int) -> dict:
+            if service == "failed":
+                return {"state": {"failed": {"error": {"description": "migration error"}}}}
+            return {"state": "succeed"} if blocks.height >= 2 else {"state": "pending"}
+
+        launcher._supervisor.get_migration_state = MagicMock(side_effect=get_migration_state)  # type: ignore
+
+        launcher.wait_for_migration()
+
+        self.assertEqual(
+            launcher.launch_state.completed_migrations(),
+            {
+                "succeed": (ActionResult.Success, "Success"),
+                "failed": (ActionResult.Fail, "migration error"),
+                "not-committed": (ActionResult.Fail, "Tx [not-committed-tx] was not committed"),
+            },
+        )
+        # Finished migrations are not requested again.
+        requested = [args[0] for args, _ in launcher._supervisor.get_migration_state.call_args_list]  # type: ignore
+        self.assertEqual(sorted(requested), ["failed", "succeed", "succeed", "succeed"])
+
+    def test_recover(self) -> None:
+        """Tests that the operations restored from the journal are awaited instead of being sent again."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        launcher = Launcher(config)
+        artifact = config.artifacts["cryptocurrency"]
+        launcher.launch_state.restore(
+            [
+                {"event": "pending_deploy", "artifact": str(artifact), "txs": ["deploy-tx"]},
+                {"event": "pending_config", "txs": ["config-tx"]},
+            ],
+            config,
+        )
+
+        statuses = {"deploy-tx": (TxStatus.Success, "OK"), "config-tx": (TxStatus.Success, "OK")}
+        launcher._explorer.wait_for_tx_statuses = MagicMock(side_effect=lambda txs: statuses)  # type: ignore
+        launcher._explorer.wait_for_deploys = MagicMock(return_value={artifact: ActionResult.Success})  # type: ignore
+        launcher._supervisor.send_deploy_request = MagicMock()  # type: ignore
+        launcher._supervisor.send_propose_config_request = MagicMock()  # type: ignore
+
+        launcher.recover()
+
+        launcher._explorer.wait_for_tx_statuses.assert_has_calls([call(["deploy-tx"]), call(["config-tx"])])  # type: ignore
+        launcher._supervisor.send_deploy_request.assert_not_called()  # type: ignore
+        launcher._supervisor.send_propose_config_request.assert_not_called()  # type: ignore
+        self.assertEqual(launcher.launch_state.completed_deployments()[artifact][0], ActionResult.Success)
+        self.assertEqual(launcher.launch_state.get_completed_config_state(config), ActionResult.Success)
+
     def test_start_all(self) -> None:
         """Tests that start method uses supervisor to start all services from the config."""
         config = TestConfiguration.load_config("sample_config.yml")
@@ -191,6 +334,7 @@ class TestLauncher(unittest.TestCase):
         # Mock methods.
         launcher._supervisor.create_config_change_request = MagicMock(return_value=b"123")  # type: ignore
         launcher._supervisor.send_propose_config_request = MagicMock(return_value=["123"])  # type: ignore
+        launcher._supervisor.split_config_proposal = MagicMock(side_effect=lambda proposal, _: [proposal])  # type: ignore
 
         # Call start.
         launcher.start_all()
@@ -199,5 +343,189 @@ class TestLauncher(unittest.TestCase):
         launcher._supervisor.create_config_change_request.assert_has_calls(start_calls_sequence)  # type: ignore
         launcher._supervisor.send_propose_config_request.assert_has_calls(send_calls_sequence)  # type: ignore
 
+        launcher._supervisor.split_config_proposal.assert_called_once_with(  # type: ignore
+            b"123", config.max_proposal_size
+        )
+
         # Check that results were added to the pending configs.
         self.assertEqual(launcher.launch_state._pending_configs[launcher.config], ["123"])
+
+    def test_start_all_skips_instances_of_failed_artifacts(self) -> None:
+        """Tests that instances of the skipped artifacts are excluded along with their spec loaders."""
+        artifact = {"runtime": "rust", "version": "0.1.0", "action": "deploy"}
+        config = Configuration(
+            {
+                "networks": [{"host": "127.0.0.1", "ssl": False, "public-api-port": 8080, "private-api-port": 8081}],
+                "artifacts": {"failed": dict(artifact, name="failed"), "deployed": dict(artifact, name="deployed")},
+                "instances": {"failed-1": {"artifact": "failed"}, "deployed-1": {"artifact": "deployed"}},
+                "plugins": {"artifact": {"deployed": "tests.spec_loaders.TestInstanceSpecLoader"}},
+            }
+        )
+        launcher = Launcher(config)
+        deployed_1 = config.instances.get("deployed-1")
+
+        launcher._supervisor.create_config_change_request = MagicMock()  # type: ignore
+        launcher._supervisor.split_config_proposal = MagicMock(return_value=[MagicMock(configuration_number=1)])  # type: ignore
+        launcher._supervisor.send_propose_config_request = MagicMock(return_value=["tx"])  # type: ignore
+        launcher._supervisor.complete_proposal = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_txs = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_start = MagicMock(return_value=ActionResult.Success)  # type: ignore
+
+        launcher.start_all([config.artifacts["failed"]])
+        launcher.wait_for_start()
+
+        instances, loaders = launcher._supervisor.create_config_change_request.call_args[0][1:3]  # type: ignore
+        self.assertEqual(instances, [deployed_1])
+        self.assertEqual([type(loader) for loader in loaders], [TestInstanceSpecLoader])
+        launcher._explorer.wait_for_start.assert_called_once_with(deployed_1)  # type: ignore
+
+    def test_split_proposal_is_sent_sequentially(self) -> None:
+        """Tests that parts of the split proposal are sent one after another once the previous one is applied."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        launcher = Launcher(config)
+
+        parts = [MagicMock(configuration_number=5), MagicMock(configuration_number=6)]
+        launcher._supervisor.create_config_change_request = MagicMock()  # type: ignore
+        launcher._supervisor.split_config_proposal = MagicMock(return_value=list(parts))  # type: ignore
+        launcher._supervisor.send_propose_config_request = MagicMock(side_effect=[["tx-1"], ["tx-2"]])  # type: ignore
+        launcher._supervisor.wait_for_configuration = MagicMock(return_value=True)  # type: ignore
+        launcher._supervisor.complete_proposal = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_txs = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_start = MagicMock(return_value=ActionResult.Success)  # type: ignore
+
+        launcher.start_all()
+        launcher._supervisor.send_propose_config_request.assert_called_once_with(parts[0])  # type: ignore
+
+        launcher.wait_for_start()
+
+        launcher._supervisor.send_propose_config_request.assert_has_calls([call(parts[0]), call(parts[1])])  # type: ignore
+        launcher._supervisor.wait_for_configuration.assert_called_once_with(6)  # type: ignore
+        launcher._explorer.wait_for_txs.assert_has_calls([call(["tx-1"]), call(["tx-2"])])  # type: ignore
+        self.assertEqual(launcher.launch_state.get_completed_config_state(config), ActionResult.Success)
+
+    def test_stream_start(self) -> None:
+        """Tests that instances are started as soon as their artifacts are deployed."""
+        artifact = {"runtime": "rust", "version": "0.1.0", "action": "deploy"}
+        config = Configuration(
+            {
+                "networks": [{"host": "127.0.0.1", "ssl": False, "public-api-port": 8080, "private-api-port": 8081}],
+                "artifacts": {"fast": dict(artifact, name="fast"), "slow": dict(artifact, name="slow")},
+                "instances": {
+                    "fast-1": {"artifact": "fast"},
+                    "slow-1": {"artifact": "slow"},
+                    "slow-2": {"artifact": "slow"},
+                },
+            }
+        )
+        fast, slow = config.artifacts["fast"], config.artifacts["slow"]
+        fast_1, slow_1, slow_2 = config.instances
+        launcher = Launcher(config)
+        launcher.launch_state.add_pending_deploy(fast, ["fast-tx"])
+        launcher.launch_state.add_pending_deploy(slow, ["slow-tx"])
+
+        # Fast artifact is deployed right away, slow artifact is deployed at the height 2.
+        blocks = FakeBlockStream()
+        launcher._explorer._blocks = blocks  # type: ignore
+        dispatcher_state = MagicMock()
+        dispatcher_state.is_deployed.side_effect = lambda artifact: artifact == fast or blocks.height >= 2
+        launcher._explorer.dispatcher_state = MagicMock(return_value=dispatcher_state)  # type: ignore
+
+        # Mock methods.
+        proposals = [MagicMock(configuration_number=1), MagicMock(configuration_number=2)]
+        launcher._supervisor.create_config_change_request = MagicMock(side_effect=proposals)  # type: ignore
+        launcher._supervisor.split_config_proposal = MagicMock(side_effect=lambda proposal, _: [proposal])  # type: ignore
+        launcher._supervisor.send_propose_config_request = MagicMock(side_effect=[["tx-1"], ["tx-2"]])  # type: ignore
+        launcher._supervisor.wait_for_configuration = MagicMock(return_value=True)  # type: ignore
+        launcher._supervisor.complete_proposal = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_txs = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_start = MagicMock(return_value=ActionResult.Success)  # type: ignore
+
+        launcher.stream_start()
+
+        loader = MockDefaultInstanceSpecLoader()
+        launcher._supervisor.create_config_change_request.assert_has_calls(  # type: ignore
+            [call(None, [fast_1], [loader], config.actual_from), call(None, [slow_1, slow_2], [loader, loader], 0)]
+        )
+        launcher._supervisor.send_propose_config_request.assert_has_calls([call(proposals[0]), call(proposals[1])])  # type: ignore
+        # The second proposal is sent only after the first one is applied.
+        launcher._supervisor.wait_for_configuration.assert_called_once_with(2)  # type: ignore
+        launcher._explorer.wait_for_start.assert_has_calls([call(fast_1), call(slow_1), call(slow_2)])  # type: ignore
+        self.assertEqual(launcher.launch_state.get_completed_config_state(config), ActionResult.Success)
+
+    def test_compile(self) -> None:
+        """Tests that the requests are encoded in the order of the launch stages."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        config.artifacts["should_not_be_deployed"].action = "unload"
+        launcher = Launcher(config)
+        artifact = config.artifacts["cryptocurrency"]
+        propose_class, change_class = _proposal_classes()
+
+        launcher._supervisor.create_deploy_request = MagicMock(  # type: ignore
+            return_value=MagicMock(SerializeToString=MagicMock(return_value=b"deploy"))
+        )
+        launcher._supervisor.create_unload_request = MagicMock(  # type: ignore
+            return_value=propose_class(configuration_number=5, changes=[change_class(data=b"unload")])
+        )
+        launcher._supervisor.create_config_change_request = MagicMock(  # type: ignore
+            return_value=propose_class(configuration_number=5, changes=[change_class(data=b"start")])
+        )
+        launcher._supervisor.split_config_proposal = MagicMock(side_effect=lambda proposal, _: [proposal])  # type: ignore
+
+        records = launcher.compile()
+
+        self.assertEqual([record.kind for record in records], [RecordKind.Deploy, RecordKind.Unload, RecordKind.Config])
+        self.assertEqual(records[0], PlanRecord(RecordKind.Deploy, {"artifact": str(artifact)}, b"deploy"))
+        self.assertEqual(propose_class.FromString(records[2].payload).changes[0].data, b"start")
+        self.assertEqual(propose_class.FromString(records[2].payload).configuration_number, 0)
+
+    def test_apply_compiled(self) -> None:
+        """Tests that the compiled requests are sent without encoding and awaited stage by stage."""
+        config = TestConfiguration.load_config("sample_config.yml")
+        launcher = Launcher(config)
+        artifact = config.artifacts["cryptocurrency"]
+        records = [
+            PlanRecord(RecordKind.Deploy, {"artifact": str(artifact)}, b"deploy"),
+            PlanRecord(RecordKind.Config, {"number_field": 3}, b"part-1"),
+            PlanRecord(RecordKind.Config, {"number_field": 3}, b"part-2"),
+        ]
+
+        # Mock methods.
+        launcher._supervisor.send_compiled_request = MagicMock(return_value=["deploy-tx"])  # type: ignore
+        launcher._supervisor.send_compiled_config_proposal = MagicMock(  # type: ignore
+            side_effect=[(["tx-1"], 5), (["tx-2"], 6)]
+        )
+        launcher._supervisor.wait_for_configuration = MagicMock(return_value=True)  # type: ignore
+        launcher._supervisor.complete_proposal = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_tx_statuses = MagicMock(  # type: ignore
+            return_value={"deploy-tx": (TxStatus.Success, "OK")}
+        )
+        launcher._explorer.wait_for_deploys = MagicMock(return_value={artifact: ActionResult.Success})  # type: ignore
+        launcher._explorer.wait_for_txs = MagicMock()  # type: ignore
+        launcher._explorer.wait_for_start = MagicMock(return_value=ActionResult.Success)  # type: ignore
+
+        launcher.apply_compiled(records)
+
+        launcher._supervisor.send_compiled_request.assert_called_once_with("deploy-artifact", b"deploy")  # type: ignore
+        launcher._supervisor.send_compiled_config_proposal.assert_has_calls(  # type: ignore
+            [call(b"part-1", 3), call(b"part-2", 3)]
+        )
+        # The second part is sent only after the first one is applied.
+        launcher._supervisor.wait_for_configuration.assert_called_once_with(6)  # type: ignore
+        launcher._explorer.wait_for_txs.assert_has_calls([call(["tx-1"]), call(["tx-2"])])  # type: ignore
+        self.assertEqual(launcher.launch_state.completed_deployments()[artifact][0], ActionResult.Success)
+        self.assertEqual(launcher.launch_state.get_completed_config_state(config), ActionResult.Success)
+
+        # Plans which don't match the config are rejected before sending anything.
+        with self.assertRaises(ValueError):
+            launcher.apply_compiled([records[0], PlanRecord(RecordKind.Deploy, {"artifact": "0:unknown:1.0.0"}, b"")])
+        launcher._supervisor.send_compiled_request.assert_called_once()  # type: ignore
+
+
+class TestLaunchersInOneProcess(unittest.TestCase):
+    def test_creation(self) -> None:
+        """Tests that several launchers can be created in one process, since they share the protobuf loader."""
+        launchers = [Launcher(TestConfiguration.load_config("sample_config.yml")) for _ in range(2)]
+
+        self.assertIsNot(launchers[0]._supervisor, launchers[1]._supervisor)
+        for launcher in launchers:
+            launcher.close()
@@ -0,0 +1,103 @@
+# pylint: disable=missing-docstring, protected-access
+
+import copy
+import unittest
+
+from exonum_launcher.configuration import Configuration
+from exonum_launcher.dispatcher import DispatcherState
+from exonum_launcher.planner import LaunchPlan
+from .test_explorer import DISPATCHER_INFO
+
+
+def _artifact(name: str, version: str, action: str) -> dict:
+    return {"runtime": "rust", "name": name, "version": version, "action": action}
+
+
+class TestLaunchPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        dispatcher_info = copy.deepcopy(DISPATCHER_INFO)
+        dispatcher_info["services"][1]["status"] = "stopped"
+        self.dispatcher_state = DispatcherState(dispatcher_info)
+
+    def test_plan(self) -> None:
+        config = Configuration(
+            {
+                "networks": [],
+                "artifacts": {
+                    "cryptocurrency": _artifact("exonum-cryptocurrency", "0.1.0", "deploy"),
+                    "cryptocurrency-v2": _artifact("exonum-cryptocurrency", "0.2.0", "deploy"),
+                    "legacy": _artifact("legacy", "1.0.0", "unload"),
+                },
+                "instances": {
+                    "xnm-token": {"artifact": "cryptocurrency", "action": "stop"},
+                    "nnm-token": {"artifact": "cryptocurrency"},
+                },
+                "migrations": {"xnm-token": _artifact("exonum-cryptocurrency", "0.2.0", "none")},
+            }
+        )
+        cryptocurrency, cryptocurrency_v2, legacy = config.artifacts.values()
+        xnm_token, nnm_token = config.instances
+
+        plan = LaunchPlan(config, self.dispatcher_state)
+
+        self.assertEqual(plan.deploy, [cryptocurrency_v2])
+        self.assertEqual(plan.deployed, [cryptocurrency])
+        self.assertEqual(plan.unload, [])
+        self.assertEqual(plan.instances, [nnm_token])
+        self.assertEqual(plan.migrations, {"xnm-token": config.migrations["xnm-token"]})
+        self.assertFalse(plan.is_empty())
+        self.assertEqual(
+            str(plan).splitlines(),
+            [
+                "Launch plan:",
+                "  deploy 0:exonum-cryptocurrency:0.2.0",
+                "  migrate xnm-token to 0:exonum-cryptocurrency:0.2.0",
+                "  start nnm-token",
+                "  skip deploy 0:exonum-cryptocurrency:0.1.0: already deployed",
+                "  skip unload 0:legacy:1.0.0: not deployed",
+                "  skip stop xnm-token: already stopped",
+            ],
+        )
+
+        narrowed = plan.apply_to(config)
+
+        self.assertEqual([artifact.action for artifact in narrowed.artifacts.values()], ["none", "deploy", "none"])
+        self.assertEqual(narrowed.instances, [nnm_token])
+        self.assertIs(narrowed.instances[0].artifact, narrowed.artifacts["cryptocurrency"])
+        self.assertEqual(list(narrowed.migrations), ["xnm-token"])
+        self.assertNotIn(xnm_token, narrowed.instances)
+
+        # The provided config is left intact, so the same plan is computed for it again.
+        actions = [cryptocurrency.action, cryptocurrency_v2.action, legacy.action]
+        self.assertEqual(actions, ["deploy", "deploy", "unload"])
+        self.assertEqual(config.instances, [xnm_token, nnm_token])
+        self.assertEqual(str(LaunchPlan(config, self.dispatcher_state)), str(plan))
+
+    def test_applied_config_gives_empty_plan(self) -> None:
+        config = Configuration(
+            {
+                "networks": [],
+                "artifacts": {"cryptocurrency": _artifact("exonum-cryptocurrency", "0.1.0", "deploy")},
+                "instances": {"xnm-token": {"artifact": "cryptocurrency"}},
+                "migrations": {"xnm-token": _artifact("exonum-cryptocurrency", "0.1.0", "none")},
+            }
+        )
+
+        plan = LaunchPlan(config, self.dispatcher_state)
+
+        self.assertTrue(plan.is_empty())
+        self.assertEqual(plan.started, {config.instances[0]: 1024})
+        self.assertEqual(str(plan).splitlines()[:2], ["Launch plan:", "  nothing to do"])
+
+    def test_conflicting_start_is_not_skipped(self) -> None:
+        config = Configuration(
+            {
+                "networks": [],
+                "artifacts": {"other": _artifact("other", "0.1.0", "none")},
+                "instances": {"xnm-token": {"artifact": "other"}},
+            }
+        )
+
+        plan = LaunchPlan(config, self.dispatcher_state)
+
+        self.assertEqual(plan.instances, config.instances)
@@ -0,0 +1,67 @@
+# pylint: disable=missing-docstring, protected-access
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from exonum_launcher import plugins
+from exonum_launcher.plugins import PluginRegistry, discover, load_class
+from exonum_launcher.runtimes.runtime import RuntimeSpecLoader
+from exonum_launcher.runtimes.rust import RustSpecLoader
+from .spec_loaders import TestRuntimeSpecLoader
+
+
+class TestPlugins(unittest.TestCase):
+    def test_load_class(self) -> None:
+        self.assertIs(load_class("tests.spec_loaders.TestRuntimeSpecLoader", RuntimeSpecLoader), TestRuntimeSpecLoader)
+        self.assertIs(load_class("tests.spec_loaders:TestRuntimeSpecLoader", RuntimeSpecLoader), TestRuntimeSpecLoader)
+
+        with self.assertRaises(ValueError):
+            load_class("tests.spec_loaders:TestInstanceSpecLoader", RuntimeSpecLoader)
+
+    def test_plugins_are_loaded_lazily(self) -> None:
+        registry: PluginRegistry[str, RuntimeSpecLoader] = PluginRegistry(RuntimeSpecLoader, "runtime")
+        registry.declare("sample", "tests.spec_loaders.TestRuntimeSpecLoader")
+        registry.declare("broken", "tests.spec_loaders.MissingSpecLoader")
+
+        self.assertEqual(sorted(registry), ["broken", "sample"])
+        self.assertEqual(registry.loaded(), {})
+
+        loader = registry["sample"]
+        self.assertIsInstance(loader, TestRuntimeSpecLoader)
+        self.assertIs(registry["sample"], loader)
+        self.assertEqual(registry.loaded(), {"sample": loader})
+
+        with self.assertRaisesRegex(RuntimeError, "Could not load runtime parser"):
+            _ = registry["broken"]
+        self.assertIsNone(registry.get("unknown"))
+
+    def test_discovered_plugins_can_be_replaced(self) -> None:
+        registry: PluginRegistry[str, RuntimeSpecLoader] = PluginRegistry(
+            RuntimeSpecLoader, "runtime", {"sample": "tests.spec_loaders:TestRuntimeSpecLoader"}
+        )
+        self.assertIn("sample", registry)
+        self.assertFalse(registry.is_declared("sample"))
+
+        rust_loader = RustSpecLoader()
+        registry.add("sample", rust_loader)
+
+        self.assertTrue(registry.is_declared("sample"))
+        self.assertIs(registry["sample"], rust_loader)
+
+    def test_discover(self) -> None:
+        entry_point = SimpleNamespace(name="sample", value="tests.spec_loaders:TestRuntimeSpecLoader")
+        self.addCleanup(plugins._entry_points.cache_clear)
+
+        groups = {plugins.RUNTIMES_GROUP: [entry_point]}
+
+        # Python 3.8 and 3.9 return the entry points grouped into a dict.
+        for entry_points in (groups, MagicMock(select=lambda group: groups.get(group, []))):
+            plugins._entry_points.cache_clear()
+            with patch.object(plugins.importlib_metadata, "entry_points", return_value=entry_points) as mock:
+                self.assertEqual(discover(plugins.RUNTIMES_GROUP), {"sample": entry_point.value})
+                self.assertEqual(discover(plugins.RUNTIMES_GROUP), {"sample": entry_point.value})
+                self.assertEqual(discover(plugins.INSTANCES_GROUP), {})
+
+                # Installed distributions are scanned once per group.
+                self.assertEqual(mock.call_count, 2)
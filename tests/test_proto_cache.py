@@ -0,0 +1,117 @@
+# pylint: disable=missing-docstring, protected-access
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from exonum_client.protobuf_loader import ProtobufProviderInterface, ProtoFile
+
+from exonum_launcher.cache import CACHE_DIR_ENV
+from exonum_launcher.proto_cache import CachingProtobufLoader, ProtoCache, protobuf_loader
+
+MAIN_SOURCES = [
+    ProtoFile(
+        name="exonum/types.proto", content='syntax = "proto3";\npackage exonum;\nmessage Hash { bytes data = 1; }\n'
+    )
+]
+SERVICE_SOURCES = [
+    ProtoFile(
+        name="service.proto",
+        content='syntax = "proto3";\nimport "exonum/types.proto";\nmessage Config { exonum.Hash hash = 1; }\n',
+    )
+]
+
+
+class FakeProvider(ProtobufProviderInterface):
+    def __init__(self) -> None:
+        self.get_main_proto_sources = MagicMock(return_value=MAIN_SOURCES)  # type: ignore
+        self.get_proto_sources_for_artifact = MagicMock(return_value=SERVICE_SOURCES)  # type: ignore
+
+
+class TestProtoCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def _load(self, provider: FakeProvider) -> List[str]:
+        """Loads the main and service protos, returns the list of modules."""
+        loader = CachingProtobufLoader(provider, ProtoCache(self.cache_dir))
+        loader.initialize()
+        try:
+            loader.protoc.compile = MagicMock(wraps=loader.protoc.compile)  # type: ignore
+            loader.load_main_proto_files()
+            loader.load_service_proto_files(0, "exonum-cryptocurrency", "0.1.0")
+            # Loading the same artifact twice is not an error.
+            loader.load_service_proto_files(0, "exonum-cryptocurrency", "0.1.0")
+
+            self.compile_calls = loader.protoc.compile.call_count  # type: ignore
+            modules_dir = os.path.join(loader._proto_dir, "exonum_modules")  # type: ignore
+            return sorted(
+                os.path.relpath(os.path.join(root, name), modules_dir)
+                for root, _, files in os.walk(modules_dir)
+                for name in files
+                if name.endswith("_pb2.py")
+            )
+        finally:
+            loader.deinitialize()
+
+    def test_modules_are_reused(self) -> None:
+        first_provider = FakeProvider()
+        first_modules = self._load(first_provider)
+
+        self.assertEqual(self.compile_calls, 2)
+        self.assertIn(os.path.join("exonum_cryptocurrency_0_1_0", "service_pb2.py"), first_modules)
+        first_provider.get_proto_sources_for_artifact.assert_called_once_with(  # type: ignore
+            0, "exonum-cryptocurrency", "0.1.0"
+        )
+
+        second_provider = FakeProvider()
+        second_modules = self._load(second_provider)
+
+        # Nothing is compiled, service sources are not downloaded.
+        self.assertEqual(self.compile_calls, 0)
+        self.assertEqual(first_modules, second_modules)
+        second_provider.get_proto_sources_for_artifact.assert_not_called()  # type: ignore
+
+    def test_changed_core_sources_invalidate_cache(self) -> None:
+        self._load(FakeProvider())
+
+        provider = FakeProvider()
+        changed_sources = [ProtoFile(name=MAIN_SOURCES[0].name, content=MAIN_SOURCES[0].content + "// v2\n")]
+        provider.get_main_proto_sources.return_value = changed_sources  # type: ignore
+        self._load(provider)
+
+        self.assertEqual(self.compile_calls, 2)
+        provider.get_proto_sources_for_artifact.assert_called_once()  # type: ignore
+
+    def test_loader_is_shared_by_providers(self) -> None:
+        first_provider, second_provider = FakeProvider(), FakeProvider()
+
+        with patch.dict(os.environ, {CACHE_DIR_ENV: self.cache_dir}):
+            for provider in (first_provider, second_provider):
+                with protobuf_loader(provider) as loader:
+                    loader.initialize()
+                    loader.load_main_proto_files()
+
+            with protobuf_loader(first_provider) as loader:
+                loader.load_service_proto_files(0, "exonum-cryptocurrency", "0.1.0")
+                loader.deinitialize()
+
+            # The loader is still initialized for the second provider.
+            with protobuf_loader(second_provider) as loader:
+                loader.load_service_proto_files(0, "exonum-token", "1.0.0")
+                modules_dir = os.path.join(loader._proto_dir, "exonum_modules")  # type: ignore
+                loaded = sorted(os.listdir(modules_dir))
+                loader.deinitialize()
+
+        self.assertEqual(loaded, ["__init__.py", "exonum_cryptocurrency_0_1_0", "exonum_token_1_0_0", "main"])
+        # Sources are requested from the provider which uses the loader at the moment.
+        first_provider.get_proto_sources_for_artifact.assert_called_once_with(  # type: ignore
+            0, "exonum-cryptocurrency", "0.1.0"
+        )
+        second_provider.get_proto_sources_for_artifact.assert_called_once_with(  # type: ignore
+            0, "exonum-token", "1.0.0"
+        )
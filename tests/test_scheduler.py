@@ -0,0 +1,131 @@
+# pylint: disable=missing-docstring, protected-access
+
+import threading
+import unittest
+from typing import List
+from unittest.mock import MagicMock
+
+from exonum_launcher.configuration import Configuration
+from exonum_launcher.main import build_schedule
+from exonum_launcher.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def test_independent_tasks_are_concurrent(self) -> None:
+        # Every task waits until all the tasks are started, so the test hangs if tasks are sequential.
+        barrier = threading.Barrier(3)
+        scheduler = Scheduler()
+        for i in range(3):
+            scheduler.add_task(f"task-{i}", lambda: barrier.wait(timeout=5) and None)
+
+        scheduler.run()
+
+    def test_dependencies_are_respected(self) -> None:
+        finished: List[str] = list()
+        scheduler = Scheduler()
+        scheduler.add_task("start", lambda: finished.append("start"), ["deploy-a", "migrate"])
+        scheduler.add_task("migrate", lambda: finished.append("migrate"), ["deploy-b"])
+        scheduler.add_task("deploy-a", lambda: finished.append("deploy-a"))
+        scheduler.add_task("deploy-b", lambda: finished.append("deploy-b"))
+
+        scheduler.run()
+
+        self.assertEqual(sorted(finished[:2]), ["deploy-a", "deploy-b"])
+        self.assertEqual(finished[2:], ["migrate", "start"])
+
+    def test_failed_task_skips_dependents(self) -> None:
+        finished: List[str] = list()
+
+        def _fail() -> None:
+            raise RuntimeError("deploy failed")
+
+        scheduler = Scheduler()
+        scheduler.add_task("deploy-a", _fail)
+        scheduler.add_task("migrate", lambda: finished.append("migrate"), ["deploy-a"])
+        scheduler.add_task("start", lambda: finished.append("start"), ["migrate"])
+        scheduler.add_task("deploy-b", lambda: finished.append("deploy-b"))
+
+        with self.assertRaisesRegex(RuntimeError, "deploy failed"):
+            scheduler.run()
+
+        self.assertEqual(finished, ["deploy-b"])
+
+    def test_invalid_dependencies(self) -> None:
+        scheduler = Scheduler()
+        scheduler.add_task("a", lambda: None, ["b"])
+        scheduler.add_task("b", lambda: None, ["a"])
+        with self.assertRaisesRegex(ValueError, "cyclic"):
+            scheduler.run()
+
+        scheduler = Scheduler()
+        scheduler.add_task("a", lambda: None, ["unknown"])
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            scheduler.run()
+
+        with self.assertRaises(ValueError):
+            scheduler.add_task("a", lambda: None)
+
+
+class TestBuildSchedule(unittest.TestCase):
+    @staticmethod
+    def _artifact(name: str, action: str) -> dict:
+        return {"runtime": "rust", "name": name, "version": "1.0.0", "action": action}
+
+    def test_dependencies(self) -> None:
+        config = Configuration(
+            {
+                "networks": [],
+                "artifacts": {
+                    "token": self._artifact("token", "deploy"),
+                    "wallet": self._artifact("wallet", "deploy"),
+                    "legacy": self._artifact("legacy", "unload"),
+                },
+                "instances": {"token": {"artifact": "token"}, "wallet": {"artifact": "wallet", "action": "stop"}},
+                "migrations": {"wallet": self._artifact("token", "none"), "other": self._artifact("other", "none")},
+            }
+        )
+        launcher = MagicMock(config=config)
+
+        dependencies = build_schedule(launcher, dict()).dependencies()
+
+        self.assertEqual(
+            dependencies,
+            {
+                "deploy 0:token:1.0.0": [],
+                "deploy 0:wallet:1.0.0": [],
+                # Migration doesn't wait for the deploys of the unrelated artifacts.
+                "migrate wallet": ["deploy 0:token:1.0.0"],
+                "migrate other": [],
+                "unload": ["migrate wallet", "migrate other"],
+                "start": ["deploy 0:token:1.0.0", "deploy 0:wallet:1.0.0", "migrate wallet", "unload"],
+            },
+        )
+
+    def test_stop_before_unload(self) -> None:
+        config = Configuration(
+            {
+                "networks": [],
+                "artifacts": {"legacy": self._artifact("legacy", "unload")},
+                "instances": {"legacy": {"artifact": "legacy", "action": "stop"}},
+            }
+        )
+        launcher = MagicMock(config=config)
+
+        dependencies = build_schedule(launcher, dict()).dependencies()
+
+        self.assertEqual(dependencies, {"start": [], "unload": ["start"]})
+
+    def test_stream_start(self) -> None:
+        config = Configuration(
+            {
+                "networks": [],
+                "artifacts": {"token": self._artifact("token", "deploy")},
+                "instances": {"token": {"artifact": "token"}},
+            }
+        )
+        launcher = MagicMock(config=config)
+
+        dependencies = build_schedule(launcher, dict(), stream_start=True).dependencies()
+
+        # Instances are started as soon as the artifacts are deployed, so the start stage doesn't wait for deploys.
+        self.assertEqual(dependencies, {"deploy 0:token:1.0.0": [], "start": []})
@@ -0,0 +1,169 @@
+# pylint: disable=missing-docstring, protected-access
+
+import threading
+import unittest
+from typing import List, Tuple
+from unittest.mock import MagicMock
+
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from exonum_launcher.supervisor import Supervisor, SupervisorRequestError
+from .test_explorer import FakeBlockStream
+
+
+def _response(tx_hash: str) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = f'"{tx_hash}"'.encode()
+    return response
+
+
+def _proposal_classes() -> Tuple[type, type]:
+    """Builds `ConfigPropose` and `ConfigChange` message types mimicking the supervisor ones."""
+    file_proto = descriptor_pb2.FileDescriptorProto(name="test_supervisor.proto", package="test", syntax="proto3")
+    change = file_proto.message_type.add(name="ConfigChange")
+    change.field.add(name="data", number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_BYTES)
+    propose = file_proto.message_type.add(name="ConfigPropose")
+    propose.field.add(name="actual_from", number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_UINT64)
+    propose.field.add(
+        name="changes",
+        number=2,
+        type=descriptor_pb2.FieldDescriptorProto.TYPE_MESSAGE,
+        type_name=".test.ConfigChange",
+        label=descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED,
+    )
+    propose.field.add(name="configuration_number", number=3, type=descriptor_pb2.FieldDescriptorProto.TYPE_UINT64)
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    factory = message_factory.MessageFactory(pool)
+    return (
+        factory.GetPrototype(pool.FindMessageTypeByName("test.ConfigPropose")),
+        factory.GetPrototype(pool.FindMessageTypeByName("test.ConfigChange")),
+    )
+
+
+def _client(hostname: str) -> MagicMock:
+    client = MagicMock()
+    client.hostname = hostname
+    client.private_api_port = 8081
+    return client
+
+
+class TestSupervisor(unittest.TestCase):
+    def test_post_to_all_nodes_concurrently(self) -> None:
+        clients = [_client(f"node-{i}") for i in range(4)]
+        # Every request waits until all the requests are sent, so the test hangs if requests are sequential.
+        barrier = threading.Barrier(len(clients))
+
+        def post_service(tx_hash: str) -> MagicMock:
+            def _post(*_args: object, **_kwargs: object) -> Response:
+                barrier.wait(timeout=5)
+                return _response(tx_hash)
+
+            return MagicMock(side_effect=_post)
+
+        for i, client in enumerate(clients):
+            client.service_private_api.return_value.post_service = post_service(f"hash-{i}")
+
+        supervisor = Supervisor("decentralized", clients)  # type: ignore
+        message = MagicMock()
+        message.SerializeToString.return_value = b"data"
+
+        responses = supervisor._post_to_supervisor("deploy-artifact", message)
+
+        self.assertEqual(responses, [f"hash-{i}" for i in range(4)])
+        message.SerializeToString.assert_called_once()
+        for client in clients:
+            client.service_private_api.return_value.post_service.assert_called_once_with(
+                "deploy-artifact", b"data", data_format="binary"
+            )
+
+    def test_post_errors_are_collected(self) -> None:
+        clients: List[MagicMock] = [_client(f"node-{i}") for i in range(3)]
+        clients[0].service_private_api.return_value.post_service.return_value = _response("hash-0")
+        clients[1].service_private_api.return_value.post_service.side_effect = RequestsConnectionError("refused")
+        clients[2].service_private_api.return_value.post_service.side_effect = RequestsConnectionError("reset")
+
+        supervisor = Supervisor("decentralized", clients)  # type: ignore
+
+        with self.assertRaises(SupervisorRequestError) as context:
+            supervisor._post_to_supervisor("deploy-artifact", MagicMock())
+
+        self.assertEqual(sorted(context.exception.errors), ["node-1:8081", "node-2:8081"])
+
+    def test_configuration_number_is_tracked_locally(self) -> None:
+        client = _client("node-0")
+        get_service = client.service_private_api.return_value.get_service
+        get_service.return_value.json.return_value = 5
+        supervisor = Supervisor("simple", [client])  # type: ignore
+        blocks = FakeBlockStream()
+        supervisor._explorer._blocks = blocks  # type: ignore
+        supervisor._post_to_supervisor = MagicMock(return_value=["hash"])  # type: ignore
+
+        # Number is requested once per block.
+        self.assertEqual(supervisor._get_configuration_number(), 5)
+        self.assertEqual(supervisor._get_configuration_number(), 5)
+        self.assertEqual(get_service.call_count, 1)
+
+        # Sent proposal bumps the number, new blocks don't cause requests while the proposal is pending.
+        supervisor.send_propose_config_request(MagicMock(configuration_number=5))
+        blocks.wait_for_block(blocks.latest(), 0)
+        self.assertEqual(supervisor._get_configuration_number(), 6)
+        supervisor.complete_proposal(True)
+        self.assertEqual(supervisor._get_configuration_number(), 6)
+        self.assertEqual(get_service.call_count, 1)
+
+        # Rejected proposal causes the number to be requested again.
+        supervisor.send_propose_config_request(MagicMock(configuration_number=6))
+        supervisor.complete_proposal(False)
+        get_service.return_value.json.return_value = 6
+        self.assertEqual(supervisor._get_configuration_number(), 6)
+        self.assertEqual(get_service.call_count, 2)
+
+        # New block without pending proposals causes the number to be requested again.
+        blocks.wait_for_block(blocks.latest(), 0)
+        supervisor._get_configuration_number()
+        self.assertEqual(get_service.call_count, 3)
+
+    def test_split_config_proposal(self) -> None:
+        propose_class, change_class = _proposal_classes()
+        proposal = propose_class(actual_from=100, configuration_number=5)
+        for i in range(10):
+            proposal.changes.append(change_class(data=bytes([i]) * 100))
+
+        # Proposal which fits into the limit is not split.
+        self.assertEqual(Supervisor.split_config_proposal(proposal, proposal.ByteSize()), [proposal])
+
+        # Every change takes 104 bytes, the header takes 4 bytes.
+        parts = Supervisor.split_config_proposal(proposal, 4 + 104 * 3)
+
+        self.assertEqual([len(part.changes) for part in parts], [3, 3, 3, 1])
+        self.assertTrue(all(part.ByteSize() <= 4 + 104 * 3 for part in parts))
+        self.assertEqual([part.configuration_number for part in parts], [5, 6, 7, 8])
+        self.assertEqual([part.actual_from for part in parts], [100, 0, 0, 0])
+        self.assertEqual([change for part in parts for change in part.changes], list(proposal.changes))
+
+        with self.assertRaises(RuntimeError):
+            Supervisor.split_config_proposal(proposal, 100)
+
+    def test_send_compiled_config_proposal(self) -> None:
+        propose_class, change_class = _proposal_classes()
+        proposal = propose_class(actual_from=100)
+        proposal.changes.append(change_class(data=b"start"))
+
+        supervisor = Supervisor("simple", [_client("node-0")])  # type: ignore
+        supervisor._get_configuration_number = MagicMock(return_value=300)  # type: ignore
+        supervisor._post_bytes_to_supervisor = MagicMock(return_value=["hash"])  # type: ignore
+
+        txs, configuration_number = supervisor.send_compiled_config_proposal(proposal.SerializeToString(), 3)
+
+        self.assertEqual((txs, configuration_number), (["hash"], 300))
+        endpoint, data = supervisor._post_bytes_to_supervisor.call_args[0]  # type: ignore
+        self.assertEqual(endpoint, "propose-config")
+        proposal.configuration_number = 300
+        self.assertEqual(propose_class.FromString(data), proposal)
+        # Next proposal gets the incremented number.
+        self.assertEqual(supervisor._configuration_number, 301)